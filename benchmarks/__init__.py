@@ -0,0 +1 @@
+# 性能基准测试模块初始化文件（本地夹具服务器 + 各环节吞吐量测量，结果写入JSON便于跨提交对比）
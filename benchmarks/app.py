@@ -0,0 +1,139 @@
+"""
+性能基准测试命令行入口
+
+用法:
+    python -m benchmarks pipeline [--fields N ...] [--depth N] [--iframes N] [--select-options N]
+                                  [--iterations N] [--no-browser] [--output <文件>] [--baseline <文件>]
+    python -m benchmarks storage [--size N ...] [--model page_structure|test_case|test_execution ...]
+                                 [--format dict|json|file ...] [--iterations N] [--output <文件>] [--baseline <文件>]
+    python -m benchmarks compare <基准结果> <当前结果> [--threshold 0.1]
+
+页面均由本地夹具服务器提供，不访问外部网站。结果写入JSON，可用 compare 对比两个提交的结果；
+指定 --baseline 时运行后直接与基准结果对比。吞吐量下降超过阈值时退出码为 1。
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from cli.app import EXIT_OK, EXIT_TESTS_FAILED, EXIT_USAGE_ERROR, _ArgumentParser
+
+
+def _default_output(suite: str) -> str:
+    from benchmarks.harness import git_commit
+
+    commit = git_commit()
+    tag = commit[:10] if commit else datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join('data', 'benchmarks', f"{suite}_{tag}.json")
+
+
+def _report_comparison(rows, threshold: float) -> int:
+    """输出对比结果，有吞吐量下降超过阈值的项时返回 EXIT_TESTS_FAILED"""
+    if not rows:
+        print("⚠️ 两次结果没有可对比的项目", file=sys.stderr)
+        return EXIT_OK
+
+    for row in rows:
+        mark = '❌' if row['regressed'] else '✅'
+        print(f"{mark} {row['key']}: {row['baseline']:.1f} -> {row['current']:.1f} {row['unit']}/s ({row['change']:+.1%})")
+
+    regressed = [row for row in rows if row['regressed']]
+    if regressed:
+        print(f"❌ {len(regressed)} 项吞吐量下降超过 {threshold:.0%}", file=sys.stderr)
+        return EXIT_TESTS_FAILED
+    return EXIT_OK
+
+
+def _finish(results, suite: str, args) -> int:
+    """输出并保存结果；指定了基准结果时与之对比"""
+    from benchmarks.harness import compare_results, format_results, load_results, write_results
+
+    # 先读取基准结果，输出文件与基准结果相同时也能正确对比
+    baseline = load_results(args.baseline) if args.baseline else None
+    print(format_results(results))
+    print(f"📊 结果: {write_results(results, args.output or _default_output(suite), suite)}")
+    if baseline is not None:
+        return _report_comparison(compare_results(baseline, results, args.threshold), args.threshold)
+    return EXIT_OK
+
+
+def cmd_pipeline(args) -> int:
+    from benchmarks.fixture_server import FormSpec
+    from benchmarks.pipeline import run_pipeline_benchmarks
+
+    results = []
+    for fields in args.fields or [20, 100]:
+        spec = FormSpec(fields=fields, depth=args.depth, iframes=args.iframes, select_options=args.select_options)
+        print(f"▶️ 表单规模: {spec}")
+        results.extend(run_pipeline_benchmarks(spec, iterations=args.iterations, browser=not args.no_browser,
+                                               headless=not args.headed, run_iterations=args.run_iterations))
+
+    return _finish(results, 'pipeline', args)
+
+
+def cmd_storage(args) -> int:
+    from benchmarks.storage import run_storage_benchmarks
+
+    results = run_storage_benchmarks(args.size, args.model, args.format, iterations=args.iterations,
+                                     track_memory=not args.no_memory)
+    return _finish(results, 'storage', args)
+
+
+def cmd_compare(args) -> int:
+    from benchmarks.harness import compare_results, load_results
+
+    return _report_comparison(compare_results(load_results(args.baseline), load_results(args.current), args.threshold),
+                              args.threshold)
+
+
+def _add_gate_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--output', help='结果文件，默认 data/benchmarks/<套件>_<提交>.json')
+    parser.add_argument('--baseline', help='基准结果文件；指定时吞吐量下降超过阈值则退出码为 1')
+    parser.add_argument('--threshold', type=float, default=0.1, help='允许的吞吐量下降比例，默认 0.1')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = _ArgumentParser(prog='python -m benchmarks', description='性能基准测试')
+    subparsers = parser.add_subparsers(dest='command', required=True, parser_class=_ArgumentParser)
+
+    pipeline_parser = subparsers.add_parser('pipeline', help='测量页面解析、用例生成、用例运行和报告生成的吞吐量')
+    pipeline_parser.add_argument('--fields', type=int, action='append', help='表单字段数，可重复；默认 20 和 100')
+    pipeline_parser.add_argument('--depth', type=int, default=2, help='每个字段外层嵌套的 div 层数')
+    pipeline_parser.add_argument('--iframes', type=int, default=0, help='页面中的 iframe 数量')
+    pipeline_parser.add_argument('--select-options', type=int, default=10, help='每个下拉框的选项数')
+    pipeline_parser.add_argument('--iterations', type=int, default=5, help='每项的计时次数')
+    pipeline_parser.add_argument('--run-iterations', type=int, default=2, help='运行测试用例的计时次数（每次启动浏览器）')
+    pipeline_parser.add_argument('--no-browser', action='store_true', help='不启动浏览器，只测量生成和报告环节')
+    pipeline_parser.add_argument('--headed', action='store_true', help='有头模式运行浏览器')
+    _add_gate_arguments(pipeline_parser)
+    pipeline_parser.set_defaults(func=cmd_pipeline)
+
+    storage_parser = subparsers.add_parser('storage', help='测量模型序列化和反序列化的耗时与峰值内存')
+    storage_parser.add_argument('--size', type=int, action='append', help='节点/测试数据/步骤条数，可重复；默认 1000、10000、100000')
+    storage_parser.add_argument('--model', action='append', choices=['page_structure', 'test_case', 'test_execution'],
+                                help='模型，可重复；默认全部')
+    storage_parser.add_argument('--format', action='append', choices=['dict', 'json', 'file'], help='格式，可重复；默认全部')
+    storage_parser.add_argument('--iterations', type=int, default=3, help='每项的计时次数')
+    storage_parser.add_argument('--no-memory', action='store_true', help='不测量峰值内存')
+    _add_gate_arguments(storage_parser)
+    storage_parser.set_defaults(func=cmd_storage)
+
+    compare_parser = subparsers.add_parser('compare', help='对比两次结果，吞吐量下降超过阈值时失败')
+    compare_parser.add_argument('baseline', help='基准结果文件')
+    compare_parser.add_argument('current', help='当前结果文件')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='允许的吞吐量下降比例，默认 0.1')
+    compare_parser.set_defaults(func=cmd_compare)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行主函数，返回退出码"""
+    args = build_parser().parse_args(argv)
+    if hasattr(args, 'threshold') and not 0 <= args.threshold < 1:
+        print("❌ --threshold 必须在 0 到 1 之间", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+    return args.func(args)
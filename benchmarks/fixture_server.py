@@ -0,0 +1,153 @@
+import html
+import threading
+from dataclasses import dataclass, asdict, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlencode, urlsplit, parse_qs
+
+
+# 字段类型依次轮换，覆盖生成器的各类测试观点
+FIELD_KINDS = ['text', 'email', 'number', 'password', 'select', 'checkbox', 'radio', 'date', 'textarea', 'tel']
+
+
+@dataclass
+class FormSpec:
+    """合成表单页面的规模"""
+    fields: int = 20  # 表单字段数
+    depth: int = 2  # 每个字段外层嵌套的 div 层数
+    iframes: int = 0  # 页面中的 iframe 数量（每个 iframe 内是一个小表单）
+    select_options: int = 10  # 每个下拉框的选项数
+
+    def to_query(self) -> str:
+        return urlencode(asdict(self))
+
+    @classmethod
+    def from_query(cls, query: str) -> 'FormSpec':
+        params = parse_qs(query)
+        values = {}
+        for field in fields(cls):
+            if field.name in params:
+                values[field.name] = max(0, int(params[field.name][0]))
+        return cls(**values)
+
+
+def _field_html(index: int, kind: str, spec: FormSpec) -> str:
+    name = f"{kind}_{index}"
+    label = f'<label for="{name}">字段 {index} ({kind})</label>'
+    if kind == 'select':
+        options = ''.join(f'<option value="v{i}">选项 {i}</option>' for i in range(spec.select_options))
+        control = f'<select id="{name}" name="{name}" required><option value="">请选择</option>{options}</select>'
+    elif kind == 'textarea':
+        control = f'<textarea id="{name}" name="{name}" maxlength="200"></textarea>'
+    elif kind == 'number':
+        control = f'<input type="number" id="{name}" name="{name}" min="0" max="{100 + index}" step="1">'
+    elif kind in ('checkbox', 'radio'):
+        control = f'<input type="{kind}" id="{name}" name="{name}" value="on">'
+    elif kind == 'text':
+        control = f'<input type="text" id="{name}" name="{name}" minlength="2" maxlength="20" required>'
+    elif kind == 'tel':
+        control = f'<input type="tel" id="{name}" name="{name}" pattern="[0-9]{{11}}">'
+    else:
+        control = f'<input type="{kind}" id="{name}" name="{name}">'
+    body = label + control
+    for level in range(spec.depth):
+        body = f'<div class="wrap-{level}">{body}</div>'
+    return body
+
+
+def render_form_page(spec: FormSpec, title: str = "合成表单") -> str:
+    """生成包含一个表单的页面HTML，字段类型按 FIELD_KINDS 轮换"""
+    rows = [_field_html(i, FIELD_KINDS[i % len(FIELD_KINDS)], spec) for i in range(spec.fields)]
+    frame_spec = FormSpec(fields=min(spec.fields, 5), depth=0, iframes=0, select_options=spec.select_options)
+    frames = [f'<iframe id="frame_{i}" src="/frame?{frame_spec.to_query()}" width="400" height="200"></iframe>'
+              for i in range(spec.iframes)]
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f'<title>{html.escape(title)}</title>'
+        '<link rel="stylesheet" href="/static/style.css"></head><body>'
+        f'<h1>{html.escape(title)}</h1>'
+        '<form id="bench_form" action="/submit" method="post">'
+        + ''.join(rows) +
+        '<button type="submit" id="submit_btn">提交</button></form>'
+        + ''.join(frames) +
+        '</body></html>'
+    )
+
+
+_STYLE = "body{font-family:sans-serif}label{display:block;margin-top:4px}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path in ('/form', '/'):
+            self._send(render_form_page(FormSpec.from_query(parts.query)), 'text/html; charset=utf-8')
+        elif parts.path == '/frame':
+            self._send(render_form_page(FormSpec.from_query(parts.query), title="内嵌表单"), 'text/html; charset=utf-8')
+        elif parts.path == '/static/style.css':
+            self._send(_STYLE, 'text/css', cache=True)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        # 提交后返回结果页，模拟表单提交后的跳转
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        self._send('<!DOCTYPE html><html><head><title>提交成功</title></head><body><p id="result">提交成功</p></body></html>',
+                   'text/html; charset=utf-8')
+
+    def _send(self, body: str, content_type: str, cache: bool = False):
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'max-age=3600' if cache else 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 基准测试时不输出访问日志
+        pass
+
+
+class FixtureServer:
+    """本地HTTP夹具服务器，在后台线程中提供合成表单页面
+
+    /form?fields=&depth=&iframes=&select_options= 返回对应规模的表单页，不访问外部网站。
+    可作为上下文管理器使用；端口为0时由系统分配空闲端口。
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'FixtureServer':
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def form_url(self, spec: FormSpec) -> str:
+        """对应规模的表单页URL"""
+        return f"{self.base_url}/form?{spec.to_query()}"
+
+    def __enter__(self) -> 'FixtureServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
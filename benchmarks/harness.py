@@ -0,0 +1,184 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class BenchmarkResult:
+    """单项基准测试结果
+
+    throughput 为每秒处理的单位数（unit 为节点、步骤、报告等），按中位数耗时计算。
+    """
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    unit: str = "op"
+    units_per_call: int = 1
+    iterations: int = 0
+    median_s: float = 0.0
+    mean_s: float = 0.0
+    min_s: float = 0.0
+    stdev_s: float = 0.0
+    throughput: float = 0.0
+    peak_memory_bytes: Optional[int] = None
+    skipped: Optional[str] = None  # 跳过原因（如没有可用的浏览器）
+
+    @property
+    def key(self) -> str:
+        """用于跨提交对比的唯一键：名称 + 参数"""
+        params = ','.join(f"{k}={self.params[k]}" for k in sorted(self.params))
+        return f"{self.name}[{params}]" if params else self.name
+
+    @classmethod
+    def from_timings(cls, name: str, timings: List[float], params: Optional[Dict[str, Any]] = None,
+                     unit: str = "op", units_per_call: int = 1,
+                     peak_memory_bytes: Optional[int] = None) -> 'BenchmarkResult':
+        median = statistics.median(timings)
+        return cls(
+            name=name,
+            params=params or {},
+            unit=unit,
+            units_per_call=units_per_call,
+            iterations=len(timings),
+            median_s=median,
+            mean_s=statistics.mean(timings),
+            min_s=min(timings),
+            stdev_s=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            throughput=units_per_call / median if median > 0 else float('inf'),
+            peak_memory_bytes=peak_memory_bytes
+        )
+
+    @classmethod
+    def skip(cls, name: str, reason: str, params: Optional[Dict[str, Any]] = None, unit: str = "op") -> 'BenchmarkResult':
+        return cls(name=name, params=params or {}, unit=unit, skipped=reason)
+
+
+def measure(name: str, func: Callable[[], Any], iterations: int = 5, warmup: int = 1,
+            params: Optional[Dict[str, Any]] = None, unit: str = "op", units_per_call: int = 1,
+            track_memory: bool = False, setup: Optional[Callable[[], Any]] = None) -> BenchmarkResult:
+    """多次调用 func 并统计耗时
+
+    指定 setup 时每次调用前先执行 setup，其返回值作为 func 的参数，setup 不计入耗时。
+    track_memory 为 True 时另外单独调用一次，用 tracemalloc 记录峰值内存
+    （tracemalloc 会显著拖慢执行，因此不与计时混在一起）。
+    """
+    def call():
+        if setup is None:
+            start = time.perf_counter()
+            func()
+        else:
+            arg = setup()
+            start = time.perf_counter()
+            func(arg)
+        return time.perf_counter() - start
+
+    for _ in range(warmup):
+        call()
+
+    timings = [call() for _ in range(iterations)]
+
+    peak = None
+    if track_memory:
+        args = (setup(),) if setup else ()
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult.from_timings(name, timings, params, unit, units_per_call, peak)
+
+
+async def measure_async(name: str, func: Callable[[], Awaitable[Any]], iterations: int = 5, warmup: int = 1,
+                        params: Optional[Dict[str, Any]] = None, unit: str = "op",
+                        units_per_call: int = 1) -> BenchmarkResult:
+    """measure 的异步版本，用于浏览器相关环节"""
+    for _ in range(warmup):
+        await func()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+
+    return BenchmarkResult.from_timings(name, timings, params, unit, units_per_call)
+
+
+def git_commit() -> Optional[str]:
+    """当前提交的哈希，不在 git 仓库中时返回None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results: List[BenchmarkResult], file_path: str, suite: str) -> str:
+    """将结果和运行环境写入JSON文件"""
+    data = {
+        'suite': suite,
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': [asdict(result) for result in results]
+    }
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return file_path
+
+
+def load_results(file_path: str) -> List[BenchmarkResult]:
+    """读取 write_results 写入的结果"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [BenchmarkResult(**result) for result in data['results']]
+
+
+def compare_results(baseline: List[BenchmarkResult], current: List[BenchmarkResult],
+                    threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """对比两次结果，返回每项的吞吐量变化
+
+    只对比两边都有且都未跳过的项；吞吐量下降超过 threshold（0.1 即10%）的项 regressed 为 True。
+    """
+    baseline_by_key = {result.key: result for result in baseline if not result.skipped}
+    rows = []
+    for result in current:
+        base = baseline_by_key.get(result.key)
+        if result.skipped or base is None or not base.throughput:
+            continue
+        change = result.throughput / base.throughput - 1
+        rows.append({
+            'key': result.key,
+            'unit': result.unit,
+            'baseline': base.throughput,
+            'current': result.throughput,
+            'change': change,
+            'regressed': change < -threshold
+        })
+    return rows
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """结果的文本表格"""
+    width = max([len(result.key) for result in results] + [8])
+    lines = [f"{'项目':<{width}} {'中位数(ms)':>12} {'吞吐量':>16} {'峰值内存':>12}"]
+    for result in results:
+        if result.skipped:
+            lines.append(f"{result.key:<{width}} 跳过: {result.skipped}")
+            continue
+        memory = f"{result.peak_memory_bytes / 1024 / 1024:.1f}MB" if result.peak_memory_bytes is not None else '-'
+        lines.append(f"{result.key:<{width}} {result.median_s * 1000:>12.2f} "
+                     f"{result.throughput:>10.1f} {result.unit}/s {memory:>12}")
+    return '\n'.join(lines)
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import tempfile
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from benchmarks.fixture_server import FIELD_KINDS, FixtureServer, FormSpec
+from benchmarks.harness import BenchmarkResult, measure, measure_async
+from core.page_parser import PageParser
+from core.report_generator import ReportGenerator
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.page_node import NodeType, PageNode, PageStructure
+from models.test_case import TestCase
+from models.test_data import AssertionResult, TestExecution, TestStatus, TestStepResult
+from utils.playwright_utils import PlaywrightUtils
+
+
+_NODE_TYPES = {'select': NodeType.SELECT, 'checkbox': NodeType.CHECKBOX, 'radio': NodeType.RADIO}
+
+
+def synthetic_page_structure(spec: FormSpec, url: str) -> PageStructure:
+    """不启动浏览器，按夹具页面的结构直接构造页面结构（与浏览器提取结果的节点组成一致）
+
+    没有可用浏览器时用于生成和报告环节的基准测试。
+    """
+    nodes = [PageNode(id="bench_form", type=NodeType.FORM, tag_name="form", xpath='//*[@id="bench_form"]',
+                      css_selector="#bench_form", attributes={'action': '/submit', 'method': 'post'},
+                      is_interactive=True, page_url=url)]
+    for index in range(spec.fields):
+        kind = FIELD_KINDS[index % len(FIELD_KINDS)]
+        name = f"{kind}_{index}"
+        parent_id = "bench_form"
+        for level in reversed(range(spec.depth)):
+            wrapper_id = f"{name}_wrap_{level}"
+            nodes.append(PageNode(id=wrapper_id, type=NodeType.DIV, tag_name="div", xpath=f"//div[@class='wrap-{level}']",
+                                  attributes={'class': f"wrap-{level}"}, parent_id=parent_id, page_url=url))
+            parent_id = wrapper_id
+        constraints = {}
+        options = []
+        attributes = {'id': name, 'name': name}
+        if kind == 'select':
+            constraints['required'] = True
+            options = [{'value': '', 'text': '请选择', 'disabled': False}] + [
+                {'value': f"v{i}", 'text': f"选项 {i}", 'disabled': False} for i in range(spec.select_options)]
+        elif kind == 'number':
+            constraints.update({'min': '0', 'max': str(100 + index), 'step': '1'})
+        elif kind == 'text':
+            constraints.update({'required': True, 'minlength': 2, 'maxlength': 20})
+        elif kind == 'textarea':
+            constraints['maxlength'] = 200
+        elif kind == 'tel':
+            constraints['pattern'] = '[0-9]{11}'
+        if kind not in ('select', 'textarea'):
+            attributes['type'] = kind
+        tag_name = kind if kind in ('select', 'textarea') else 'input'
+        nodes.append(PageNode(id=name, type=_NODE_TYPES.get(kind, NodeType.INPUT), tag_name=tag_name,
+                              xpath=f'//*[@id="{name}"]', css_selector=f"#{name}", attributes=attributes,
+                              is_interactive=True, parent_id=parent_id, options=options, constraints=constraints,
+                              page_url=url))
+    nodes.append(PageNode(id="submit_btn", type=NodeType.BUTTON, tag_name="button", text_content="提交",
+                          xpath='//*[@id="submit_btn"]', css_selector="#submit_btn", attributes={'type': 'submit'},
+                          is_interactive=True, parent_id="bench_form", page_url=url))
+    return PageStructure(id=str(uuid.uuid4()), url=url, title="合成表单", nodes=nodes)
+
+
+def synthetic_execution(test_case: TestCase) -> TestExecution:
+    """按测试用例的测试数据构造一条全部通过的执行记录，用于报告渲染的基准测试"""
+    start = datetime.now()
+    step_results = []
+    for viewpoint in test_case.viewpoints:
+        for test_data in viewpoint.test_data_list:
+            step_results.append(TestStepResult(
+                step_id=test_data.id,
+                step_number=len(step_results) + 1,
+                action=viewpoint.strategy.value,
+                status=TestStatus.PASSED,
+                start_time=start,
+                end_time=start + timedelta(milliseconds=50),
+                duration=0.05,
+                input_data=str(test_data.input_value),
+                assertions=[AssertionResult(assertion_type='equals', expected_value=test_data.expected_value,
+                                            actual_value=test_data.expected_value, passed=True,
+                                            message=test_data.description, execution_time=0.001)]
+            ))
+    return TestExecution(id=str(uuid.uuid4()), test_case_id=test_case.id, test_case_name=test_case.name,
+                         status=TestStatus.PASSED, start_time=start, end_time=start + timedelta(seconds=1), duration=1.0,
+                         step_results=step_results, total_steps=len(step_results), passed_steps=len(step_results))
+
+
+async def _browser_benchmarks(url: str, params: dict, work_dir: str, iterations: int,
+                              headless: bool) -> Optional[List[BenchmarkResult]]:
+    """节点提取和页面解析，浏览器无法启动时返回None"""
+    utils = PlaywrightUtils()
+    try:
+        await utils.start_browser(headless=headless)
+    except Exception as e:
+        print(f"⚠️ 浏览器无法启动，跳过浏览器相关环节: {e}")
+        await utils.close_browser()
+        return None
+
+    try:
+        await utils.navigate_to_page(url)
+        node_count = len(await utils._extract_page_nodes(url))
+        screenshot_dir = os.path.join(work_dir, "screenshots")
+        return [
+            await measure_async("extract_page_nodes", lambda: utils._extract_page_nodes(url), iterations,
+                                params=params, unit="node", units_per_call=node_count),
+            await measure_async("parse_page_structure", lambda: utils.parse_page_structure(url, screenshot_dir),
+                                iterations, params=params, unit="page")
+        ]
+    finally:
+        await utils.close_browser()
+
+
+def run_pipeline_benchmarks(spec: FormSpec, iterations: int = 5, browser: bool = True,
+                            headless: bool = True, run_iterations: int = 2) -> List[BenchmarkResult]:
+    """对一个规模的合成表单测量解析、生成、运行和报告各环节
+
+    browser 为 False 或浏览器不可用时，解析和运行环节记为跳过，生成和报告环节使用按相同结构构造的页面结构。
+    """
+    params = asdict(spec)
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as work_dir, FixtureServer() as server:
+        url = server.form_url(spec)
+        browser_results = None
+        if browser:
+            browser_results = asyncio.run(_browser_benchmarks(url, params, work_dir, iterations, headless))
+        if browser_results is None:
+            reason = "未启用浏览器" if not browser else "浏览器不可用"
+            browser_results = [BenchmarkResult.skip("extract_page_nodes", reason, params, "node"),
+                               BenchmarkResult.skip("parse_page_structure", reason, params, "page")]
+        results.extend(browser_results)
+        browser_available = not browser_results[0].skipped
+
+        # 生成：对表单内所有可交互节点生成测试用例
+        page_parser = PageParser(os.path.join(work_dir, "page_nodes"))
+        if browser_available:
+            utils = PlaywrightUtils()
+
+            async def parse():
+                await utils.start_browser(headless=headless)
+                try:
+                    return await utils.parse_page_structure(url, os.path.join(work_dir, "screenshots"))
+                finally:
+                    await utils.close_browser()
+
+            structure = asyncio.run(parse())
+        else:
+            structure = synthetic_page_structure(spec, url)
+        page_parser.save_page_structure(structure)
+        node_ids = [node.id for node in structure.nodes if node.is_interactive and node.type != NodeType.FORM]
+        test_generator = TestGenerator(os.path.join(work_dir, "test_cases"), page_parser=page_parser)
+        results.append(measure(
+            "generate_test_case_from_nodes",
+            lambda: test_generator.generate_test_case_from_nodes(structure.id, node_ids, "基准测试用例"),
+            iterations, params=params, unit="node", units_per_call=len(node_ids)
+        ))
+        test_case = test_generator.generate_test_case_from_nodes(structure.id, node_ids, "基准测试用例")
+        test_generator.save_test_case(test_case)
+        steps = test_case.get_test_data_count()
+
+        # 运行：每次运行启动一个浏览器，按测试数据条数计算每秒步骤数
+        test_runner = TestRunner(os.path.join(work_dir, "reports"), test_generator=test_generator)
+        if browser_available:
+            results.append(asyncio.run(measure_async(
+                "run_test_case", lambda: test_runner.run_test_case(test_case.id, headless=headless),
+                run_iterations, warmup=0, params=params, unit="step", units_per_call=steps
+            )))
+        else:
+            results.append(BenchmarkResult.skip("run_test_case", browser_results[0].skipped, params, "step"))
+
+        # 报告：使用与测试数据条数相同的执行记录
+        execution = synthetic_execution(test_case)
+        test_runner.save_execution(execution)
+        report_generator = ReportGenerator(os.path.join(work_dir, "reports"), test_runner=test_runner)
+        for name, render in [
+            ("report_html", lambda: report_generator.generate_html_report(execution.id)),
+            ("report_json", lambda: report_generator.generate_json_report(execution.id)),
+            ("report_junit", lambda: report_generator.generate_junit_report([execution.id])),
+        ]:
+            results.append(measure(name, render, iterations, params=params, unit="step", units_per_call=steps))
+
+    return results
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.harness import BenchmarkResult, measure
+from models.page_node import NodeType, PageNode, PageStructure
+from models.test_case import TestCase, TestViewpoint, TestData, TestType, TestPriority, TestStrategy
+from models.test_data import AssertionResult, TestExecution, TestStatus, TestStepResult
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+# 每个测试观点包含的测试数据条数
+DATA_PER_VIEWPOINT = 10
+_URL = "https://example.com/bench"
+
+
+def _node(index: int) -> PageNode:
+    kind = index % 4
+    node_type = [NodeType.INPUT, NodeType.SELECT, NodeType.BUTTON, NodeType.DIV][kind]
+    return PageNode(
+        id=f"node_{index}",
+        type=node_type,
+        tag_name=node_type.value if node_type != NodeType.DIV else "div",
+        text_content=f"节点 {index}",
+        attributes={'id': f"node_{index}", 'name': f"field_{index}", 'class': "form-control"},
+        xpath=f"/html/body/form/div[{index}]/{node_type.value}",
+        css_selector=f"#node_{index}",
+        position={'x': index % 800, 'y': index * 24},
+        size={'width': 200, 'height': 24},
+        is_interactive=node_type != NodeType.DIV,
+        parent_id=f"node_{index - index % 10}" if index % 10 else None,
+        options=[{'value': f"v{i}", 'text': f"选项 {i}", 'disabled': False} for i in range(5)] if node_type == NodeType.SELECT else [],
+        constraints={'required': True, 'maxlength': 50} if node_type == NodeType.INPUT else {},
+        page_url=_URL
+    )
+
+
+def synthetic_page_structure(size: int) -> PageStructure:
+    """包含 size 个节点的页面结构"""
+    return PageStructure(id=str(uuid.uuid4()), url=_URL, title="存储基准", nodes=[_node(i) for i in range(size)])
+
+
+def synthetic_test_case(size: int) -> TestCase:
+    """包含 size 条测试数据的测试用例"""
+    viewpoints = []
+    for v in range((size + DATA_PER_VIEWPOINT - 1) // DATA_PER_VIEWPOINT):
+        count = min(DATA_PER_VIEWPOINT, size - v * DATA_PER_VIEWPOINT)
+        viewpoints.append(TestViewpoint(
+            id=str(uuid.uuid4()),
+            name=f"测试观点 {v}",
+            strategy=TestStrategy.BOUNDARY,
+            description="边界值测试",
+            target_node=_node(v),
+            test_data_list=[TestData(id=str(uuid.uuid4()), input_value=f"输入{i}" * 3, expected_value=f"输入{i}" * 3,
+                                     assertion_functions=['equals', ('length_between', {'min': 1, 'max': 50})],
+                                     description=f"边界值 {i}") for i in range(count)]
+        ))
+    return TestCase(id=str(uuid.uuid4()), name="存储基准", description="", test_type=TestType.FUNCTIONAL,
+                    priority=TestPriority.MEDIUM, page_url=_URL, viewpoints=viewpoints)
+
+
+def synthetic_execution(size: int) -> TestExecution:
+    """包含 size 个步骤结果的执行记录"""
+    start = datetime.now()
+    steps = [TestStepResult(
+        step_id=str(uuid.uuid4()),
+        step_number=i + 1,
+        action="input",
+        status=TestStatus.PASSED if i % 10 else TestStatus.FAILED,
+        start_time=start + timedelta(milliseconds=i),
+        end_time=start + timedelta(milliseconds=i + 1),
+        duration=0.001,
+        input_data=f"输入{i}",
+        assertions=[AssertionResult(assertion_type="equals", expected_value=f"输入{i}", actual_value=f"输入{i}",
+                                    passed=True, message="验证输入值", execution_time=0.0001)]
+    ) for i in range(size)]
+    return TestExecution(id=str(uuid.uuid4()), test_case_id=str(uuid.uuid4()), test_case_name="存储基准",
+                         status=TestStatus.FAILED, start_time=start, end_time=start + timedelta(seconds=size / 1000),
+                         step_results=steps, total_steps=size)
+
+
+# 各模型：(构造函数, 转字典, 从字典创建, 从文件加载)
+_MODELS: Dict[str, Tuple[Callable[[int], Any], Callable[[Any], Dict], Callable[[Dict], Any], Callable[[str], Any]]] = {
+    'page_structure': (synthetic_page_structure, PageStructure.to_dict, lambda d: PageStructure(**d),
+                       PageStructure.load_from_file),
+    'test_case': (synthetic_test_case, TestCase.to_dict, TestCase.from_dict, TestCase.load_from_file),
+    'test_execution': (synthetic_execution, TestExecution.to_dict, lambda d: TestExecution(**d),
+                       TestExecution.load_from_file),
+}
+FORMATS = ['dict', 'json', 'file']
+MODELS = list(_MODELS)
+
+
+def run_storage_benchmarks(sizes: List[int] = None, models: List[str] = None, formats: List[str] = None,
+                           iterations: int = 3, track_memory: bool = True) -> List[BenchmarkResult]:
+    """测量各模型在各规模下的序列化和反序列化
+
+    格式：dict 为模型与字典互转；json 为模型与JSON字符串互转；file 为 save_to_file/load_from_file。
+    每项结果的名称为 <模型>.<ser|deser>.<格式>，参数为规模，吞吐量单位为节点/测试数据/步骤条数。
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes or DEFAULT_SIZES:
+            # 10万条规模单次耗时已足够稳定，不再预热
+            warmup = 1 if size < 100000 else 0
+            for model_name in models or MODELS:
+                build, to_dict, from_dict, load_from_file = _MODELS[model_name]
+                model = build(size)
+                data = to_dict(model)
+                text = json.dumps(data, ensure_ascii=False)
+                path = os.path.join(work_dir, f"{model_name}_{size}.json")
+                model.save_to_file(path)
+                cases = {
+                    'dict': (lambda: to_dict(model), lambda d: from_dict(d), lambda: json.loads(text)),
+                    'json': (lambda: json.dumps(to_dict(model), ensure_ascii=False),
+                             lambda t: from_dict(json.loads(t)), lambda: text),
+                    'file': (lambda: model.save_to_file(path), lambda p: load_from_file(p), lambda: path),
+                }
+                for format_name in formats or FORMATS:
+                    serialize, deserialize, deserialize_input = cases[format_name]
+                    params = {'size': size}
+                    results.append(measure(f"{model_name}.ser.{format_name}", serialize, iterations, warmup,
+                                           params, "item", size, track_memory))
+                    # 反序列化的输入每次重新准备：from_dict 会就地修改传入的字典
+                    results.append(measure(f"{model_name}.deser.{format_name}", deserialize, iterations, warmup,
+                                           params, "item", size, track_memory, setup=deserialize_input))
+                del model, data, text
+    return results
@@ -0,0 +1 @@
+# 命令行模块初始化文件（供CI等无界面环境使用，不依赖nicegui）
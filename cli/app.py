@@ -0,0 +1,545 @@
+"""
+无界面命令行入口
+
+用法:
+    python -m cli parse <url> [--forms] [--block-resource <类型>] [--block-host <主机>] [--no-asset-cache] [--auth-role <角色>]
+                          [--screenshot-dir <目录>] [--screenshot-distance N]
+    python -m cli generate <structure_id> --name <名称> [--node <节点ID> ...]
+    python -m cli generate <structure_id> --name <名称> --form <表单节点ID> [--strength N]
+    python -m cli run [<测试用例ID> ...] [--filter <模式>] [--shard K/N] [--concurrency N] [--format junit|json|html]
+                        [--block-resource <类型>] [--block-host <主机>] [--no-asset-cache]
+                        [--har off|record|replay|auto] [--har-strict] [--no-live-fallback]
+                        [--auth-role <角色>] [--trace <文件>] [--no-trace] [--fsync always|batch|never] [--fsync-batch N]
+                        [--screenshot-dir <目录>] [--screenshot-distance N] [--baselines-dir <目录>]
+    python -m cli report <执行ID> ... [--format junit|json|html]
+    python -m cli auth login <url> <角色> <登录测试用例ID> [--ttl 秒] | auth list | auth clear <url> <角色>
+    python -m cli list structures|cases|executions
+    python -m cli baseline approve <执行ID> ... | baseline clear <测试用例ID> ... [--baselines-dir <目录>]
+    python -m cli compact [--max-age-days N] [--keep N]
+    python -m cli migrate [--reports-dir <目录>]
+    python -m cli gc [--max-execution-age-days N] [--max-executions N] [--max-screenshot-age-days N]
+                     [--max-screenshots N] [--max-screenshot-mb N] [--grace 秒]
+
+核心模块在各子命令内部按需导入，保证启动时不加载 nicegui、ui.* 以及浏览器相关依赖。
+"""
+
+import argparse
+import fnmatch
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+# 退出码（与 pytest/JUnit 约定一致）
+EXIT_OK = 0
+EXIT_TESTS_FAILED = 1
+EXIT_INTERRUPTED = 2
+EXIT_INTERNAL_ERROR = 3
+EXIT_USAGE_ERROR = 4
+EXIT_NO_TESTS = 5
+
+REPORT_FORMATS = ['junit', 'json', 'html']
+
+
+class UsageError(Exception):
+    """命令行参数错误"""
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """参数错误时返回 EXIT_USAGE_ERROR 而不是 argparse 默认的 2"""
+
+    def error(self, message):
+        self.print_usage(sys.stderr)
+        self.exit(EXIT_USAGE_ERROR, f"{self.prog}: error: {message}\n")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """解析分片参数 K/N（K 从 1 开始）"""
+    try:
+        index, total = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise UsageError(f"无效的分片参数: {value}，格式应为 K/N")
+    if total < 1 or not 1 <= index <= total:
+        raise UsageError(f"无效的分片参数: {value}，要求 1 <= K <= N")
+    return index, total
+
+
+def select_test_cases(test_cases: Sequence[Tuple[str, str]],
+                      filters: Optional[List[str]] = None,
+                      shard: Optional[Tuple[int, int]] = None) -> List[Tuple[str, str]]:
+    """按过滤条件和分片选择测试用例
+
+    test_cases 为 (id, name) 列表。filters 为通配符模式，匹配 id 或名称（不区分大小写），
+    满足任意一个即选中。分片按 id 排序后取模，保证不同机器上的划分结果一致。
+    """
+    selected = sorted(test_cases, key=lambda case: case[0])
+
+    if filters:
+        patterns = [pattern.lower() for pattern in filters]
+        selected = [
+            case for case in selected
+            if any(fnmatch.fnmatch(case[0].lower(), p) or fnmatch.fnmatch(case[1].lower(), p) for p in patterns)
+        ]
+
+    if shard:
+        index, total = shard
+        selected = [case for i, case in enumerate(selected) if i % total == index - 1]
+
+    return selected
+
+
+def exit_code_for_executions(executions) -> int:
+    """根据执行结果计算退出码"""
+    if not executions:
+        return EXIT_NO_TESTS
+    if any(execution.status.value != 'passed' for execution in executions):
+        return EXIT_TESTS_FAILED
+    return EXIT_OK
+
+
+def write_reports(report_generator, execution_ids: List[str], formats: List[str], suite_name: str) -> List[str]:
+    """按指定格式生成报告，返回报告文件路径"""
+    paths = []
+    for report_format in formats:
+        if report_format == 'junit':
+            paths.append(report_generator.generate_junit_report(execution_ids, suite_name))
+        elif report_format == 'json':
+            paths.extend(report_generator.generate_json_report(execution_id) for execution_id in execution_ids)
+        elif report_format == 'html':
+            if len(execution_ids) == 1:
+                paths.append(report_generator.generate_html_report(execution_ids[0]))
+            else:
+                paths.append(report_generator.generate_suite_report(execution_ids, suite_name))
+    return paths
+
+
+def network_config_from_args(args):
+    """根据命令行参数生成网络路由配置"""
+    from utils.network_utils import NetworkConfig
+
+    return NetworkConfig(
+        blocked_resource_types=args.block_resource or [],
+        blocked_hosts=args.block_host or [],
+        cache_enabled=not args.no_asset_cache,
+        cache_dir=args.asset_cache_dir
+    )
+
+
+def har_config_from_args(args):
+    """根据命令行参数生成 HAR 录制回放配置"""
+    from utils.network_utils import HarConfig, HarMode
+
+    return HarConfig(
+        mode=HarMode(args.har),
+        har_dir=args.har_dir,
+        strict=args.har_strict,
+        fallback_to_live=not args.no_live_fallback
+    )
+
+
+def screenshot_options_from_args(args) -> dict:
+    """截图存储参数（传给 ServiceContainer）"""
+    if args.screenshot_distance is not None and not 0 <= args.screenshot_distance <= 64:
+        raise UsageError("--screenshot-distance 必须在 0 到 64 之间")
+    return {'screenshot_dir': args.screenshot_dir, 'perceptual_distance': args.screenshot_distance}
+
+
+def cmd_parse(args) -> int:
+    import asyncio
+    from core.services import ServiceContainer
+
+    services = ServiceContainer(page_nodes_dir=args.data_dir, network_config=network_config_from_args(args),
+                                auth_states_dir=args.auth_dir, **screenshot_options_from_args(args))
+    page_parser = services.page_parser
+    if args.forms:
+        structure = asyncio.run(page_parser.parse_forms_from_url(args.url, headless=not args.headed, auth_role=args.auth_role))
+    else:
+        structure = asyncio.run(page_parser.parse_page_from_url(args.url, headless=not args.headed, auth_role=args.auth_role))
+
+    print(f"✅ 页面解析完成: {structure.title} ({len(structure.nodes)} 个节点)")
+    print(structure.id)
+    return EXIT_OK
+
+
+def cmd_generate(args) -> int:
+    from core.services import ServiceContainer
+    from models.test_case import TestType, TestPriority
+
+    test_generator = ServiceContainer(test_cases_dir=args.data_dir).test_generator
+    if args.form:
+        if args.strength < 1:
+            raise UsageError("--strength 必须大于等于 1")
+        test_case = test_generator.generate_form_combination_test_case(
+            structure_id=args.structure_id,
+            form_node_id=args.form,
+            test_name=args.name,
+            strength=args.strength,
+            test_type=TestType(args.type),
+            priority=TestPriority(args.priority),
+            description=args.description
+        )
+        test_generator.save_test_case(test_case)
+        print(f"✅ 组合测试用例已生成: {test_case.name} ({test_case.get_test_data_count()} 组表单数据)")
+        print(test_case.id)
+        return EXIT_OK
+
+    node_ids = args.node
+    if not node_ids:
+        node_ids = [node.id for node in test_generator.page_parser.get_interactive_nodes(args.structure_id)]
+        if not node_ids:
+            print(f"❌ 页面结构中没有可交互节点: {args.structure_id}", file=sys.stderr)
+            return EXIT_NO_TESTS
+
+    test_case = test_generator.generate_test_case_from_nodes(
+        structure_id=args.structure_id,
+        node_ids=node_ids,
+        test_name=args.name,
+        test_type=TestType(args.type),
+        priority=TestPriority(args.priority),
+        description=args.description
+    )
+    test_generator.save_test_case(test_case)
+
+    print(f"✅ 测试用例已生成: {test_case.name} ({len(test_case.viewpoints)} 个测试观点, {test_case.get_test_data_count()} 条测试数据)")
+    print(test_case.id)
+    return EXIT_OK
+
+
+def cmd_run(args) -> int:
+    import asyncio
+    from core.services import ServiceContainer
+    from utils.tracing import new_tracer, set_tracing_enabled, export_chrome_trace
+    from utils.atomic_io import configure_fsync, flush_pending_writes
+
+    shard = parse_shard(args.shard) if args.shard else None
+    if args.concurrency < 1:
+        raise UsageError("--concurrency 必须大于等于 1")
+    if args.no_trace:
+        if args.trace:
+            raise UsageError("--trace 与 --no-trace 不能同时使用")
+        set_tracing_enabled(False)
+    if args.fsync_batch is not None and args.fsync_batch < 1:
+        raise UsageError("--fsync-batch 必须大于等于 1")
+    configure_fsync(args.fsync, args.fsync_batch)
+
+    services = ServiceContainer(reports_dir=args.reports_dir, network_config=network_config_from_args(args),
+                                har_config=har_config_from_args(args), auth_states_dir=args.auth_dir,
+                                baselines_dir=args.baselines_dir, **screenshot_options_from_args(args))
+    test_runner = services.test_runner
+    listing = test_runner.test_generator.list_test_cases()
+    available = [(row[0], row[1]) for row in listing['rows']]
+
+    if args.test_case_ids:
+        known = {case_id for case_id, _ in available}
+        missing = [case_id for case_id in args.test_case_ids if case_id not in known]
+        if missing:
+            raise UsageError(f"测试用例不存在: {', '.join(missing)}")
+        available = [case for case in available if case[0] in set(args.test_case_ids)]
+
+    selected = select_test_cases(available, args.filter, shard)
+    if not selected:
+        print("⚠️ 没有匹配的测试用例", file=sys.stderr)
+        return EXIT_NO_TESTS
+
+    print(f"▶️ 运行 {len(selected)} 个测试用例 (并发 {args.concurrency})")
+    executions = asyncio.run(test_runner.run_test_suite(
+        [case_id for case_id, _ in selected],
+        headless=not args.headed,
+        concurrency=args.concurrency,
+        auth_role=args.auth_role
+    ))
+
+    for execution in executions:
+        mark = '✅' if execution.status.value == 'passed' else '❌'
+        print(f"{mark} {execution.test_case_name}: {execution.status.value} "
+              f"({execution.passed_steps}/{execution.total_steps} 步骤通过, {execution.duration or 0:.2f}s)")
+        if execution.error_message:
+            print(f"   {execution.error_message}")
+
+    # 报告生成的耗时记录在会话轨道上
+    session_tracer = new_tracer(track="session")
+    if session_tracer is None:
+        report_paths = write_reports(services.report_generator, [e.id for e in executions], args.format or ['junit'], args.suite_name)
+    else:
+        with session_tracer.activate():
+            report_paths = write_reports(services.report_generator, [e.id for e in executions], args.format or ['junit'], args.suite_name)
+    for path in report_paths:
+        print(f"📊 报告: {path}")
+
+    if args.trace:
+        spans = [span for execution in executions for span in execution.spans]
+        if session_tracer is not None:
+            spans.extend(session_tracer.spans)
+        print(f"⏱️ 计时: {export_chrome_trace(spans, args.trace)}")
+
+    flush_pending_writes()
+    return exit_code_for_executions(executions)
+
+
+def cmd_report(args) -> int:
+    from core.services import ServiceContainer
+
+    report_generator = ServiceContainer(reports_dir=args.reports_dir).report_generator
+    missing = [execution_id for execution_id in args.execution_ids
+               if report_generator.test_runner.load_execution(execution_id) is None]
+    if missing:
+        raise UsageError(f"执行记录不存在: {', '.join(missing)}")
+
+    for path in write_reports(report_generator, args.execution_ids, args.format or ['html'], args.suite_name):
+        print(path)
+    return EXIT_OK
+
+
+def cmd_list(args) -> int:
+    if args.kind == 'structures':
+        from core.page_parser import PageParser
+        table = PageParser(args.data_dir).list_page_structures()
+    elif args.kind == 'cases':
+        from core.test_generator import TestGenerator
+        table = TestGenerator(args.data_dir).list_test_cases()
+    else:
+        from core.test_runner import TestRunner
+        table = TestRunner(args.data_dir).list_executions()
+
+    print('\t'.join(str(header) for header in table['headers']))
+    for row in table['rows']:
+        print('\t'.join('' if value is None else str(value) for value in row))
+    return EXIT_OK
+
+
+def cmd_compact(args) -> int:
+    import os
+    from datetime import timedelta
+    from utils.execution_log import ExecutionLog
+
+    if args.max_age_days is not None and args.max_age_days < 0:
+        raise UsageError("--max-age-days 不能小于 0")
+    if args.keep is not None and args.keep < 0:
+        raise UsageError("--keep 不能小于 0")
+
+    execution_log = ExecutionLog(os.path.join(args.reports_dir, 'executions'))
+    removed = []
+    if args.max_age_days is not None or args.keep is not None:
+        max_age = timedelta(days=args.max_age_days) if args.max_age_days is not None else None
+        removed = execution_log.prune(max_age=max_age, max_count=args.keep)
+    reclaimed = execution_log.compact()
+    stats = execution_log.stats()
+    print(f"✅ 删除 {len(removed)} 条执行记录，回收 {reclaimed} 字节；"
+          f"剩余 {stats['executions']} 条，{stats['segments']} 个段，{stats['total_bytes']} 字节")
+    return EXIT_OK
+
+
+def cmd_migrate(args) -> int:
+    import os
+    from utils.execution_log import ExecutionLog
+
+    execution_log = ExecutionLog(os.path.join(args.reports_dir, 'executions'))
+    imported = execution_log.import_legacy(args.reports_dir)
+    print(f"✅ 导入旧格式执行记录 {imported} 条；共 {len(execution_log)} 条")
+    return EXIT_OK
+
+
+def cmd_gc(args) -> int:
+    from core.retention import RetentionPolicy
+    from core.services import ServiceContainer
+
+    limits = [args.max_execution_age_days, args.max_executions, args.max_screenshot_age_days,
+              args.max_screenshots, args.max_screenshot_mb, args.grace]
+    if any(value is not None and value < 0 for value in limits):
+        raise UsageError("保留策略的数值不能小于 0")
+
+    policy = RetentionPolicy(
+        max_execution_age_days=args.max_execution_age_days,
+        max_executions=args.max_executions,
+        max_screenshot_age_days=args.max_screenshot_age_days,
+        max_screenshots=args.max_screenshots,
+        max_screenshot_bytes=int(args.max_screenshot_mb * 1024 * 1024) if args.max_screenshot_mb is not None else None,
+        orphan_grace=args.grace if args.grace is not None else RetentionPolicy.orphan_grace
+    )
+    retention = ServiceContainer(reports_dir=args.reports_dir, screenshot_dir=args.screenshot_dir).retention
+    report = retention.collect(policy)
+    print(f"✅ {report.summary()}")
+    return EXIT_OK
+
+
+def cmd_baseline(args) -> int:
+    from core.services import ServiceContainer
+
+    services = ServiceContainer(reports_dir=args.reports_dir, baselines_dir=args.baselines_dir)
+    baselines = services.visual_baselines
+    if args.action == 'approve':
+        for execution_id in args.ids:
+            execution = services.test_runner.load_execution(execution_id)
+            if execution is None:
+                raise UsageError(f"执行记录不存在: {execution_id}")
+            approved = baselines.approve(execution)
+            print(f"✅ {execution.test_case_name}: 更新 {len(approved)} 个步骤的视觉基线")
+    else:
+        for test_case_id in args.ids:
+            print(f"🗑️ {test_case_id}: 删除 {baselines.delete(test_case_id)} 个视觉基线")
+    return EXIT_OK
+
+
+def cmd_auth(args) -> int:
+    from utils.auth_state import StorageStateStore
+
+    store = StorageStateStore(args.auth_dir)
+    if args.action == 'login':
+        if not (args.url and args.role and args.login_case):
+            raise UsageError("auth login 需要 <url> <角色> <登录测试用例ID>")
+        profile = store.register_login(args.url, args.role, args.login_case, ttl=args.ttl)
+        print(f"✅ 已设置 {profile.origin} 角色 {profile.role} 的登录用例: {profile.login_test_case_id}")
+    elif args.action == 'clear':
+        if not (args.url and args.role):
+            raise UsageError("auth clear 需要 <url> <角色>")
+        store.invalidate(args.url, args.role)
+        print(f"✅ 已清除 {args.url} 角色 {args.role} 的登录状态")
+    else:
+        print('\t'.join(['源', '角色', '登录用例', '有效期(秒)', '状态']))
+        for profile in store.list_logins():
+            state = '有效' if store.get(profile.origin, profile.role) else '过期'
+            print('\t'.join([profile.origin, profile.role, profile.login_test_case_id, str(profile.ttl), state]))
+    return EXIT_OK
+
+
+def _add_auth_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--auth-role', help='以该角色的登录状态打开页面（过期时自动运行登录用例）')
+    parser.add_argument('--auth-dir', default='data/auth_states', help='登录状态缓存目录')
+
+
+def _add_network_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--block-resource', action='append', help='拦截的资源类型（image、font、media 等），可重复')
+    parser.add_argument('--block-host', action='append', help='拦截的主机（同时匹配子域名），可重复')
+    parser.add_argument('--no-asset-cache', action='store_true', help='不使用静态资源磁盘缓存')
+    parser.add_argument('--asset-cache-dir', default='data/http_cache', help='静态资源缓存目录')
+
+
+def _add_screenshot_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--screenshot-dir', default='data/screenshots', help='截图目录（按内容哈希命名，相同截图只保存一份）')
+    parser.add_argument('--screenshot-distance', type=int,
+                        help='按感知哈希合并近似截图：与已存截图相差不超过 N 位（0-64）时引用已存截图；默认只合并完全相同的截图')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = _ArgumentParser(prog='python -m cli', description='自动化测试工具命令行（无界面）')
+    subparsers = parser.add_subparsers(dest='command', required=True, parser_class=_ArgumentParser)
+
+    parse_parser = subparsers.add_parser('parse', help='解析页面结构')
+    parse_parser.add_argument('url', help='页面URL')
+    parse_parser.add_argument('--forms', action='store_true', help='只解析表单相关节点')
+    parse_parser.add_argument('--headed', action='store_true', help='有头模式运行浏览器')
+    parse_parser.add_argument('--data-dir', default='data/page_nodes', help='页面结构存储目录')
+    _add_network_arguments(parse_parser)
+    _add_auth_arguments(parse_parser)
+    _add_screenshot_arguments(parse_parser)
+    parse_parser.set_defaults(func=cmd_parse)
+
+    generate_parser = subparsers.add_parser('generate', help='从页面结构生成测试用例')
+    generate_parser.add_argument('structure_id', help='页面结构ID')
+    generate_parser.add_argument('--name', required=True, help='测试用例名称')
+    generate_parser.add_argument('--node', action='append', help='节点ID，可重复；默认使用所有可交互节点')
+    generate_parser.add_argument('--form', help='表单节点ID；指定时生成整表单的组合测试数据')
+    generate_parser.add_argument('--strength', type=int, default=2, help='组合强度，2 为两两组合（配合 --form）')
+    generate_parser.add_argument('--description', default='', help='测试用例描述')
+    generate_parser.add_argument('--type', default='functional', choices=['functional', 'ui', 'performance', 'security', 'integration'])
+    generate_parser.add_argument('--priority', default='medium', choices=['low', 'medium', 'high', 'critical'])
+    generate_parser.add_argument('--data-dir', default='data/test_cases', help='测试用例存储目录')
+    generate_parser.set_defaults(func=cmd_generate)
+
+    run_parser = subparsers.add_parser('run', help='运行测试用例并生成报告')
+    run_parser.add_argument('test_case_ids', nargs='*', help='测试用例ID；默认运行全部')
+    run_parser.add_argument('--filter', action='append', help='按ID或名称过滤（通配符，可重复）')
+    run_parser.add_argument('--shard', help='分片 K/N，只运行第 K 份')
+    run_parser.add_argument('--concurrency', type=int, default=1, help='同时运行的浏览器数量')
+    run_parser.add_argument('--format', action='append', choices=REPORT_FORMATS, help='报告格式，可重复；默认 junit')
+    run_parser.add_argument('--suite-name', default='命令行测试套件', help='套件报告名称')
+    run_parser.add_argument('--headed', action='store_true', help='有头模式运行浏览器')
+    run_parser.add_argument('--reports-dir', default='data/reports', help='执行记录和报告目录')
+    run_parser.add_argument('--baselines-dir', default='data/baselines', help='visual_match 断言的视觉基线目录')
+    _add_network_arguments(run_parser)
+    _add_auth_arguments(run_parser)
+    _add_screenshot_arguments(run_parser)
+    run_parser.add_argument('--har', default='off', choices=['off', 'record', 'replay', 'auto'],
+                            help='按测试用例录制/回放网络流量；auto 有录制时回放，否则录制')
+    run_parser.add_argument('--har-dir', default='data/har', help='HAR 录制文件目录')
+    run_parser.add_argument('--har-strict', action='store_true', help='回放时中止未录制的请求')
+    run_parser.add_argument('--no-live-fallback', action='store_true', help='回放时没有录制文件的用例报错，而不是使用实际网络')
+    run_parser.add_argument('--trace', help='导出各阶段耗时（Chrome trace 格式，可用 chrome://tracing 或 Perfetto 打开）')
+    run_parser.add_argument('--no-trace', action='store_true', help='不记录各阶段耗时')
+    run_parser.add_argument('--fsync', choices=['always', 'batch', 'never'],
+                            help='执行记录等文件的落盘方式：always 每个文件 fsync；batch 分组 fsync；never 不 fsync。'
+                                 '默认取环境变量 AI_TEST_FSYNC，未设置时为 batch')
+    run_parser.add_argument('--fsync-batch', type=int, help='batch 方式下每组落盘的文件数，默认 32')
+    run_parser.set_defaults(func=cmd_run)
+
+    report_parser = subparsers.add_parser('report', help='为已有执行记录生成报告')
+    report_parser.add_argument('execution_ids', nargs='+', help='执行记录ID')
+    report_parser.add_argument('--format', action='append', choices=REPORT_FORMATS, help='报告格式，可重复；默认 html')
+    report_parser.add_argument('--suite-name', default='命令行测试套件', help='套件报告名称')
+    report_parser.add_argument('--reports-dir', default='data/reports', help='执行记录和报告目录')
+    report_parser.set_defaults(func=cmd_report)
+
+    auth_parser = subparsers.add_parser('auth', help='管理登录状态缓存')
+    auth_parser.add_argument('action', choices=['login', 'list', 'clear'])
+    auth_parser.add_argument('url', nargs='?', help='页面URL（按其源区分）')
+    auth_parser.add_argument('role', nargs='?', help='角色名称')
+    auth_parser.add_argument('login_case', nargs='?', help='登录测试用例ID（login）')
+    auth_parser.add_argument('--ttl', type=int, help='登录状态有效秒数，默认3600')
+    auth_parser.add_argument('--auth-dir', default='data/auth_states', help='登录状态缓存目录')
+    auth_parser.set_defaults(func=cmd_auth)
+
+    list_parser = subparsers.add_parser('list', help='列出数据')
+    list_parser.add_argument('kind', choices=['structures', 'cases', 'executions'])
+    list_parser.add_argument('--data-dir', help='数据目录，默认使用对应模块的目录')
+    list_parser.set_defaults(func=cmd_list)
+
+    baseline_parser = subparsers.add_parser('baseline', help='管理视觉回归基线')
+    baseline_parser.add_argument('action', choices=['approve', 'clear'],
+                                 help='approve 把执行记录的截图设为新基线；clear 删除测试用例的基线')
+    baseline_parser.add_argument('ids', nargs='+', help='执行记录ID（approve）或测试用例ID（clear）')
+    baseline_parser.add_argument('--reports-dir', default='data/reports', help='执行记录和报告目录')
+    baseline_parser.add_argument('--baselines-dir', default='data/baselines', help='视觉基线目录')
+    baseline_parser.set_defaults(func=cmd_baseline)
+
+    compact_parser = subparsers.add_parser('compact', help='按保留策略删除旧执行记录并压缩执行记录日志')
+    compact_parser.add_argument('--max-age-days', type=float, help='删除开始时间早于该天数之前的执行记录')
+    compact_parser.add_argument('--keep', type=int, help='只保留最新的 N 条执行记录')
+    compact_parser.add_argument('--reports-dir', default='data/reports', help='执行记录和报告目录')
+    compact_parser.set_defaults(func=cmd_compact)
+
+    migrate_parser = subparsers.add_parser('migrate', help='把旧版本的 <ID>.json 执行记录文件导入执行记录日志（可重复执行）')
+    migrate_parser.add_argument('--reports-dir', default='data/reports', help='执行记录和报告目录')
+    migrate_parser.set_defaults(func=cmd_migrate)
+
+    gc_parser = subparsers.add_parser('gc', help='按保留策略回收截图、执行记录和临时文件，输出回收的字节数')
+    gc_parser.add_argument('--max-execution-age-days', type=float, help='删除开始时间早于该天数之前的执行记录')
+    gc_parser.add_argument('--max-executions', type=int, help='只保留最新的 N 条执行记录')
+    gc_parser.add_argument('--max-screenshot-age-days', type=float, help='删除早于该天数之前的截图（即使仍被引用）')
+    gc_parser.add_argument('--max-screenshots', type=int, help='截图最多保留的个数，超出时从最旧的开始删除')
+    gc_parser.add_argument('--max-screenshot-mb', type=float, help='截图最多占用的空间（MB），超出时从最旧的开始删除')
+    gc_parser.add_argument('--grace', type=float, help='未被引用的截图和临时文件至少保留的秒数，默认3600')
+    gc_parser.add_argument('--reports-dir', default='data/reports', help='执行记录和报告目录')
+    gc_parser.add_argument('--screenshot-dir', default='data/screenshots', help='截图目录')
+    gc_parser.set_defaults(func=cmd_gc)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行主函数，返回退出码"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'list' and not args.data_dir:
+        args.data_dir = {'structures': 'data/page_nodes', 'cases': 'data/test_cases', 'executions': 'data/reports'}[args.kind]
+
+    try:
+        return args.func(args)
+    except UsageError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+    except KeyboardInterrupt:
+        print("⚠️ 已中断", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        print(f"❌ 执行失败: {e}", file=sys.stderr)
+        return EXIT_INTERNAL_ERROR
@@ -0,0 +1,204 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+from models.page_node import PageNode, NodeType
+from models.test_case import TestCase, TestViewpoint, TestData, TestStrategy
+
+
+@dataclass
+class PlannedStep:
+    """执行计划中的一个步骤，key 相同的步骤互相等价"""
+    viewpoint: TestViewpoint
+    test_data: TestData
+    key: Tuple
+
+
+@dataclass
+class FormFill:
+    """表单字段的一次填写操作"""
+    selector: str
+    action: str  # fill / select_option / check / uncheck
+    value: Any = None
+
+
+@dataclass
+class FormPlan:
+    """表单级执行计划：一次填写表单的所有字段，提交一次，再校验各测试数据的断言
+
+    members 为本次填写覆盖的测试数据及其对应字段的选择器（整表单组合测试数据对应 None）。
+    """
+    fills: List[FormFill]
+    members: List[Tuple[PlannedStep, Optional[str]]]
+    submit: bool = True
+    submit_selector: Optional[str] = None
+
+
+@dataclass
+class ExecutionPlan:
+    """测试用例的执行计划
+
+    steps 为测试用例中所有测试数据按原顺序对应的步骤；units 为实际执行的单元，
+    每个单元是单独执行的步骤或表单级执行计划，等价步骤只出现一次。
+    """
+    test_case_id: str
+    steps: List[PlannedStep] = field(default_factory=list)
+    units: List[Union[PlannedStep, FormPlan]] = field(default_factory=list)
+
+    @property
+    def unique_count(self) -> int:
+        """去重后需要实际执行的步骤数"""
+        return len({step.key for step in self.steps})
+
+    @property
+    def duplicate_count(self) -> int:
+        """可以复用其他步骤结果的步骤数"""
+        return len(self.steps) - self.unique_count
+
+
+class ExecutionPlanner:
+    """执行计划生成器
+
+    在运行前遍历测试用例的所有测试数据，找出作用于同一节点、输入相同、预期值和断言也相同的测试数据。
+    这些测试数据的执行结果必然相同，运行器只执行其中第一条，结果复用到其余各条。
+    form_plans 为 True 时，同一表单中各字段的测试数据编成表单级执行计划，整表单填写、提交一次。
+    """
+
+    # 表单字段节点类型对应的填写操作
+    FIELD_ACTIONS = {
+        NodeType.INPUT: 'fill',
+        NodeType.SELECT: 'select_option',
+        NodeType.CHECKBOX: 'check',
+        NodeType.RADIO: 'check'
+    }
+
+    def __init__(self, deduplicate: bool = True, form_plans: bool = True, submit_forms: bool = True):
+        self.deduplicate = deduplicate
+        self.form_plans = form_plans
+        self.submit_forms = submit_forms
+
+    def plan(self, test_case: TestCase) -> ExecutionPlan:
+        """生成执行计划，步骤顺序与测试用例中的顺序一致"""
+        plan = ExecutionPlan(test_case_id=test_case.id)
+        for viewpoint in test_case.viewpoints:
+            for test_data in viewpoint.test_data_list:
+                key = self.equivalence_key(viewpoint, test_data) if self.deduplicate else (test_data.id,)
+                plan.steps.append(PlannedStep(viewpoint=viewpoint, test_data=test_data, key=key))
+
+        seen = set()
+        unique_steps = []
+        for step in plan.steps:
+            if step.key not in seen:
+                seen.add(step.key)
+                unique_steps.append(step)
+        plan.units = self._compile_units(unique_steps) if self.form_plans else unique_steps
+        return plan
+
+    def _compile_units(self, steps: List[PlannedStep]) -> List[Union[PlannedStep, FormPlan]]:
+        """把同一表单中各字段的测试数据编成若干轮整表单填写
+
+        第 n 轮为每个字段填写它的第 n 条测试数据，测试数据较少的字段用其第一条补齐，每轮提交一次。
+        表单的提交按钮在测试用例中时由它提交，其测试数据归入第一轮；不属于表单的步骤仍单独执行。
+        """
+        units: List[Union[PlannedStep, Dict[str, Any]]] = []
+        groups: Dict[str, Dict[str, Any]] = {}
+
+        for step in steps:
+            node = step.viewpoint.target_node
+            if self.is_form_fill(step.viewpoint, step.test_data):
+                units.append(FormPlan(
+                    fills=[FormFill(entry['selector'], entry['action'], entry.get('value')) for entry in step.test_data.input_value],
+                    members=[(step, None)],
+                    submit=self.submit_forms
+                ))
+                continue
+
+            form_id = node.parent_id if node else None
+            is_field = node is not None and node.type in self.FIELD_ACTIONS
+            if not form_id or not (is_field or self._is_submit_button(node)):
+                units.append(step)
+                continue
+
+            group = groups.get(form_id)
+            if group is None:
+                group = {'fields': {}, 'submit_selector': None, 'submit_steps': []}
+                groups[form_id] = group
+                units.append(group)
+            selector = self.target_selector(node)
+            if is_field:
+                group['fields'].setdefault(selector, []).append(step)
+            else:
+                group['submit_selector'] = group['submit_selector'] or selector
+                group['submit_steps'].append(step)
+
+        compiled: List[Union[PlannedStep, FormPlan]] = []
+        for unit in units:
+            if not isinstance(unit, dict):
+                compiled.append(unit)
+            elif not unit['fields']:
+                compiled.extend(unit['submit_steps'])
+            else:
+                compiled.extend(self._compile_form_rounds(unit))
+        return compiled
+
+    def _compile_form_rounds(self, group: Dict[str, Any]) -> List[FormPlan]:
+        fields: Dict[str, List[PlannedStep]] = group['fields']
+        rounds = max(len(field_steps) for field_steps in fields.values())
+        plans = []
+        for index in range(rounds):
+            fills = []
+            members = []
+            for selector, field_steps in fields.items():
+                step = field_steps[index] if index < len(field_steps) else field_steps[0]
+                fills.append(self._field_fill(selector, step))
+                if index < len(field_steps):
+                    members.append((step, selector))
+            if index == 0:
+                members.extend((step, group['submit_selector']) for step in group['submit_steps'])
+            plans.append(FormPlan(fills=fills, members=members, submit=self.submit_forms,
+                                  submit_selector=group['submit_selector']))
+        return plans
+
+    def _field_fill(self, selector: str, step: PlannedStep) -> FormFill:
+        action = self.FIELD_ACTIONS[step.viewpoint.target_node.type]
+        value = step.test_data.input_value
+        if action == 'check':
+            return FormFill(selector, 'check')
+        return FormFill(selector, action, '' if value is None else str(value))
+
+    @staticmethod
+    def _is_submit_button(node: Optional[PageNode]) -> bool:
+        if node is None or node.type != NodeType.BUTTON:
+            return False
+        default_type = 'submit' if node.tag_name == 'button' else ''
+        return node.attributes.get('type', default_type).lower() == 'submit'
+
+    @staticmethod
+    def is_form_fill(viewpoint: TestViewpoint, test_data: TestData) -> bool:
+        """是否为整表单组合测试数据（输入值为字段操作列表）"""
+        return viewpoint.strategy == TestStrategy.COMPREHENSIVE and isinstance(test_data.input_value, list)
+
+    def equivalence_key(self, viewpoint: TestViewpoint, test_data: TestData) -> Tuple:
+        """等价键：目标节点、操作方式、输入值、预期值和断言函数"""
+        node = viewpoint.target_node
+        return (
+            self.target_selector(node),
+            node.type.value if node else None,
+            self.is_form_fill(viewpoint, test_data),
+            self._canonical(test_data.input_value),
+            self._canonical(test_data.expected_value),
+            self._canonical(test_data.assertion_functions)
+        )
+
+    @staticmethod
+    def target_selector(node: Optional[PageNode]) -> Optional[str]:
+        """节点的目标选择器：优先 id 属性，其次 CSS 选择器，最后 XPath"""
+        if not node:
+            return None
+        if node.attributes.get('id'):
+            return f"#{node.attributes['id']}"
+        return node.css_selector or node.xpath
+
+    @staticmethod
+    def _canonical(value) -> str:
+        # 元组和列表序列化后相同，与保存到文件再加载后的测试数据一致
+        return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
@@ -1,9 +1,14 @@
 import asyncio
 import os
-import json
 from typing import List, Dict, Any, Optional
 from models.page_node import PageStructure, PageNode
+from models.compact_node import CompactNode, CompactPageStructure
 from utils.playwright_utils import PlaywrightUtils
+from utils.object_cache import ObjectCache, get_object_cache
+from utils.network_utils import NetworkRouter
+from utils.auth_state import StorageStateStore
+from utils.screenshot_store import ScreenshotStore
+from utils.tracing import trace_span
 import uuid
 from datetime import datetime
 from models.page_node import NodeType
@@ -12,15 +17,46 @@ from models.page_node import NodeType
 class PageParser:
     """页面解析器"""
 
-    def __init__(self, data_dir: str = "data/page_nodes"):
+    def __init__(self, data_dir: str = "data/page_nodes", cache: Optional[ObjectCache] = None,
+                 network_router: Optional[NetworkRouter] = None, auth_store: Optional[StorageStateStore] = None,
+                 compact_cache: Optional[ObjectCache] = None, screenshot_store: Optional[ScreenshotStore] = None):
         self.data_dir = data_dir
-        self.playwright_utils = PlaywrightUtils()
+        self.cache = cache or get_object_cache()
+        # 列表、节点树、表单字段等只读视图使用的紧凑页面结构，与完整模型分开缓存
+        self.compact_cache = compact_cache or ObjectCache()
+        self.network_router = network_router
+        self._auth_store = auth_store
+        self.screenshot_store = screenshot_store
+        self._playwright_utils: Optional[PlaywrightUtils] = None
         os.makedirs(data_dir, exist_ok=True)
 
-    async def parse_page_from_url(self, url: str, headless: bool = True) -> PageStructure:
-        """从URL解析页面"""
+    @property
+    def playwright_utils(self) -> PlaywrightUtils:
+        """浏览器工具（首次使用时创建）"""
+        if self._playwright_utils is None:
+            self._playwright_utils = PlaywrightUtils(network_router=self.network_router,
+                                                    screenshot_store=self.screenshot_store)
+        return self._playwright_utils
+
+    @property
+    def auth_store(self) -> StorageStateStore:
+        """登录状态缓存（未注入时使用共享实例）"""
+        if self._auth_store is None:
+            from core.services import get_services
+            self._auth_store = get_services().auth_store
+        return self._auth_store
+
+    async def _storage_state(self, url: str, auth_role: Optional[str], headless: bool) -> Optional[str]:
+        """需要以某个角色登录时，返回该角色的登录状态文件"""
+        if not auth_role:
+            return None
+        return await self.auth_store.ensure(url, auth_role, headless=headless)
+
+    async def parse_page_from_url(self, url: str, headless: bool = True, auth_role: Optional[str] = None) -> PageStructure:
+        """从URL解析页面，指定 auth_role 时以该角色的登录状态打开页面"""
+        storage_state = await self._storage_state(url, auth_role, headless)
         try:
-            await self.playwright_utils.start_browser(headless=headless)
+            await self.playwright_utils.start_browser(headless=headless, storage_state=storage_state)
             page_structure = await self.playwright_utils.parse_page_structure(url)
 
             # 保存页面结构
@@ -71,14 +107,31 @@ class PageParser:
         """保存页面结构"""
         filename = f"{page_structure.id}.json"
         filepath = os.path.join(self.data_dir, filename)
-        page_structure.save_to_file(filepath)
+        self.compact_cache.invalidate(filepath)
+        try:
+            with trace_span("json_save", "storage", nodes=len(page_structure.nodes)):
+                page_structure.save_to_file(filepath)
+        except Exception:
+            self.cache.invalidate(filepath)
+            raise
+        # 缓存副本，避免调用方后续修改影响缓存
+        self.cache.put(filepath, page_structure.model_copy(deep=True))
+
+    def load_page_structure(self, structure_id: str, shared: bool = False) -> Optional[PageStructure]:
+        """加载页面结构
+
+        shared 为 True 时直接返回缓存中的共享实例，只能只读使用；否则返回可修改的副本。
+        """
+        filepath = os.path.join(self.data_dir, f"{structure_id}.json")
+        structure = self.cache.get_or_load(filepath, PageStructure.load_from_file)
+        if structure is None or shared:
+            return structure
+        return structure.model_copy(deep=True)
 
-    def load_page_structure(self, structure_id: str) -> Optional[PageStructure]:
-        """加载页面结构"""
+    def load_compact_structure(self, structure_id: str) -> Optional[CompactPageStructure]:
+        """加载只读的紧凑页面结构，用于大页面结构的批量只读访问，占用内存比 PageStructure 小"""
         filepath = os.path.join(self.data_dir, f"{structure_id}.json")
-        if os.path.exists(filepath):
-            return PageStructure.load_from_file(filepath)
-        return None
+        return self.compact_cache.get_or_load(filepath, CompactPageStructure.load_from_file)
 
     def list_page_structures(self) -> Dict[str, Any]:
         """列出所有页面结构（返回 { headers: [], rows: [] } 格式）"""
@@ -89,8 +142,9 @@ class PageParser:
             if filename.endswith('.json'):
                 filepath = os.path.join(self.data_dir, filename)
                 try:
-                    structure = PageStructure.load_from_file(filepath)
-                    structures.append(structure)
+                    structure = self.compact_cache.get_or_load(filepath, CompactPageStructure.load_from_file)
+                    if structure:
+                        structures.append(structure)
                 except Exception as e:
                     print(f"加载页面结构失败 {filename}: {e}")
 
@@ -103,9 +157,26 @@ class PageParser:
         else:
             return {'headers': get_default_headers('page_structure'), 'rows': []}
 
+    def screenshot_paths(self) -> List[str]:
+        """所有页面结构引用的截图路径，供保留策略统计截图的引用"""
+        paths = []
+        for filename in os.listdir(self.data_dir):
+            if filename.endswith('.json'):
+                try:
+                    structure = self.compact_cache.get_or_load(os.path.join(self.data_dir, filename),
+                                                               CompactPageStructure.load_from_file)
+                except Exception as e:
+                    print(f"加载页面结构失败 {filename}: {e}")
+                    continue
+                if structure and structure.screenshot_path:
+                    paths.append(structure.screenshot_path)
+        return paths
+
     def delete_page_structure(self, structure_id: str) -> bool:
         """删除页面结构"""
         filepath = os.path.join(self.data_dir, f"{structure_id}.json")
+        self.cache.invalidate(filepath)
+        self.compact_cache.invalidate(filepath)
         if os.path.exists(filepath):
             os.remove(filepath)
             return True
@@ -113,79 +184,100 @@ class PageParser:
 
     def get_interactive_nodes(self, structure_id: str) -> List[PageNode]:
         """获取可交互的节点"""
-        structure = self.load_page_structure(structure_id)
+        structure = self.load_page_structure(structure_id, shared=True)
         if structure:
             return [node for node in structure.nodes if node.is_interactive]
         return []
 
     def get_nodes_by_type(self, structure_id: str, node_type: str) -> List[PageNode]:
         """根据类型获取节点"""
-        structure = self.load_page_structure(structure_id)
+        structure = self.load_page_structure(structure_id, shared=True)
         if structure:
-            return [node for node in structure.nodes if node.type.value == node_type]
+            return structure.get_nodes_by_type(node_type)
         return []
 
     def search_nodes(self, structure_id: str, keyword: str) -> List[PageNode]:
         """搜索节点"""
-        structure = self.load_page_structure(structure_id)
+        structure = self.load_page_structure(structure_id, shared=True)
         if structure:
-            keyword_lower = keyword.lower()
-            return [
-                node for node in structure.nodes
-                if (node.text_content and keyword_lower in node.text_content.lower()) or
-                   (node.xpath and keyword_lower in node.xpath.lower()) or
-                   (node.css_selector and keyword_lower in node.css_selector.lower())
-            ]
+            return structure.search_nodes(keyword)
         return []
 
-    def get_node_hierarchy(self, structure_id: str) -> Dict[str, Any]:
-        """获取节点层级结构"""
-        structure = self.load_page_structure(structure_id)
+    def get_node_hierarchy(self, structure_id: str, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """获取节点层级结构
+
+        max_depth 限制展开的层数（1 表示只返回根节点），未展开节点的 children 为空，
+        可根据 child_count 调用 get_node_children 按需展开。
+        """
+        structure = self.load_compact_structure(structure_id)
         if not structure:
             return {}
 
-        # 构建节点树
-        node_dict = {node.id: node for node in structure.nodes}
-        root_nodes = []
-
-        for node in structure.nodes:
-            if not node.parent_id:
-                root_nodes.append(self._build_node_tree(node, node_dict))
-
         return {
             'structure_id': structure_id,
             'url': structure.url,
             'title': structure.title,
-            'root_nodes': root_nodes
+            'root_nodes': self._build_node_tree(structure, max_depth)
         }
 
-    def _build_node_tree(self, node: PageNode, node_dict: Dict[str, PageNode]) -> Dict[str, Any]:
-        """构建节点树"""
-        tree_node = {
+    def get_node_children(self, structure_id: str, node_id: Optional[str] = None,
+                          offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """获取一层子节点（node_id 为 None 时返回根节点），每个节点附带子节点数量，用于树视图按需展开"""
+        structure = self.load_compact_structure(structure_id)
+        if not structure:
+            return {}
+
+        children = structure.get_children(node_id)
+        page = children[offset:offset + limit] if limit is not None else children[offset:]
+        return {
+            'structure_id': structure_id,
+            'parent_id': node_id,
+            'total': len(children),
+            'offset': offset,
+            'nodes': [self._tree_node(child, structure) for child in page]
+        }
+
+    def _tree_node(self, node: CompactNode, structure: CompactPageStructure) -> Dict[str, Any]:
+        """树节点数据（不含子节点）"""
+        return {
             'id': node.id,
             'type': node.type.value,
             'tag_name': node.tag_name,
             'text_content': node.text_content,
             'xpath': node.xpath,
             'is_interactive': node.is_interactive,
+            'child_count': len(structure.get_children(node.id)),
             'children': []
         }
 
-        for child_id in node.children:
-            if child_id in node_dict:
-                child_node = node_dict[child_id]
-                tree_node['children'].append(self._build_node_tree(child_node, node_dict))
-
-        return tree_node
+    def _build_node_tree(self, structure: CompactPageStructure, max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """迭代构建节点树，避免深层DOM超出递归深度；每个节点只展开一次，可防止环引用"""
+        root_nodes = [self._tree_node(node, structure) for node in structure.get_children(None)]
+        visited = {tree_node['id'] for tree_node in root_nodes}
+        stack = [(tree_node, 1) for tree_node in reversed(root_nodes)]
+
+        while stack:
+            tree_node, depth = stack.pop()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for child in structure.get_children(tree_node['id']):
+                if child.id in visited:
+                    continue
+                visited.add(child.id)
+                child_tree_node = self._tree_node(child, structure)
+                tree_node['children'].append(child_tree_node)
+                stack.append((child_tree_node, depth + 1))
+
+        return root_nodes
 
     def export_page_structure(self, structure_id: str, format: str = 'json') -> str:
         """导出页面结构"""
-        structure = self.load_page_structure(structure_id)
+        structure = self.load_page_structure(structure_id, shared=True)
         if not structure:
             raise Exception("页面结构不存在")
 
         if format == 'json':
-            return json.dumps(structure.to_dict(), ensure_ascii=False, indent=2)
+            return structure.to_json()
         elif format == 'csv':
             return self._export_to_csv(structure)
         else:
@@ -220,33 +312,25 @@ class PageParser:
 
         return output.getvalue()
 
-    async def parse_forms_from_url(self, url: str, headless: bool = True) -> PageStructure:
-        """专门解析页面中的表单元素"""
-        try:
-            await self.playwright_utils.start_browser(headless=headless)
+    async def parse_forms_from_url(self, url: str, headless: bool = True, auth_role: Optional[str] = None) -> PageStructure:
+        """专门解析页面中的表单元素
 
-            # 获取表单结构信息
-            form_structure = await self.playwright_utils.extract_form_structure(url)
+        只导航一次：表单内的节点在浏览器中一次提取，表单外部的元素在浏览器中就被过滤掉。
+        表单结构信息（action、method 等）不在这里收集，需要时用 extract_form_structure。
+        指定 auth_role 时以该角色的登录状态打开页面。
+        """
+        storage_state = await self._storage_state(url, auth_role, headless)
+        try:
+            await self.playwright_utils.start_browser(headless=headless, storage_state=storage_state)
 
-            # 获取所有可测试节点
             page_structure = await self.playwright_utils.parse_page_structure(url)
 
-            # 过滤出表单相关的节点
-            form_nodes = []
-            for node in page_structure.nodes:
-                # 包含表单元素、按钮、输入框等
-                if (node.type in [NodeType.FORM, NodeType.INPUT, NodeType.BUTTON, NodeType.SELECT, NodeType.CHECKBOX, NodeType.RADIO] or
-                    node.tag_name in ['form', 'input', 'button', 'select', 'textarea'] or
-                    'form' in node.attributes.get('class', '').lower() or
-                    node.attributes.get('role') == 'button'):
-                    form_nodes.append(node)
-
             # 创建专门的表单页面结构
             form_page_structure = PageStructure(
                 id=f"forms_{page_structure.id}",
                 url=url,
                 title=f"表单结构 - {page_structure.title}",
-                nodes=form_nodes,
+                nodes=page_structure.nodes,
                 screenshot_path=page_structure.screenshot_path
             )
 
@@ -260,7 +344,7 @@ class PageParser:
 
     def get_form_fields(self, structure_id: str) -> List[Dict[str, Any]]:
         """获取表单字段信息"""
-        structure = self.load_page_structure(structure_id)
+        structure = self.load_compact_structure(structure_id)
         if not structure:
             return []
 
@@ -269,13 +353,15 @@ class PageParser:
             if node.type in [NodeType.INPUT, NodeType.SELECT, NodeType.CHECKBOX, NodeType.RADIO]:
                 field_info = {
                     'id': node.id,
-                    'name': node.attributes.get('name', ''),
-                    'type': node.attributes.get('type', node.type.value),
-                    'placeholder': node.attributes.get('placeholder', ''),
-                    'required': node.attributes.get('required', False),
-                    'value': node.attributes.get('value', ''),
+                    'name': node.get_attribute('name', ''),
+                    'type': node.get_attribute('type', node.type.value),
+                    'placeholder': node.get_attribute('placeholder', ''),
+                    'required': bool(node.get_constraint('required', node.get_attribute('required', False))),
+                    'value': node.get_attribute('value', ''),
                     'selector': node.css_selector or node.xpath,
-                    'is_interactive': node.is_interactive
+                    'is_interactive': node.is_interactive,
+                    'options': node.options,
+                    'constraints': node.constraints
                 }
                 form_fields.append(field_info)
 
@@ -283,7 +369,7 @@ class PageParser:
 
     def get_form_buttons(self, structure_id: str) -> List[Dict[str, Any]]:
         """获取表单按钮信息"""
-        structure = self.load_page_structure(structure_id)
+        structure = self.load_compact_structure(structure_id)
         if not structure:
             return []
 
@@ -292,9 +378,9 @@ class PageParser:
             if node.type == NodeType.BUTTON or node.tag_name == 'button':
                 button_info = {
                     'id': node.id,
-                    'name': node.attributes.get('name', ''),
-                    'type': node.attributes.get('type', 'button'),
-                    'text': node.text_content or node.attributes.get('value', ''),
+                    'name': node.get_attribute('name', ''),
+                    'type': node.get_attribute('type', 'button'),
+                    'text': node.text_content or node.get_attribute('value', ''),
                     'selector': node.css_selector or node.xpath,
                     'is_interactive': node.is_interactive
                 }
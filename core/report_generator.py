@@ -4,18 +4,30 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from models.test_data import TestExecution, TestSuite
 from core.test_runner import TestRunner
-from jinja2 import Template
+from core.services import get_services
+from utils.tracing import trace_span
 import base64
 
 
 class ReportGenerator:
     """报告生成器"""
 
-    def __init__(self, data_dir: str = "data/reports"):
+    def __init__(self, data_dir: str = "data/reports", test_runner: Optional[TestRunner] = None):
         self.data_dir = data_dir
-        self.test_runner = TestRunner(data_dir)
+        self._test_runner = test_runner
         os.makedirs(data_dir, exist_ok=True)
 
+    @property
+    def test_runner(self) -> TestRunner:
+        """测试运行器（未注入时，目录一致则使用共享实例）"""
+        if self._test_runner is None:
+            services = get_services()
+            if os.path.abspath(self.data_dir) == os.path.abspath(services.reports_dir):
+                self._test_runner = services.test_runner
+            else:
+                self._test_runner = TestRunner(self.data_dir)
+        return self._test_runner
+
     def generate_html_report(self, execution_id: str) -> str:
         """生成HTML报告"""
         execution = self.test_runner.load_execution(execution_id)
@@ -26,7 +38,8 @@ class ReportGenerator:
         report_data = self._prepare_report_data(execution)
 
         # 生成HTML内容
-        html_content = self._generate_html_content(report_data)
+        with trace_span("report_render", "report", format="html"):
+            html_content = self._generate_html_content(report_data)
 
         # 保存HTML文件
         filename = f"report_{execution_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
@@ -52,7 +65,8 @@ class ReportGenerator:
         suite_data = self._prepare_suite_report_data(executions, suite_name)
 
         # 生成HTML内容
-        html_content = self._generate_suite_html_content(suite_data)
+        with trace_span("report_render", "report", format="suite_html", executions=len(executions)):
+            html_content = self._generate_suite_html_content(suite_data)
 
         # 保存HTML文件
         filename = f"suite_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
@@ -86,6 +100,8 @@ class ReportGenerator:
                 'output_data': step_result.output_data,
                 'error_message': step_result.error_message,
                 'screenshot_path': step_result.screenshot_path,
+                'visual_score': step_result.visual_score,
+                'diff_path': step_result.diff_path,
                 'assertions': []
             }
 
@@ -107,7 +123,7 @@ class ReportGenerator:
             'execution_id': execution.id,
             'test_case_name': execution.test_case_name,
             'test_case_id': execution.test_case_id,
-            'page_url': execution.page_url,
+            'page_url': execution.environment_info.get('page_url', ''),
             'status': execution.status.value,
             'status_class': self._get_status_class(execution.status.value),
             'start_time': execution.start_time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -185,6 +201,8 @@ class ReportGenerator:
 
     def _generate_html_content(self, report_data: Dict[str, Any]) -> str:
         """生成HTML内容"""
+        from jinja2 import Template
+
         template = Template('''
 <!DOCTYPE html>
 <html lang="zh-CN">
@@ -380,6 +398,17 @@ class ReportGenerator:
                                         </div>
                                     </div>
                                     {% endif %}
+
+                                    {% if step.visual_score is not none %}
+                                    <div class="mt-2">
+                                        <strong>视觉差异:</strong> {{ "%.4f"|format(step.visual_score * 100) }}%
+                                        {% if step.diff_path %}
+                                        <div class="screenshot-container mt-2">
+                                            <img src="{{ step.diff_path }}" alt="差异图" class="img-fluid">
+                                        </div>
+                                        {% endif %}
+                                    </div>
+                                    {% endif %}
                                 </div>
                             </div>
                         </div>
@@ -399,6 +428,8 @@ class ReportGenerator:
 
     def _generate_suite_html_content(self, suite_data: Dict[str, Any]) -> str:
         """生成套件HTML内容"""
+        from jinja2 import Template
+
         template = Template('''
 <!DOCTYPE html>
 <html lang="zh-CN">
@@ -557,11 +588,76 @@ class ReportGenerator:
         filename = f"report_{execution_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         filepath = os.path.join(self.data_dir, filename)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
+        with trace_span("report_render", "report", format="json"), open(filepath, 'w', encoding='utf-8') as f:
             json.dump(report_data, f, ensure_ascii=False, indent=2)
 
         return filepath
 
+    def generate_junit_report(self, execution_ids: List[str], suite_name: str = "测试套件报告") -> str:
+        """生成JUnit XML报告（供CI系统解析）"""
+        import xml.etree.ElementTree as ET
+
+        executions = []
+        for execution_id in execution_ids:
+            execution = self.test_runner.load_execution(execution_id)
+            if execution:
+                executions.append(execution)
+
+        root = ET.Element('testsuites', name=suite_name)
+        total_tests = total_failures = total_errors = 0
+        total_time = 0.0
+
+        # 每个执行记录对应一个testsuite，每个步骤对应一个testcase
+        for execution in executions:
+            failures = len([s for s in execution.step_results if s.status.value == 'failed'])
+            errors = len([s for s in execution.step_results if s.status.value == 'error'])
+            tests = len(execution.step_results)
+            suite = ET.SubElement(root, 'testsuite', {
+                'name': execution.test_case_name,
+                'id': execution.id,
+                'timestamp': execution.start_time.isoformat(),
+                'time': f"{execution.duration or 0:.3f}"
+            })
+
+            for step_result in execution.step_results:
+                case = ET.SubElement(suite, 'testcase', {
+                    'classname': execution.test_case_name,
+                    'name': f"{step_result.action}[{step_result.step_id}]",
+                    'time': f"{step_result.duration or 0:.3f}"
+                })
+                if step_result.status.value == 'failed':
+                    ET.SubElement(case, 'failure', message=step_result.error_message or '').text = step_result.error_message or ''
+                elif step_result.status.value == 'error':
+                    ET.SubElement(case, 'error', message=step_result.error_message or '').text = step_result.error_message or ''
+                elif step_result.status.value == 'skipped':
+                    ET.SubElement(case, 'skipped')
+
+            # 执行在步骤之前就出错时（如浏览器启动失败），记录为一个错误用例
+            if execution.status.value == 'error' and errors == 0:
+                case = ET.SubElement(suite, 'testcase', {'classname': execution.test_case_name, 'name': 'execution', 'time': '0.000'})
+                ET.SubElement(case, 'error', message=execution.error_message or '').text = execution.error_message or ''
+                tests += 1
+                errors += 1
+
+            suite.set('tests', str(tests))
+            suite.set('failures', str(failures))
+            suite.set('errors', str(errors))
+            total_tests += tests
+            total_failures += failures
+            total_errors += errors
+            total_time += execution.duration or 0
+
+        root.set('tests', str(total_tests))
+        root.set('failures', str(total_failures))
+        root.set('errors', str(total_errors))
+        root.set('time', f"{total_time:.3f}")
+
+        filename = f"junit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xml"
+        filepath = os.path.join(self.data_dir, filename)
+        ET.ElementTree(root).write(filepath, encoding='utf-8', xml_declaration=True)
+
+        return filepath
+
     def get_report_list(self) -> Dict[str, Any]:
         """获取报告列表（返回 { headers: [], rows: [] } 格式）"""
         from models import get_default_headers
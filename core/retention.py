@@ -0,0 +1,234 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from utils.execution_log import ExecutionLog
+
+if TYPE_CHECKING:
+    from core.page_parser import PageParser
+
+
+@dataclass
+class RetentionPolicy:
+    """保留策略，各项为 None 时不限制"""
+    max_execution_age_days: Optional[float] = None
+    max_executions: Optional[int] = None
+    # 截图超过期限或数量、总大小超限时，即使仍被执行记录引用也删除（从最旧的开始），执行记录保留
+    max_screenshot_age_days: Optional[float] = None
+    max_screenshots: Optional[int] = None
+    max_screenshot_bytes: Optional[int] = None
+    # 未被引用的截图和临时文件至少保留的秒数：运行中的用例先写截图，结束后才保存执行记录
+    orphan_grace: float = 3600
+    # 执行记录日志中无效数据占比达到该值时压缩
+    compact_ratio: float = 0.3
+
+
+@dataclass
+class GcReport:
+    """一次回收的结果"""
+    executions_removed: int = 0
+    screenshots_removed: int = 0
+    temp_files_removed: int = 0
+    screenshot_bytes: int = 0
+    temp_bytes: int = 0
+    log_bytes: int = 0
+    screenshots_remaining: int = 0
+    screenshot_bytes_remaining: int = 0
+    duration: float = 0.0
+    removed_execution_ids: List[str] = field(default_factory=list)
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return self.screenshot_bytes + self.temp_bytes + self.log_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['reclaimed_bytes'] = self.reclaimed_bytes
+        return data
+
+    def summary(self) -> str:
+        return (f"删除执行记录 {self.executions_removed} 条、截图 {self.screenshots_removed} 个、"
+                f"临时文件 {self.temp_files_removed} 个，回收 {self.reclaimed_bytes} 字节"
+                f"（截图 {self.screenshot_bytes}，临时文件 {self.temp_bytes}，日志压缩 {self.log_bytes}）；"
+                f"剩余截图 {self.screenshots_remaining} 个，{self.screenshot_bytes_remaining} 字节")
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _remove(path: str) -> int:
+    """删除文件，返回回收的字节数；文件已不存在时返回0"""
+    try:
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+    except OSError:
+        return 0
+
+
+class RetentionManager:
+    """截图和执行记录的保留策略与回收
+
+    截图的引用来自执行记录（日志索引摘要中的各步骤截图路径）和页面结构的截图路径。
+    release() 删除不再被引用的指定截图（删除执行记录时调用）；collect() 按保留策略删除过期的执行记录、
+    未被引用的截图、超出期限/数量/总大小的截图和崩溃残留的临时文件，压缩执行记录日志，返回 GcReport。
+    start_sweeper() 在后台线程中定期调用 collect()。
+    """
+
+    def __init__(self, execution_log: ExecutionLog, page_parser: Optional['PageParser'] = None,
+                 screenshot_dir: str = "data/screenshots", temp_dirs: Optional[List[str]] = None,
+                 policy: Optional[RetentionPolicy] = None):
+        self.execution_log = execution_log
+        self.page_parser = page_parser
+        self.screenshot_dir = screenshot_dir
+        # 检查原子写入残留的 *.tmp 文件的目录
+        self.temp_dirs = list(temp_dirs or [])
+        self.policy = policy or RetentionPolicy()
+        self.last_report: Optional[GcReport] = None
+        self.total_reclaimed = 0
+        # 同一时间只进行一次回收
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _referenced(self, summaries: Iterable[Dict[str, Any]]) -> Set[str]:
+        referenced = {_normalize(path) for summary in summaries for path in summary.get('screenshots') or []}
+        if self.page_parser is not None:
+            referenced.update(_normalize(path) for path in self.page_parser.screenshot_paths())
+        return referenced
+
+    def referenced_screenshots(self) -> Set[str]:
+        """被执行记录或页面结构引用的截图（规范化的绝对路径）"""
+        return self._referenced(self.execution_log.summaries())
+
+    def release(self, paths: Iterable[str]) -> Tuple[int, int]:
+        """删除其中不再被引用的截图，返回 (删除个数, 回收字节数)
+
+        宽限期（orphan_grace）内修改过的截图不删除：内容寻址的截图被运行中的用例重复使用时会更新修改时间，
+        而该用例的执行记录要到结束时才保存。这些截图之后由 collect() 按宽限期回收。
+        """
+        paths = [path for path in paths if path]
+        if not paths:
+            return 0, 0
+        with self._lock:
+            referenced = self.referenced_screenshots()
+            now = time.time()
+            removed = reclaimed = 0
+            for path in dict.fromkeys(paths):
+                if _normalize(path) in referenced:
+                    continue
+                try:
+                    age = now - os.path.getmtime(path)
+                except OSError:
+                    continue
+                if age >= self.policy.orphan_grace:
+                    removed += 1
+                    reclaimed += _remove(path)
+            self.total_reclaimed += reclaimed
+            return removed, reclaimed
+
+    def _scan_screenshots(self) -> List[Tuple[str, int, float]]:
+        """截图目录中的文件 (路径, 大小, 修改时间)"""
+        files = []
+        try:
+            with os.scandir(self.screenshot_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and not entry.name.endswith('.tmp') and not entry.name.startswith('.'):
+                        stat = entry.stat()
+                        files.append((entry.path, stat.st_size, stat.st_mtime))
+        except FileNotFoundError:
+            pass
+        return files
+
+    def _collect_temp_files(self, report: GcReport, now: float, grace: float):
+        for directory in self.temp_dirs + [self.screenshot_dir]:
+            try:
+                with os.scandir(directory) as entries:
+                    stale = [entry.path for entry in entries
+                             if entry.name.endswith('.tmp') and entry.is_file() and now - entry.stat().st_mtime >= grace]
+            except FileNotFoundError:
+                continue
+            for path in stale:
+                size = _remove(path)
+                report.temp_files_removed += 1
+                report.temp_bytes += size
+
+    def collect(self, policy: Optional[RetentionPolicy] = None, now: Optional[datetime] = None) -> GcReport:
+        """按保留策略回收一次"""
+        policy = policy or self.policy
+        now = now or datetime.now()
+        timestamp = now.timestamp()
+        started = time.perf_counter()
+        report = GcReport()
+        with self._lock:
+            # 1. 过期的执行记录，其截图不再被引用后与其他未被引用的截图一样按宽限期回收
+            max_age = timedelta(days=policy.max_execution_age_days) if policy.max_execution_age_days is not None else None
+            if max_age is not None or policy.max_executions is not None:
+                report.removed_execution_ids = self.execution_log.prune(max_age, policy.max_executions, now)
+                report.executions_removed = len(report.removed_execution_ids)
+
+            # 2. 截图：未被引用且超过宽限期的（运行中的用例刚写入或重复使用的截图不删除）、超过期限的、
+            #    超出数量和总大小的（从最旧的开始）
+            referenced = self._referenced(self.execution_log.summaries())
+            kept = []
+            for path, size, mtime in self._scan_screenshots():
+                age = timestamp - mtime
+                key = _normalize(path)
+                orphan = key not in referenced and age >= policy.orphan_grace
+                expired = policy.max_screenshot_age_days is not None and age >= policy.max_screenshot_age_days * 86400
+                if orphan or expired:
+                    report.screenshots_removed += 1
+                    report.screenshot_bytes += _remove(path)
+                else:
+                    kept.append((path, size, mtime))
+            kept.sort(key=lambda item: item[2])
+            total = sum(size for _, size, _ in kept)
+            while kept and ((policy.max_screenshots is not None and len(kept) > policy.max_screenshots) or
+                            (policy.max_screenshot_bytes is not None and total > policy.max_screenshot_bytes)):
+                path, size, _ = kept.pop(0)
+                total -= size
+                report.screenshots_removed += 1
+                report.screenshot_bytes += _remove(path)
+            report.screenshots_remaining = len(kept)
+            report.screenshot_bytes_remaining = total
+
+            # 3. 原子写入残留的临时文件
+            self._collect_temp_files(report, timestamp, policy.orphan_grace)
+
+            # 4. 压缩执行记录日志
+            stats = self.execution_log.stats()
+            if stats['total_bytes'] and stats['garbage_ratio'] >= policy.compact_ratio:
+                report.log_bytes = self.execution_log.compact()
+
+            report.duration = time.perf_counter() - started
+            self.total_reclaimed += report.reclaimed_bytes
+            self.last_report = report
+        return report
+
+    def start_sweeper(self, interval: float = 3600, policy: Optional[RetentionPolicy] = None):
+        """启动后台回收线程，每 interval 秒按保留策略回收一次"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+
+        def sweep():
+            while not self._stop.wait(interval):
+                try:
+                    report = self.collect(policy)
+                    if report.reclaimed_bytes:
+                        print(f"🧹 {report.summary()}")
+                except Exception as e:
+                    print(f"回收截图和执行记录失败: {e}")
+
+        self._sweeper = threading.Thread(target=sweep, name="retention-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout)
+            self._sweeper = None
@@ -0,0 +1,137 @@
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.page_parser import PageParser
+    from core.test_generator import TestGenerator
+    from core.test_runner import TestRunner
+    from core.report_generator import ReportGenerator
+    from core.retention import RetentionManager
+    from utils.network_utils import NetworkConfig, NetworkRouter, HarConfig
+    from utils.auth_state import StorageStateStore
+    from utils.screenshot_store import ScreenshotStore
+    from utils.visual_baseline import VisualBaselineStore
+
+
+class ServiceContainer:
+    """核心服务容器
+
+    按需创建 PageParser、TestGenerator、TestRunner、ReportGenerator，并让它们共享同一组实例，
+    避免每个组件各自再构造一套依赖对象。模块也在首次访问时才导入。
+    """
+
+    def __init__(self,
+                 page_nodes_dir: str = "data/page_nodes",
+                 test_cases_dir: str = "data/test_cases",
+                 reports_dir: str = "data/reports",
+                 network_config: Optional['NetworkConfig'] = None,
+                 har_config: Optional['HarConfig'] = None,
+                 auth_states_dir: str = "data/auth_states",
+                 screenshot_dir: str = "data/screenshots",
+                 perceptual_distance: Optional[int] = None,
+                 baselines_dir: str = "data/baselines"):
+        self.page_nodes_dir = page_nodes_dir
+        self.test_cases_dir = test_cases_dir
+        self.reports_dir = reports_dir
+        self.network_config = network_config
+        self.har_config = har_config
+        self.auth_states_dir = auth_states_dir
+        self.screenshot_dir = screenshot_dir
+        # 不为 None 时按感知哈希合并近似截图，见 ScreenshotStore
+        self.perceptual_distance = perceptual_distance
+        self._screenshot_store: Optional['ScreenshotStore'] = None
+        self.baselines_dir = baselines_dir
+        self._visual_baselines: Optional['VisualBaselineStore'] = None
+        self._auth_store: Optional['StorageStateStore'] = None
+        self._network_router: Optional['NetworkRouter'] = None
+        self._page_parser: Optional['PageParser'] = None
+        self._test_generator: Optional['TestGenerator'] = None
+        self._test_runner: Optional['TestRunner'] = None
+        self._report_generator: Optional['ReportGenerator'] = None
+
+    @property
+    def network_router(self) -> 'NetworkRouter':
+        """浏览器网络路由，页面解析和测试运行共享同一个静态资源缓存"""
+        if self._network_router is None:
+            from utils.network_utils import NetworkConfig, NetworkRouter
+            self._network_router = NetworkRouter(self.network_config or NetworkConfig())
+        return self._network_router
+
+    @property
+    def auth_store(self) -> 'StorageStateStore':
+        """登录状态缓存，过期时由测试运行器运行登录测试用例刷新"""
+        if self._auth_store is None:
+            from utils.auth_state import StorageStateStore
+
+            async def refresh(login_test_case_id: str, origin: str, role: str, headless: bool):
+                return await self.test_runner.refresh_storage_state(login_test_case_id, origin, role, headless)
+
+            self._auth_store = StorageStateStore(self.auth_states_dir, refresher=refresh)
+        return self._auth_store
+
+    @property
+    def screenshot_store(self) -> 'ScreenshotStore':
+        """按内容寻址的截图存储，页面解析和测试运行共用"""
+        if self._screenshot_store is None:
+            from utils.screenshot_store import ScreenshotStore
+            self._screenshot_store = ScreenshotStore(self.screenshot_dir, self.perceptual_distance)
+        return self._screenshot_store
+
+    @property
+    def visual_baselines(self) -> 'VisualBaselineStore':
+        """视觉回归的基线截图"""
+        if self._visual_baselines is None:
+            from utils.visual_baseline import VisualBaselineStore
+            self._visual_baselines = VisualBaselineStore(self.baselines_dir)
+        return self._visual_baselines
+
+    @property
+    def page_parser(self) -> 'PageParser':
+        """页面解析器"""
+        if self._page_parser is None:
+            from core.page_parser import PageParser
+            self._page_parser = PageParser(self.page_nodes_dir, network_router=self.network_router,
+                                           auth_store=self.auth_store, screenshot_store=self.screenshot_store)
+        return self._page_parser
+
+    @property
+    def test_generator(self) -> 'TestGenerator':
+        """测试用例生成器"""
+        if self._test_generator is None:
+            from core.test_generator import TestGenerator
+            self._test_generator = TestGenerator(self.test_cases_dir, page_parser=self.page_parser)
+        return self._test_generator
+
+    @property
+    def test_runner(self) -> 'TestRunner':
+        """测试运行器"""
+        if self._test_runner is None:
+            from core.test_runner import TestRunner
+            self._test_runner = TestRunner(self.reports_dir, test_generator=self.test_generator,
+                                           network_router=self.network_router, har_config=self.har_config,
+                                           auth_store=self.auth_store, screenshot_store=self.screenshot_store,
+                                           visual_baselines=self.visual_baselines)
+        return self._test_runner
+
+    @property
+    def retention(self) -> 'RetentionManager':
+        """截图和执行记录的保留策略，与测试运行器共用"""
+        return self.test_runner.retention
+
+    @property
+    def report_generator(self) -> 'ReportGenerator':
+        """报告生成器"""
+        if self._report_generator is None:
+            from core.report_generator import ReportGenerator
+            self._report_generator = ReportGenerator(self.reports_dir, test_runner=self.test_runner)
+        return self._report_generator
+
+
+_services: Optional[ServiceContainer] = None
+
+
+def get_services() -> ServiceContainer:
+    """获取默认的共享服务容器"""
+    global _services
+    if _services is None:
+        _services = ServiceContainer()
+    return _services
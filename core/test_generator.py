@@ -1,12 +1,22 @@
 import os
 import json
 import uuid
+import itertools
 import random
-from typing import List, Dict, Any, Optional, Union
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Dict, Any, Optional, Tuple, Union
 from models.page_node import PageStructure, PageNode, NodeType
 from models.test_case import TestCase, TestViewpoint, TestData, TestType, TestPriority, TestStrategy
 from core.page_parser import PageParser
+from core.services import get_services
+from utils.object_cache import ObjectCache, get_object_cache
+import copy
 from utils.assertion_utils import AssertionUtils
+from utils.combination_utils import generate_covering_array
+from utils.tracing import trace_span
+from utils.atomic_io import atomic_write_text
 from datetime import datetime
 from models import to_table_format_list, get_default_headers
 
@@ -14,11 +24,30 @@ from models import to_table_format_list, get_default_headers
 class TestGenerator:
     """测试用例生成器"""
 
-    def __init__(self, data_dir: str = "data/test_cases"):
+    # 测试数据模板缓存的最大条目数
+    MAX_TEMPLATES = 1024
+
+    # 表单组合测试中作为参数的字段类型，以及不参与组合的 input 类型
+    COMBINATION_FIELD_TYPES = [NodeType.INPUT, NodeType.SELECT, NodeType.CHECKBOX, NodeType.RADIO]
+    COMBINATION_SKIPPED_INPUT_TYPES = {'hidden', 'submit', 'button', 'reset', 'image', 'file'}
+
+    def __init__(self, data_dir: str = "data/test_cases", page_parser: Optional[PageParser] = None,
+                 cache: Optional[ObjectCache] = None):
         self.data_dir = data_dir
-        self.page_parser = PageParser()
+        self.cache = cache or get_object_cache()
+        self._page_parser = page_parser
+        self._templates: Dict[tuple, tuple] = {}
+        self._id_prefix = uuid.uuid4().hex[:12]
+        self._id_counter = itertools.count(1)
         os.makedirs(data_dir, exist_ok=True)
 
+    @property
+    def page_parser(self) -> PageParser:
+        """页面解析器（未注入时使用共享实例）"""
+        if self._page_parser is None:
+            self._page_parser = get_services().page_parser
+        return self._page_parser
+
     def generate_test_case_from_nodes(self,
                                     structure_id: str,
                                     node_ids: List[str],
@@ -28,20 +57,18 @@ class TestGenerator:
                                     description: str = "") -> TestCase:
         """从节点生成测试用例，一次性生成所有测试观点"""
         # 加载页面结构
-        page_structure = self.page_parser.load_page_structure(structure_id)
+        page_structure = self.page_parser.load_page_structure(structure_id, shared=True)
         if not page_structure:
             raise Exception("页面结构不存在")
 
-        # 获取选中的节点
-        selected_nodes = [node for node in page_structure.nodes if node.id in node_ids]
+        # 获取选中的节点（复制，避免测试用例修改缓存中的页面结构）
+        selected_nodes = [self._copy_node(node) for node in page_structure.get_nodes_by_ids(node_ids)]
         if not selected_nodes:
             raise Exception("未找到选中的节点")
 
         # 为每个节点生成所有测试观点
-        viewpoints = []
-        for node in selected_nodes:
-            node_viewpoints = self._generate_all_viewpoints_for_node(node, page_structure.url)
-            viewpoints.extend(node_viewpoints)
+        with trace_span("generate", "generation", nodes=len(selected_nodes)):
+            viewpoints = self.generate_viewpoints_for_nodes(selected_nodes, page_structure.url)
 
         # 创建测试用例
         test_case = TestCase(
@@ -56,154 +83,392 @@ class TestGenerator:
 
         return test_case
 
-    def _generate_all_viewpoints_for_node(self, node: PageNode, page_url: str) -> List[TestViewpoint]:
-        """为单个节点生成所有测试观点"""
-        viewpoints = []
-
-        # 1. 基本测试观点
-        basic_viewpoint = self._generate_basic_viewpoint(node, page_url)
-        if basic_viewpoint:
-            viewpoints.append(basic_viewpoint)
-
-        # 2. 边界值测试观点
-        boundary_viewpoint = self._generate_boundary_viewpoint(node, page_url)
-        if boundary_viewpoint:
-            viewpoints.append(boundary_viewpoint)
-
-        # 3. 等价类测试观点
-        equivalence_viewpoint = self._generate_equivalence_viewpoint(node, page_url)
-        if equivalence_viewpoint:
-            viewpoints.append(equivalence_viewpoint)
-
-        # 4. 异常测试观点
-        negative_viewpoint = self._generate_negative_viewpoint(node, page_url)
-        if negative_viewpoint:
-            viewpoints.append(negative_viewpoint)
-
-        return viewpoints
+    def generate_test_cases_for_structures(self,
+                                           structure_ids: List[str],
+                                           node_types: Optional[List[NodeType]] = None,
+                                           test_type: TestType = TestType.FUNCTIONAL,
+                                           priority: TestPriority = TestPriority.MEDIUM,
+                                           name_template: str = "{title}测试用例",
+                                           max_workers: Optional[int] = None,
+                                           batch_size: int = 20,
+                                           progress_callback: Optional[Callable[[int, int, str, Optional[str]], None]] = None) -> Dict[str, Any]:
+        """批量为多个页面结构生成并保存测试用例
+
+        每个页面结构生成一个测试用例，包含指定类型的节点（默认所有可交互节点）。
+        生成和序列化在进程池中并行执行，主进程按批写入文件。
+        每完成一个页面结构调用一次 progress_callback(已完成数, 总数, 页面结构ID, 错误信息或None)。
+
+        返回 { total, succeeded, failed, test_case_ids: {页面结构ID: 测试用例ID}, errors: {页面结构ID: 错误信息} }
+        """
+        structure_ids = list(dict.fromkeys(structure_ids))
+        summary = {
+            'total': len(structure_ids),
+            'succeeded': 0,
+            'failed': 0,
+            'test_case_ids': {},
+            'errors': {}
+        }
+        if not structure_ids:
+            return summary
+
+        node_type_values = [NodeType(node_type).value for node_type in node_types] if node_types else None
+        tasks = [
+            (self.data_dir, self.page_parser.data_dir, structure_id, node_type_values, test_type.value, priority.value, name_template)
+            for structure_id in structure_ids
+        ]
+        max_workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+
+        batch = []
+
+        def collect(result: Tuple[str, Optional[str], Optional[str], Optional[str]]):
+            structure_id, test_case_id, payload, error = result
+            if error is None:
+                batch.append((test_case_id, payload))
+                if len(batch) >= batch_size:
+                    self._write_test_case_batch(batch)
+                    batch.clear()
+                summary['test_case_ids'][structure_id] = test_case_id
+                summary['succeeded'] += 1
+            else:
+                summary['errors'][structure_id] = error
+                summary['failed'] += 1
+            if progress_callback:
+                progress_callback(summary['succeeded'] + summary['failed'], summary['total'], structure_id, error)
+
+        pending = tasks
+        executor = None
+        if max_workers > 1 and len(tasks) > 1:
+            # 只有创建进程池和提交任务时的错误才退回串行；收集结果和写入文件的错误照常抛出
+            try:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+                futures = {executor.submit(_generate_structure_test_case, task): task for task in tasks}
+            except (OSError, NotImplementedError) as e:
+                # 当前环境无法创建子进程，退回到当前进程中生成
+                print(f"无法创建进程池，改为串行生成: {e}")
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                executor = None
+
+        if executor is not None:
+            with executor:
+                pending = []
+                for future in as_completed(futures):
+                    try:
+                        collect(future.result())
+                    except BrokenProcessPool:
+                        pending.append(futures[future])
+
+        for task in pending:
+            collect(self._generate_structure_test_case(*task[2:]))
+
+        if batch:
+            self._write_test_case_batch(batch)
+        return summary
+
+    def _generate_structure_test_case(self, structure_id: str, node_type_values: Optional[List[str]],
+                                      test_type_value: str, priority_value: str,
+                                      name_template: str) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+        """为单个页面结构生成测试用例，返回 (页面结构ID, 测试用例ID, 序列化后的JSON, 错误信息)"""
+        try:
+            page_structure = self.page_parser.load_page_structure(structure_id, shared=True)
+            if not page_structure:
+                raise Exception("页面结构不存在")
+
+            if node_type_values:
+                nodes = [node for node_type in node_type_values for node in page_structure.get_nodes_by_type(node_type)]
+            else:
+                nodes = [node for node in page_structure.nodes if node.is_interactive]
+            if not nodes:
+                raise Exception("没有可生成测试的节点")
+
+            test_case = self.generate_test_case_from_nodes(
+                structure_id=structure_id,
+                node_ids=[node.id for node in nodes],
+                test_name=name_template.format(title=page_structure.title or structure_id, structure_id=structure_id),
+                test_type=TestType(test_type_value),
+                priority=TestPriority(priority_value),
+                description=f"由页面结构 {structure_id} 批量生成"
+            )
+            payload = json.dumps(test_case.to_dict(), ensure_ascii=False, indent=2)
+            return structure_id, test_case.id, payload, None
+        except Exception as e:
+            return structure_id, None, None, str(e)
+
+    def _write_test_case_batch(self, batch: List[Tuple[str, str]]):
+        """批量写入已序列化的测试用例，写入后使对应缓存失效，下次读取时再加载"""
+        for test_case_id, payload in batch:
+            filepath = os.path.join(self.data_dir, f"{test_case_id}.json")
+            atomic_write_text(filepath, payload)
+            self.cache.invalidate(filepath)
+
+    def generate_form_combination_test_case(self,
+                                            structure_id: str,
+                                            form_node_id: str,
+                                            test_name: str,
+                                            strength: int = 2,
+                                            value_strategies: Tuple[TestStrategy, ...] = (TestStrategy.BASIC, TestStrategy.EQUIVALENCE),
+                                            test_type: TestType = TestType.FUNCTIONAL,
+                                            priority: TestPriority = TestPriority.MEDIUM,
+                                            description: str = "") -> TestCase:
+        """为表单生成组合测试用例
+
+        以表单节点下的输入框、下拉框、复选框、单选框为参数，各字段取 value_strategies 策略下的测试数据为取值，
+        生成 strength 元组合覆盖（默认两两组合）的整表单填写数据。
+        """
+        page_structure = self.page_parser.load_page_structure(structure_id, shared=True)
+        if not page_structure:
+            raise Exception("页面结构不存在")
 
-    def _generate_basic_viewpoint(self, node: PageNode, page_url: str) -> Optional[TestViewpoint]:
-        """生成基本测试观点"""
-        test_data_list = []
-        action = self._determine_action_for_node(node)
+        form_node = page_structure.get_node(form_node_id)
+        if not form_node or form_node.type != NodeType.FORM:
+            raise Exception("未找到表单节点")
 
-        if not action:
-            return None
+        field_nodes = [self._copy_node(node) for node in page_structure.get_children(form_node_id)]
+        viewpoint = self.generate_form_combination_viewpoint(self._copy_node(form_node), field_nodes, strength, value_strategies)
 
-        # 生成基本测试数据
-        test_data = TestData(
+        return TestCase(
             id=str(uuid.uuid4()),
-            input_value=self._generate_basic_input_value(node, action),
-            expected_value=self._generate_expected_value(node, action),
-            assertion_functions=self._generate_assertion_functions(node, action),
-            description=f"基本{action}操作测试"
-        )
-        test_data_list.append(test_data)
-
-        return TestViewpoint(
-            id=str(uuid.uuid4()),
-            name=f"{node.tag_name}基本测试",
-            strategy=TestStrategy.BASIC,
-            description=f"对{node.tag_name}元素进行基本{action}操作测试",
-            target_node=node,
-            test_data_list=test_data_list
+            name=test_name,
+            description=description,
+            test_type=test_type,
+            priority=priority,
+            page_url=page_structure.url,
+            viewpoints=[viewpoint]
         )
 
-    def _generate_boundary_viewpoint(self, node: PageNode, page_url: str) -> Optional[TestViewpoint]:
-        """生成边界值测试观点"""
-        if node.type not in [NodeType.INPUT, NodeType.SELECT]:
-            return None
-
+    def generate_form_combination_viewpoint(self,
+                                            form_node: PageNode,
+                                            field_nodes: List[PageNode],
+                                            strength: int = 2,
+                                            value_strategies: Tuple[TestStrategy, ...] = (TestStrategy.BASIC, TestStrategy.EQUIVALENCE)) -> TestViewpoint:
+        """生成表单组合测试观点，每条测试数据是一次完整的表单填写
+
+        测试数据的输入值为字段操作列表 [{selector, action, value}]，预期值为 {selector: 预期值}。
+        """
+        fields = []
+        for node in field_nodes:
+            if node.type not in self.COMBINATION_FIELD_TYPES:
+                continue
+            if node.attributes.get('type', '').lower() in self.COMBINATION_SKIPPED_INPUT_TYPES:
+                continue
+            domain = self._get_field_domain(node, value_strategies)
+            if domain:
+                fields.append((node, domain))
+        if not fields:
+            raise Exception("表单中没有可组合的字段")
+
+        domain_sizes = [len(domain) for _, domain in fields]
+        rows = generate_covering_array(domain_sizes, strength)
+        total = 1
+        for size in domain_sizes:
+            total *= size
+
+        label = "两两组合" if strength == 2 else f"{strength}元组合"
+        now = datetime.now()
         test_data_list = []
-        input_type = node.attributes.get('type', 'text').lower()
-
-        if node.type == NodeType.INPUT:
-            boundary_data = self._generate_input_boundary_data(node, input_type)
-        else:  # SELECT
-            boundary_data = self._generate_select_boundary_data(node)
-
-        for i, (input_val, expected_val, description) in enumerate(boundary_data):
-            test_data = TestData(
-                id=str(uuid.uuid4()),
-                input_value=input_val,
-                expected_value=expected_val,
-                assertion_functions=self._generate_assertion_functions(node, "fill" if node.type == NodeType.INPUT else "select"),
-                description=f"边界值测试: {description}"
-            )
-            test_data_list.append(test_data)
+        for index, row in enumerate(rows, 1):
+            input_value = []
+            expected_value = {}
+            for (node, domain), value_index in zip(fields, row):
+                entry = self._form_field_entry(node, domain[value_index])
+                if entry:
+                    input_value.append(entry)
+                    expected_value[entry['selector']] = domain[value_index]
+            test_data_list.append(TestData(
+                id=self._new_id(),
+                input_value=input_value,
+                expected_value=expected_value,
+                assertion_functions=["element_visible", "no_error_message"],
+                description=f"{label}: 第{index}/{len(rows)}组",
+                created_at=now
+            ))
 
         return TestViewpoint(
-            id=str(uuid.uuid4()),
-            name=f"{node.tag_name}边界值测试",
-            strategy=TestStrategy.BOUNDARY,
-            description=f"对{node.tag_name}元素进行边界值测试",
-            target_node=node,
-            test_data_list=test_data_list
+            id=self._new_id(),
+            name=f"{form_node.tag_name}{label}测试",
+            strategy=TestStrategy.COMPREHENSIVE,
+            description=f"对表单的{len(fields)}个字段进行{label}覆盖测试，共{len(rows)}组（全组合{total}组）",
+            target_node=form_node,
+            test_data_list=test_data_list,
+            created_at=now
         )
 
-    def _generate_equivalence_viewpoint(self, node: PageNode, page_url: str) -> Optional[TestViewpoint]:
-        """生成等价类测试观点"""
-        if node.type not in [NodeType.INPUT, NodeType.SELECT]:
-            return None
-
-        test_data_list = []
-        input_type = node.attributes.get('type', 'text').lower()
-
-        if node.type == NodeType.INPUT:
-            equivalence_data = self._generate_input_equivalence_data(node, input_type)
-        else:  # SELECT
-            equivalence_data = self._generate_select_equivalence_data(node)
-
-        for i, (input_val, expected_val, description) in enumerate(equivalence_data):
-            test_data = TestData(
-                id=str(uuid.uuid4()),
-                input_value=input_val,
-                expected_value=expected_val,
-                assertion_functions=self._generate_assertion_functions(node, "fill" if node.type == NodeType.INPUT else "select"),
-                description=f"等价类测试: {description}"
-            )
-            test_data_list.append(test_data)
+    def _get_field_domain(self, node: PageNode, value_strategies: Tuple[TestStrategy, ...]) -> List[Any]:
+        """表单字段参与组合的取值：复选框和单选框为选中/不选中，其他字段取模板中对应策略的输入值（去重）"""
+        if node.type in [NodeType.CHECKBOX, NodeType.RADIO]:
+            return [True, False]
+
+        values = {}
+        for strategy, _, _, rows, _ in self._get_node_template(node):
+            if strategy in value_strategies:
+                for input_val, _, _ in rows:
+                    if input_val is not None:
+                        values.setdefault(input_val, None)
+        return list(values)
+
+    def _form_field_entry(self, node: PageNode, value: Any) -> Optional[Dict[str, Any]]:
+        """表单字段的一次填写操作，单选框不选中时不需要操作，返回None"""
+        selector = self._node_selector(node)
+        if node.type == NodeType.CHECKBOX:
+            return {'selector': selector, 'action': 'check' if value else 'uncheck', 'value': None}
+        if node.type == NodeType.RADIO:
+            return {'selector': selector, 'action': 'check', 'value': None} if value else None
+        if node.type == NodeType.SELECT:
+            return {'selector': selector, 'action': 'select_option', 'value': value}
+        return {'selector': selector, 'action': 'fill', 'value': value}
+
+    @staticmethod
+    def _node_selector(node: PageNode) -> str:
+        """节点选择器（与测试运行器的选择规则一致）"""
+        if node.attributes.get('id'):
+            return f"#{node.attributes['id']}"
+        return node.css_selector or node.xpath
+
+    def generate_viewpoints_for_nodes(self, nodes: List[PageNode], page_url: str) -> List[TestViewpoint]:
+        """批量为节点生成所有测试观点
+
+        相同签名（类型、输入类型、约束等）的节点共用同一份测试数据模板，只创建一次；
+        同一批次的测试数据共用创建时间。
+        """
+        now = datetime.now()
+        viewpoints = []
+        for node in nodes:
+            viewpoints.extend(self._instantiate_viewpoints(node, self._get_node_template(node), now))
+        return viewpoints
 
-        return TestViewpoint(
-            id=str(uuid.uuid4()),
-            name=f"{node.tag_name}等价类测试",
-            strategy=TestStrategy.EQUIVALENCE,
-            description=f"对{node.tag_name}元素进行等价类测试",
-            target_node=node,
-            test_data_list=test_data_list
+    def _generate_all_viewpoints_for_node(self, node: PageNode, page_url: str) -> List[TestViewpoint]:
+        """为单个节点生成所有测试观点"""
+        return self.generate_viewpoints_for_nodes([node], page_url)
+
+    @staticmethod
+    def _copy_node(node: PageNode) -> PageNode:
+        """复制节点：只复制可变的字典和列表字段，比深拷贝快得多"""
+        return node.model_copy(update={
+            'attributes': dict(node.attributes),
+            'position': dict(node.position),
+            'size': dict(node.size),
+            'children': list(node.children),
+            'options': [dict(option) for option in node.options],
+            'constraints': dict(node.constraints)
+        })
+
+    def _new_id(self) -> str:
+        """生成测试观点/测试数据ID：实例随机前缀 + 递增计数，比 uuid4 开销小且不会重复"""
+        return f"{self._id_prefix}-{next(self._id_counter):x}"
+
+    def _template_key(self, node: PageNode) -> tuple:
+        """节点模板签名，签名相同的节点生成完全相同的测试数据"""
+        attributes = node.attributes
+        return (
+            node.type,
+            node.tag_name,
+            attributes.get('type', 'text').lower(),
+            attributes.get('min'),
+            attributes.get('max'),
+            attributes.get('value', ''),
+            tuple(sorted((name, str(value)) for name, value in node.constraints.items())),
+            node.text_content if node.type == NodeType.TEXT else None,
+            tuple(self._get_select_options(node)) if node.type == NodeType.SELECT else None,
+            tuple((option.get('value'), option.get('text'), bool(option.get('disabled'))) for option in node.options)
         )
 
-    def _generate_negative_viewpoint(self, node: PageNode, page_url: str) -> Optional[TestViewpoint]:
-        """生成异常测试观点"""
-        if node.type not in [NodeType.INPUT, NodeType.SELECT]:
-            return None
+    def _get_node_template(self, node: PageNode) -> tuple:
+        """获取节点的测试数据模板：(策略, 观点名称, 观点描述, ((输入值, 预期值, 描述), ...), 断言函数) 的元组"""
+        key = self._template_key(node)
+        template = self._templates.get(key)
+        if template is None:
+            if len(self._templates) >= self.MAX_TEMPLATES:
+                self._templates.clear()
+            template = self._build_node_template(node)
+            self._templates[key] = template
+        return template
+
+    def _build_node_template(self, node: PageNode) -> tuple:
+        """为一种节点签名计算各策略的测试数据"""
+        template = []
 
-        test_data_list = []
-        input_type = node.attributes.get('type', 'text').lower()
-
-        if node.type == NodeType.INPUT:
-            negative_data = self._generate_input_negative_data(node, input_type)
-        else:  # SELECT
-            negative_data = self._generate_select_negative_data(node)
-
-        for i, (input_val, expected_val, description) in enumerate(negative_data):
-            test_data = TestData(
-                id=str(uuid.uuid4()),
-                input_value=input_val,
-                expected_value=expected_val,
-                assertion_functions=self._generate_assertion_functions(node, "fill" if node.type == NodeType.INPUT else "select"),
-                description=f"异常测试: {description}"
-            )
-            test_data_list.append(test_data)
+        # 1. 基本测试观点
+        action = self._determine_action_for_node(node)
+        if action:
+            template.append((
+                TestStrategy.BASIC,
+                f"{node.tag_name}基本测试",
+                f"对{node.tag_name}元素进行基本{action}操作测试",
+                ((self._generate_basic_input_value(node, action), self._generate_expected_value(node, action), f"基本{action}操作测试"),),
+                self._assertion_copier(self._generate_assertion_functions(node, action))
+            ))
+
+        # 2-4. 边界值、等价类、异常测试观点（仅输入框和下拉框）
+        if node.type in [NodeType.INPUT, NodeType.SELECT]:
+            input_type = node.attributes.get('type', 'text').lower()
+            copy_assertions = self._assertion_copier(
+                self._generate_assertion_functions(node, "fill" if node.type == NodeType.INPUT else "select"))
+            if node.type == NodeType.INPUT:
+                strategy_data = [
+                    (TestStrategy.BOUNDARY, "边界值测试", self._generate_input_boundary_data(node, input_type)),
+                    (TestStrategy.EQUIVALENCE, "等价类测试", self._generate_input_equivalence_data(node, input_type)),
+                    (TestStrategy.NEGATIVE, "异常测试", self._generate_input_negative_data(node, input_type)),
+                ]
+            else:  # SELECT
+                strategy_data = [
+                    (TestStrategy.BOUNDARY, "边界值测试", self._generate_select_boundary_data(node)),
+                    (TestStrategy.EQUIVALENCE, "等价类测试", self._generate_select_equivalence_data(node)),
+                    (TestStrategy.NEGATIVE, "异常测试", self._generate_select_negative_data(node)),
+                ]
 
-        return TestViewpoint(
-            id=str(uuid.uuid4()),
-            name=f"{node.tag_name}异常测试",
-            strategy=TestStrategy.NEGATIVE,
-            description=f"对{node.tag_name}元素进行异常测试",
-            target_node=node,
-            test_data_list=test_data_list
-        )
+            for strategy, label, data in strategy_data:
+                # 没有可用数据的策略（如下拉框没有禁用项和空选项时的异常测试）不生成测试观点
+                if not data:
+                    continue
+                template.append((
+                    strategy,
+                    f"{node.tag_name}{label}",
+                    f"对{node.tag_name}元素进行{label}",
+                    tuple((input_val, expected_val, f"{label}: {description}") for input_val, expected_val, description in data),
+                    copy_assertions
+                ))
+
+        return tuple(template)
+
+    @staticmethod
+    def _assertion_copier(assertions: List[Union[str, tuple]]) -> Callable[[], List[Union[str, tuple]]]:
+        """返回复制断言函数列表的函数，模板中保存该函数，每条测试数据的断言参数可以单独修改
+
+        参数都是不可变的标量时复制参数字典即可，否则深复制。
+        """
+        scalars = (str, int, float, bool, type(None))
+        if any(not isinstance(assertion, str) and not all(isinstance(value, scalars) for value in assertion[1].values())
+               for assertion in assertions):
+            return lambda: copy.deepcopy(assertions)
+        parts = [(assertion, None) if isinstance(assertion, str) else assertion for assertion in assertions]
+        return lambda: [name if params is None else (name, params.copy()) for name, params in parts]
+
+    def _instantiate_viewpoints(self, node: PageNode, template: tuple, created_at: datetime) -> List[TestViewpoint]:
+        """根据模板为节点创建测试观点，测试数据的输入值和预期值与模板共享，断言参数各自复制"""
+        new_id = self._new_id
+        viewpoints = []
+        for strategy, name, description, rows, copy_assertions in template:
+            test_data_list = [
+                TestData(
+                    id=new_id(),
+                    input_value=input_val,
+                    expected_value=expected_val,
+                    assertion_functions=copy_assertions(),
+                    description=data_description,
+                    created_at=created_at
+                )
+                for input_val, expected_val, data_description in rows
+            ]
+            viewpoints.append(TestViewpoint(
+                id=new_id(),
+                name=name,
+                strategy=strategy,
+                description=description,
+                target_node=node,
+                test_data_list=test_data_list,
+                created_at=created_at
+            ))
+        return viewpoints
 
     def _generate_input_boundary_data(self, node: PageNode, input_type: str) -> List[tuple]:
         """生成输入框边界值测试数据"""
@@ -236,24 +501,30 @@ class TestGenerator:
                 ("test@.com", "test@.com", "缺少二级域名测试")
             ]
         elif input_type == 'number':
-            min_val = node.attributes.get('min')
-            max_val = node.attributes.get('max')
-
-            if min_val and max_val:
-                min_val = int(min_val)
-                max_val = int(max_val)
-                boundary_data = [
-                    (str(min_val - 1), str(min_val - 1), f"最小值-1测试 ({min_val - 1})"),
-                    (str(min_val), str(min_val), f"最小值测试 ({min_val})"),
-                    (str(min_val + 1), str(min_val + 1), f"最小值+1测试 ({min_val + 1})"),
-                    (str(max_val - 1), str(max_val - 1), f"最大值-1测试 ({max_val - 1})"),
-                    (str(max_val), str(max_val), f"最大值测试 ({max_val})"),
-                    (str(max_val + 1), str(max_val + 1), f"最大值+1测试 ({max_val + 1})"),
+            min_val = self._get_number_constraint(node, 'min')
+            max_val = self._get_number_constraint(node, 'max')
+
+            if min_val is not None or max_val is not None:
+                step = self._get_number_constraint(node, 'step') or 1
+                boundary_data = []
+                if min_val is not None:
+                    boundary_data.extend([
+                        (self._format_number(min_val - step), self._format_number(min_val - step), f"最小值-1测试 ({self._format_number(min_val - step)})"),
+                        (self._format_number(min_val), self._format_number(min_val), f"最小值测试 ({self._format_number(min_val)})"),
+                        (self._format_number(min_val + step), self._format_number(min_val + step), f"最小值+1测试 ({self._format_number(min_val + step)})")
+                    ])
+                if max_val is not None:
+                    boundary_data.extend([
+                        (self._format_number(max_val - step), self._format_number(max_val - step), f"最大值-1测试 ({self._format_number(max_val - step)})"),
+                        (self._format_number(max_val), self._format_number(max_val), f"最大值测试 ({self._format_number(max_val)})"),
+                        (self._format_number(max_val + step), self._format_number(max_val + step), f"最大值+1测试 ({self._format_number(max_val + step)})")
+                    ])
+                boundary_data.extend([
                     ("0", "0", "零值测试"),
                     ("-1", "-1", "负值测试"),
                     ("abc", "abc", "非数字输入测试"),
                     ("", "", "空值测试")
-                ]
+                ])
             else:
                 boundary_data = [
                     ("0", "0", "零值测试"),
@@ -285,7 +556,76 @@ class TestGenerator:
                 ("Test Data 123", "Test Data 123", "混合输入测试")
             ]
 
-        return boundary_data
+        # 有长度约束时，用约束两侧的精确长度替换通用的长度测试
+        length_data = self._generate_length_boundary_data(node) if input_type != 'number' else []
+        if length_data:
+            covered = {row[0] for row in length_data}
+            boundary_data = length_data + [
+                row for row in boundary_data
+                if row[0] not in covered and not (row[0] and set(row[0]) == {'a'})
+            ]
+
+        return self._deduplicate_rows(boundary_data)
+
+    def _generate_length_boundary_data(self, node: PageNode) -> List[tuple]:
+        """根据 minlength、maxlength 约束生成长度边界测试数据，没有长度约束时返回空列表"""
+        min_length = self._get_number_constraint(node, 'minlength')
+        max_length = self._get_number_constraint(node, 'maxlength')
+        if min_length is None and max_length is None:
+            return []
+
+        required = self._get_constraint(node, 'required')
+        length_data = [("", "", "空值测试（必填项）" if required else "空值测试")]
+        if min_length:
+            min_length = int(min_length)
+            if min_length > 1:
+                length_data.append(("a" * (min_length - 1), "a" * (min_length - 1), f"最小长度-1测试 ({min_length - 1}字符)"))
+            length_data.append(("a" * min_length, "a" * min_length, f"最小长度测试 ({min_length}字符)"))
+            if max_length is None:
+                length_data.append(("a" * (min_length + 1), "a" * (min_length + 1), f"最小长度+1测试 ({min_length + 1}字符)"))
+        if max_length is not None:
+            max_length = int(max_length)
+            if max_length > 1:
+                length_data.append(("a" * (max_length - 1), "a" * (max_length - 1), f"最大长度-1测试 ({max_length - 1}字符)"))
+            length_data.append(("a" * max_length, "a" * max_length, f"最大长度测试 ({max_length}字符)"))
+            length_data.append(("a" * (max_length + 1), "a" * (max_length + 1), f"最大长度+1测试 ({max_length + 1}字符，超出边界)"))
+        return self._deduplicate_rows(length_data)
+
+    @staticmethod
+    def _deduplicate_rows(rows: List[tuple]) -> List[tuple]:
+        """按输入值去重，保留第一次出现的测试数据"""
+        seen = set()
+        result = []
+        for row in rows:
+            if row[0] not in seen:
+                seen.add(row[0])
+                result.append(row)
+        return result
+
+    def _get_constraint(self, node: PageNode, name: str) -> Any:
+        """获取节点的输入约束，解析时未采集约束的旧页面结构回退到HTML属性"""
+        if name in node.constraints:
+            return node.constraints[name]
+        return node.attributes.get(name)
+
+    def _get_number_constraint(self, node: PageNode, name: str) -> Optional[Union[int, float]]:
+        """获取数值约束，不存在或不是数值时返回None"""
+        value = self._get_constraint(node, name)
+        if value is None or value == '':
+            return None
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        return int(number) if number.is_integer() else number
+
+    @staticmethod
+    def _format_number(value: Union[int, float]) -> str:
+        if isinstance(value, float):
+            value = round(value, 10)
+            if value.is_integer():
+                return str(int(value))
+        return str(value)
 
     def _generate_input_equivalence_data(self, node: PageNode, input_type: str) -> List[tuple]:
         """生成输入框等价类测试数据"""
@@ -328,6 +668,20 @@ class TestGenerator:
                 ("特殊字符!@#", "特殊字符!@#", "特殊字符测试")
             ]
 
+        # 有 pattern 约束时标注每条数据是否符合格式（空值不做格式校验）
+        pattern = self._get_constraint(node, 'pattern')
+        if pattern:
+            try:
+                compiled = re.compile(pattern)
+            except re.error:
+                compiled = None
+            if compiled:
+                equivalence_data = [
+                    (input_val, expected_val,
+                     description if input_val == "" else f"{description}（{'符合' if compiled.fullmatch(input_val) else '不符合'}格式）")
+                    for input_val, expected_val, description in equivalence_data
+                ]
+
         return equivalence_data
 
     def _generate_input_negative_data(self, node: PageNode, input_type: str) -> List[tuple]:
@@ -406,7 +760,19 @@ class TestGenerator:
         return equivalence_data
 
     def _generate_select_negative_data(self, node: PageNode) -> List[tuple]:
-        """生成下拉框异常测试数据"""
+        """生成下拉框异常测试数据
+
+        解析时采集到真实选项时，只选择页面上确实存在的禁用选项和空值选项，不再尝试选择不存在的选项。
+        """
+        if node.options:
+            negative_data = []
+            for option in node.options:
+                if option.get('disabled'):
+                    negative_data.append((option['value'], option['value'], f"选择禁用选项: {option.get('text') or option['value']}"))
+            if any(option.get('value', '') == '' for option in node.options):
+                negative_data.append(("", "", "选择空选项（必填项）" if self._get_constraint(node, 'required') else "选择空选项"))
+            return negative_data
+
         negative_data = [
             ("invalid_option", "invalid_option", "选择无效选项"),
             ("<script>alert('xss')</script>", "<script>alert('xss')</script>", "XSS选项测试"),
@@ -418,9 +784,14 @@ class TestGenerator:
         return negative_data
 
     def _get_select_options(self, node: PageNode) -> List[str]:
-        """获取下拉框的选项值"""
-        # 这里应该从页面结构中获取实际的选项
-        # 暂时返回模拟数据
+        """获取下拉框的选项值
+
+        优先使用解析时采集的真实选项（排除禁用和空值选项），旧的页面结构没有选项信息时使用模拟数据。
+        """
+        if node.options:
+            return [option['value'] for option in node.options
+                    if not option.get('disabled') and option.get('value', '') != '']
+
         if 'gender' in node.id.lower():
             return ['Male', 'Female', 'Other']
         elif 'country' in node.id.lower():
@@ -467,8 +838,9 @@ class TestGenerator:
             else:
                 return "测试数据"
         elif action == "select_option":
-            # 获取选项值
-            return node.attributes.get('value', '')
+            # 获取选项值：有真实选项时选择第一个可用选项
+            options = self._get_select_options(node) if node.options else []
+            return options[0] if options else node.attributes.get('value', '')
         else:
             return None
 
@@ -543,16 +915,29 @@ class TestGenerator:
 
     def save_test_case(self, test_case: TestCase):
         """保存测试用例"""
-        filename = f"{test_case.id}.json"
-        filepath = os.path.join(self.data_dir, filename)
-        test_case.save_to_file(filepath)
-
-    def load_test_case(self, test_case_id: str) -> Optional[TestCase]:
-        """加载测试用例"""
+        # 缓存副本，避免调用方后续修改影响缓存
+        self._write_test_case(test_case, copy.deepcopy(test_case))
+
+    def _write_test_case(self, test_case: TestCase, cached: TestCase):
+        """写入文件并更新缓存"""
+        filepath = os.path.join(self.data_dir, f"{test_case.id}.json")
+        try:
+            test_case.save_to_file(filepath)
+        except Exception:
+            self.cache.invalidate(filepath)
+            raise
+        self.cache.put(filepath, cached)
+
+    def load_test_case(self, test_case_id: str, shared: bool = False) -> Optional[TestCase]:
+        """加载测试用例
+
+        shared 为 True 时直接返回缓存中的共享实例，只能只读使用；否则返回可修改的副本。
+        """
         filepath = os.path.join(self.data_dir, f"{test_case_id}.json")
-        if os.path.exists(filepath):
-            return TestCase.load_from_file(filepath)
-        return None
+        test_case = self.cache.get_or_load(filepath, TestCase.load_from_file)
+        if test_case is None or shared:
+            return test_case
+        return copy.deepcopy(test_case)
 
     def list_test_cases(self) -> Dict[str, Any]:
         """列出所有测试用例（返回 { headers: [], rows: [] } 格式）"""
@@ -561,8 +946,9 @@ class TestGenerator:
             if filename.endswith('.json'):
                 filepath = os.path.join(self.data_dir, filename)
                 try:
-                    test_case = TestCase.load_from_file(filepath)
-                    test_cases.append(test_case)
+                    test_case = self.cache.get_or_load(filepath, TestCase.load_from_file)
+                    if test_case:
+                        test_cases.append(test_case)
                 except Exception as e:
                     print(f"加载测试用例失败 {filename}: {e}")
 
@@ -593,6 +979,7 @@ class TestGenerator:
     def delete_test_case(self, test_case_id: str) -> bool:
         """删除测试用例"""
         filepath = os.path.join(self.data_dir, f"{test_case_id}.json")
+        self.cache.invalidate(filepath)
         if os.path.exists(filepath):
             os.remove(filepath)
             return True
@@ -603,41 +990,52 @@ class TestGenerator:
         test_case.updated_at = datetime.now()
         self.save_test_case(test_case)
 
+    def _modify_test_case(self, test_case_id: str, modify) -> bool:
+        """在缓存测试用例的副本上修改并写回，省去重新读取文件
+
+        modify 返回 False 表示未做修改。写入成功后副本才放入缓存，其他地方持有的共享实例不会看到
+        修改了一半或未能保存的内容。
+        """
+        test_case = self.load_test_case(test_case_id)
+        if not test_case:
+            return False
+        if modify(test_case) is False:
+            return False
+        test_case.updated_at = datetime.now()
+        self._write_test_case(test_case, test_case)
+        return True
+
     def add_viewpoint_to_test_case(self, test_case_id: str, viewpoint: TestViewpoint):
         """向测试用例添加测试观点"""
-        test_case = self.load_test_case(test_case_id)
-        if test_case:
-            test_case.add_viewpoint(viewpoint)
-            self.update_test_case(test_case)
+        self._modify_test_case(test_case_id, lambda test_case: test_case.add_viewpoint(viewpoint))
 
     def remove_viewpoint_from_test_case(self, test_case_id: str, viewpoint_id: str):
         """从测试用例删除测试观点"""
-        test_case = self.load_test_case(test_case_id)
-        if test_case:
-            test_case.remove_viewpoint(viewpoint_id)
-            self.update_test_case(test_case)
+        self._modify_test_case(test_case_id, lambda test_case: test_case.remove_viewpoint(viewpoint_id))
 
     def add_test_data_to_viewpoint(self, test_case_id: str, viewpoint_id: str, test_data: TestData):
         """向测试观点添加测试数据"""
-        test_case = self.load_test_case(test_case_id)
-        if test_case:
+        def modify(test_case: TestCase):
             viewpoint = test_case.get_viewpoint(viewpoint_id)
-            if viewpoint:
-                viewpoint.add_test_data(test_data)
-                self.update_test_case(test_case)
+            if not viewpoint:
+                return False
+            viewpoint.add_test_data(test_data)
+
+        self._modify_test_case(test_case_id, modify)
 
     def remove_test_data_from_viewpoint(self, test_case_id: str, viewpoint_id: str, test_data_id: str):
         """从测试观点删除测试数据"""
-        test_case = self.load_test_case(test_case_id)
-        if test_case:
+        def modify(test_case: TestCase):
             viewpoint = test_case.get_viewpoint(viewpoint_id)
-            if viewpoint:
-                viewpoint.remove_test_data(test_data_id)
-                self.update_test_case(test_case)
+            if not viewpoint:
+                return False
+            viewpoint.remove_test_data(test_data_id)
+
+        self._modify_test_case(test_case_id, modify)
 
     def export_test_case(self, test_case_id: str, format: str = 'json') -> str:
         """导出测试用例"""
-        test_case = self.load_test_case(test_case_id)
+        test_case = self.load_test_case(test_case_id, shared=True)
         if not test_case:
             raise Exception("测试用例不存在")
 
@@ -694,3 +1092,17 @@ class TestGenerator:
             writer.writerow([])
 
         return output.getvalue()
+
+
+# 进程池中每个子进程复用的生成器，以复用测试数据模板
+_worker_generators: Dict[Tuple[str, str], TestGenerator] = {}
+
+
+def _generate_structure_test_case(task: tuple) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    """进程池任务：为单个页面结构生成测试用例"""
+    data_dir, page_nodes_dir, *args = task
+    generator = _worker_generators.get((data_dir, page_nodes_dir))
+    if generator is None:
+        generator = TestGenerator(data_dir, page_parser=PageParser(page_nodes_dir))
+        _worker_generators[(data_dir, page_nodes_dir)] = generator
+    return generator._generate_structure_test_case(*args)
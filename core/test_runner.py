@@ -2,28 +2,114 @@ import asyncio
 import os
 import json
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from models.page_node import NodeType
 from models.test_case import TestCase, TestViewpoint, TestData, TestType, TestPriority, TestStrategy, TestStatus
 from models.test_data import TestExecution, TestStepResult, TestStatus as ExecutionTestStatus, AssertionResult
 from core.test_generator import TestGenerator
+from core.execution_planner import ExecutionPlanner, FormPlan, PlannedStep
+from core.services import get_services
 from utils.playwright_utils import PlaywrightUtils
+from utils.network_utils import NetworkRouter, HarConfig, HarMode
+from utils.auth_state import StorageStateStore
+from utils.execution_log import ExecutionLog
+from utils.screenshot_store import ScreenshotStore
+from utils.visual_baseline import VisualBaselineStore, VISUAL_ASSERTION
+from core.retention import RetentionManager
+from utils.tracing import new_tracer, trace_span, traced
 from utils.assertion_utils import AssertionUtils
 
 
 class TestRunner:
     """测试运行器"""
 
-    def __init__(self, data_dir: str = "data/reports"):
+    def __init__(self, data_dir: str = "data/reports", test_generator: Optional[TestGenerator] = None,
+                 planner: Optional[ExecutionPlanner] = None, network_router: Optional[NetworkRouter] = None,
+                 har_config: Optional[HarConfig] = None, auth_store: Optional[StorageStateStore] = None,
+                 execution_log: Optional[ExecutionLog] = None, retention: Optional[RetentionManager] = None,
+                 screenshot_store: Optional[ScreenshotStore] = None,
+                 visual_baselines: Optional[VisualBaselineStore] = None):
         self.data_dir = data_dir
-        self.test_generator = TestGenerator()
-        self.playwright_utils = PlaywrightUtils()
+        self._test_generator = test_generator
+        self.planner = planner or ExecutionPlanner()
+        # 所有执行共享同一个网络路由，静态资源缓存在各浏览器之间复用
+        self.network_router = network_router
+        # 按测试用例录制和回放网络流量
+        self.har_config = har_config or HarConfig()
+        self._auth_store = auth_store
         os.makedirs(data_dir, exist_ok=True)
+        # 执行记录追加写入 data_dir/executions 下的分段日志，不再每条记录一个文件，也不与报告文件混在一起
+        # 旧版本的 <ID>.json 执行记录文件由 migrate 命令显式导入
+        self.execution_log = execution_log or ExecutionLog(os.path.join(data_dir, "executions"))
+        self._retention = retention
+        # 所有执行共享同一个截图存储，各次运行中内容相同的截图只保存一份
+        self.screenshot_store = screenshot_store or ScreenshotStore()
+        # visual_match 断言的基线截图
+        self.visual_baselines = visual_baselines or VisualBaselineStore()
+
+    @property
+    def test_generator(self) -> TestGenerator:
+        """测试用例生成器（未注入时使用共享实例）"""
+        if self._test_generator is None:
+            self._test_generator = get_services().test_generator
+        return self._test_generator
+
+    @property
+    def retention(self) -> RetentionManager:
+        """截图和执行记录的保留策略（未注入时按本运行器的执行记录和页面结构创建）"""
+        if self._retention is None:
+            page_parser = self.test_generator.page_parser
+            self._retention = RetentionManager(
+                self.execution_log, page_parser=page_parser, screenshot_dir=self.screenshot_store.directory,
+                temp_dirs=[self.data_dir, self.test_generator.data_dir, page_parser.data_dir])
+        return self._retention
+
+    @property
+    def auth_store(self) -> StorageStateStore:
+        """登录状态缓存（未注入时使用共享实例）"""
+        if self._auth_store is None:
+            self._auth_store = get_services().auth_store
+        return self._auth_store
+
+    async def run_test_case(self, test_case_id: str, headless: bool = True, auth_role: Optional[str] = None) -> TestExecution:
+        """运行单个测试用例，指定 auth_role 时加载该角色的登录状态，跳过登录流程"""
+        return await self._run_test_case(test_case_id, headless, auth_role)
+
+    async def refresh_storage_state(self, login_test_case_id: str, origin: str, role: str,
+                                    headless: bool = True) -> Dict[str, Any]:
+        """运行登录测试用例，返回登录后浏览器上下文的 storage_state"""
+        storage_state: Dict[str, Any] = {}
+        execution = await self._run_test_case(login_test_case_id, headless, None, storage_state)
+        if execution.status != ExecutionTestStatus.PASSED or not storage_state:
+            raise Exception(f"登录测试用例执行失败（{origin} 角色 {role}）: {execution.error_message or execution.status.value}")
+        return storage_state
+
+    async def _run_test_case(self, test_case_id: str, headless: bool, auth_role: Optional[str],
+                             storage_state_sink: Optional[Dict[str, Any]] = None) -> TestExecution:
+        """运行测试用例并保存执行记录；storage_state_sink 不为 None 时，在关闭浏览器前把登录状态写入其中
+
+        打开计时时，浏览器启动、导航、页面操作、等待、截图、断言等各阶段的耗时记录在 execution.spans 中。
+        保存执行记录的耗时（save_execution）在保存之后才得到，只出现在返回的执行记录中，不在保存的记录里。
+        """
+        tracer = new_tracer(track=test_case_id)
+        if tracer is None:
+            execution = await self._execute_test_case(test_case_id, headless, auth_role, storage_state_sink)
+            self.save_execution(execution)
+            return execution
+
+        with tracer.activate():
+            with tracer.span("run_test_case", "test_case", test_case_id=test_case_id):
+                execution = await self._execute_test_case(test_case_id, headless, auth_role, storage_state_sink)
+            execution.spans = list(tracer.spans)
+            self.save_execution(execution)
+        execution.spans = tracer.spans
+        return execution
 
-    async def run_test_case(self, test_case_id: str, headless: bool = True) -> TestExecution:
-        """运行单个测试用例"""
+    async def _execute_test_case(self, test_case_id: str, headless: bool, auth_role: Optional[str],
+                                 storage_state_sink: Optional[Dict[str, Any]]) -> TestExecution:
         # 加载测试用例
-        test_case = self.test_generator.load_test_case(test_case_id)
+        test_case = self.test_generator.load_test_case(test_case_id, shared=True)
         if not test_case:
             raise Exception("测试用例不存在")
 
@@ -32,84 +118,164 @@ class TestRunner:
             id=str(uuid.uuid4()),
             test_case_id=test_case_id,
             test_case_name=test_case.name,
-            status=TestStatus.RUNNING,
+            status=ExecutionTestStatus.RUNNING,
             start_time=datetime.now(),
             total_steps=0,
-            browser_info={"browser": "chromium", "headless": headless},
-            environment_info={"platform": "web", "timestamp": datetime.now().isoformat()}
+            browser_info={"browser": "chromium", "headless": str(headless)},
+            environment_info={"platform": "web", "page_url": test_case.page_url, "timestamp": datetime.now().isoformat()}
         )
 
+        # 每次执行使用独立的浏览器实例，便于并发运行
+        playwright_utils = PlaywrightUtils(network_router=self.network_router, screenshot_store=self.screenshot_store)
         step_results = []
         try:
+            # 需要登录的角色先获取登录状态（过期时运行登录测试用例刷新）
+            storage_state = None
+            if auth_role:
+                execution.environment_info["auth_role"] = auth_role
+                storage_state = await self.auth_store.ensure(test_case.page_url, auth_role, headless=headless)
+
             # 启动浏览器
-            await self.playwright_utils.start_browser(headless=headless)
+            await playwright_utils.start_browser(headless=headless, storage_state=storage_state)
+
+            # 录制或回放该测试用例的网络流量
+            har_mode, har_path = self.har_config.resolve(test_case_id)
+            execution.environment_info["har_mode"] = har_mode.value
+            if har_mode != HarMode.OFF:
+                execution.environment_info["har_path"] = har_path
+                await playwright_utils.use_har(
+                    har_path,
+                    update=har_mode == HarMode.RECORD,
+                    strict=self.har_config.strict,
+                    url=self.har_config.url_pattern
+                )
 
             # 导航到测试页面
-            await self.playwright_utils.navigate_to_page(test_case.page_url)
-
-            # 遍历所有测试观点和测试数据
-            for viewpoint in test_case.viewpoints:
-                for test_data in viewpoint.test_data_list:
-                    step_result = await self._execute_test_data(viewpoint, test_data)
-                    step_results.append(step_result)
-                    # 如果步骤失败，停止执行
-                    if step_result.status == TestStatus.FAILED:
-                        break
+            await playwright_utils.navigate_to_page(test_case.page_url)
+
+            # 按执行计划执行：表单字段整表单填写并提交，其余步骤单独执行；等价的测试数据只执行一次
+            plan = self.planner.plan(test_case)
+            executed: Dict[tuple, TestStepResult] = {}
+            failed_viewpoints = set()
+            home_url = playwright_utils.page.url
+            for unit in plan.units:
+                # 表单提交后页面可能已跳转，先回到测试页面
+                if playwright_utils.page.url != home_url:
+                    await playwright_utils.navigate_to_page(test_case.page_url)
+
+                if isinstance(unit, FormPlan):
+                    form_results = await traced(self._execute_form_plan(playwright_utils, unit), "form_plan", "step",
+                                                fields=len(unit.fills))
+                    for planned, step_result in form_results:
+                        executed[planned.key] = step_result
+                    continue
+
+                # 单独执行的步骤失败后，跳过该测试观点的其余测试数据
+                if unit.viewpoint.id in failed_viewpoints:
+                    continue
+                step_result = await traced(self._execute_test_data(playwright_utils, unit.viewpoint, unit.test_data),
+                                           "step", "step", test_data=unit.test_data.id)
+                executed[unit.key] = step_result
+                if step_result.status == ExecutionTestStatus.FAILED:
+                    failed_viewpoints.add(unit.viewpoint.id)
+
+            # 按测试用例中的顺序汇总结果，等价的测试数据复用已执行步骤的结果
+            for planned in plan.steps:
+                step_result = executed.get(planned.key)
+                if step_result is None:
+                    continue
+                visual_params = self._visual_params(planned.test_data)
+                if step_result.step_id != planned.test_data.id:
+                    step_result = step_result.model_copy(deep=True, update={
+                        'step_id': planned.test_data.id,
+                        'action': planned.viewpoint.strategy.value,
+                        'duplicate_of': step_result.step_id
+                    })
+                elif visual_params is not None:
+                    # 视觉对比只改副本，复用该结果的等价步骤仍从未对比的结果复制，各自与自己的基线对比
+                    step_result = step_result.model_copy(deep=True)
+                if visual_params is not None and step_result.status == ExecutionTestStatus.PASSED:
+                    # 解码和逐像素对比在线程中进行，不阻塞同时运行的其他测试用例
+                    with trace_span("visual_match", "assertion", test_data=planned.test_data.id):
+                        await asyncio.to_thread(self._check_visual, test_case_id, step_result, visual_params)
+                step_results.append(step_result)
+
+            execution.environment_info["deduplicated_steps"] = str(sum(1 for step in step_results if step.duplicate_of))
 
             execution.step_results = step_results
             execution.end_time = datetime.now()
             execution.calculate_summary()
 
             # 确定整体执行状态
-            if any(step.status == TestStatus.FAILED for step in step_results):
-                execution.status = TestStatus.FAILED
-            elif any(step.status == TestStatus.ERROR for step in step_results):
-                execution.status = TestStatus.ERROR
+            if any(step.status == ExecutionTestStatus.FAILED for step in step_results):
+                execution.status = ExecutionTestStatus.FAILED
+            elif any(step.status == ExecutionTestStatus.ERROR for step in step_results):
+                execution.status = ExecutionTestStatus.ERROR
             else:
-                execution.status = TestStatus.PASSED
+                execution.status = ExecutionTestStatus.PASSED
+
+            if storage_state_sink is not None:
+                storage_state_sink.update(await playwright_utils.get_storage_state())
 
         except Exception as e:
-            execution.status = TestStatus.ERROR
+            execution.status = ExecutionTestStatus.ERROR
             execution.error_message = str(e)
             execution.end_time = datetime.now()
             execution.calculate_summary()
 
         finally:
             # 关闭浏览器
-            await self.playwright_utils.close_browser()
-
-        # 保存执行记录
-        self.save_execution(execution)
+            with trace_span("browser_close", "browser"):
+                await playwright_utils.close_browser()
 
         return execution
 
-    async def _execute_test_data(self, viewpoint: TestViewpoint, test_data: TestData) -> TestStepResult:
+    async def run_test_suite(self, test_case_ids: List[str], headless: bool = True, concurrency: int = 1,
+                             auth_role: Optional[str] = None) -> List[TestExecution]:
+        """运行测试套件，最多同时运行 concurrency 个测试用例"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(test_case_id: str) -> TestExecution:
+            async with semaphore:
+                return await self.run_test_case(test_case_id, headless=headless, auth_role=auth_role)
+
+        return list(await asyncio.gather(*(run_one(test_case_id) for test_case_id in test_case_ids)))
+
+    async def _execute_test_data(self, playwright_utils: PlaywrightUtils, viewpoint: TestViewpoint, test_data: TestData) -> TestStepResult:
         """执行单个测试数据（等价于原来的测试步骤）"""
         # 兼容原TestStepResult结构
         step_result = TestStepResult(
             step_id=test_data.id,
             step_number=0,  # 可根据需要编号
             action=viewpoint.strategy.value,  # 或者 viewpoint.target_node.type.value
-            status=TestStatus.RUNNING,
+            status=ExecutionTestStatus.RUNNING,
             start_time=datetime.now(),
-            input_data=test_data.input_value
+            input_data=None if test_data.input_value is None else str(test_data.input_value)
         )
+        # 有 visual_match 断言时截图不复用近似截图，否则与基线对比的可能是以前的截图
+        visual = self._visual_params(test_data) is not None
 
         try:
             # 获取目标选择器
-            target_selector = None
             node = viewpoint.target_node
-            if node:
-                if node.attributes.get('id'):
-                    target_selector = f"#{node.attributes['id']}"
-                elif node.css_selector:
-                    target_selector = node.css_selector
+            target_selector = ExecutionPlanner.target_selector(node)
+
+            # 执行操作（根据节点类型和测试数据；组合测试数据为整表单的字段操作列表）
+            if viewpoint.strategy == TestStrategy.COMPREHENSIVE and isinstance(test_data.input_value, list):
+                action = 'fill_form'
+            else:
+                action = self._determine_action_for_node(node)
+
+            if action == 'fill_form':
+                result = await playwright_utils.fill_form(test_data.input_value, submit=False, exact_screenshot=visual)
+                step_result.screenshot_path = result.get('screenshot_path')
+                if result['status'] == 'error':
+                    step_result.status = ExecutionTestStatus.FAILED
+                    step_result.error_message = result['message']
                 else:
-                    target_selector = node.xpath
+                    self._check_form_values(step_result, test_data, result['fields'])
 
-            # 执行操作（根据节点类型和测试数据）
-            action = self._determine_action_for_node(node)
-            if action in ['click', 'fill', 'type', 'select_option', 'check', 'uncheck']:
+            elif action in ['click', 'fill', 'type', 'select_option', 'check', 'uncheck']:
                 if not target_selector:
                     raise Exception("未找到目标选择器")
 
@@ -117,83 +283,94 @@ class TestRunner:
                     'action': action,
                     'target_selector': target_selector,
                     'input_data': test_data.input_value,
-                    'wait_time': 1.0
+                    'wait_time': 1.0,
+                    'exact_screenshot': visual
                 }
 
-                result = await self.playwright_utils.execute_test_step(step_data)
+                result = await playwright_utils.execute_test_step(step_data)
                 step_result.output_data = result.get('output_data')
                 step_result.screenshot_path = result.get('screenshot_path')
 
                 if result['status'] == 'error':
-                    step_result.status = TestStatus.FAILED
+                    step_result.status = ExecutionTestStatus.FAILED
                     step_result.error_message = result['message']
                 else:
-                    step_result.status = TestStatus.PASSED
+                    step_result.status = ExecutionTestStatus.PASSED
 
             elif action == 'verify_text':
                 if not target_selector:
                     raise Exception("未找到目标选择器")
 
-                actual_text = await self.playwright_utils.get_element_text(target_selector)
+                actual_text = await playwright_utils.get_element_text(target_selector)
                 step_result.output_data = actual_text
 
                 # 执行断言
                 for assertion in test_data.assertion_functions:
                     assertion_type, params = assertion if isinstance(assertion, tuple) else (assertion, {})
+                    if assertion_type == VISUAL_ASSERTION:
+                        continue
                     expected = test_data.expected_value
-                    assertion_result = AssertionUtils.execute_assertion(
-                        assertion_type,
-                        actual_text,
-                        expected,
-                        f"验证文本内容: {test_data.description}"
-                    )
+                    with trace_span("assertion", "assertion", type=assertion_type):
+                        assertion_result = AssertionUtils.execute_assertion(
+                            assertion_type,
+                            actual_text,
+                            expected,
+                            f"验证文本内容: {test_data.description}"
+                        )
                     step_result.assertions.append(AssertionResult(**assertion_result))
                     if not assertion_result['passed']:
-                        step_result.status = TestStatus.FAILED
+                        step_result.status = ExecutionTestStatus.FAILED
                         step_result.error_message = assertion_result['message']
                         break
                 else:
-                    step_result.status = TestStatus.PASSED
+                    step_result.status = ExecutionTestStatus.PASSED
 
             elif action == 'verify_image':
                 if not target_selector:
                     raise Exception("未找到目标选择器")
 
-                is_visible = await self.playwright_utils.is_element_visible(target_selector)
-                step_result.output_data = is_visible
+                is_visible = await playwright_utils.is_element_visible(target_selector)
+                step_result.output_data = str(is_visible)
 
                 for assertion in test_data.assertion_functions:
                     assertion_type, params = assertion if isinstance(assertion, tuple) else (assertion, {})
+                    if assertion_type == VISUAL_ASSERTION:
+                        continue
                     expected = test_data.expected_value
-                    assertion_result = AssertionUtils.execute_assertion(
-                        assertion_type,
-                        is_visible,
-                        expected,
-                        f"验证图片可见性: {test_data.description}"
-                    )
+                    with trace_span("assertion", "assertion", type=assertion_type):
+                        assertion_result = AssertionUtils.execute_assertion(
+                            assertion_type,
+                            is_visible,
+                            expected,
+                            f"验证图片可见性: {test_data.description}"
+                        )
                     step_result.assertions.append(AssertionResult(**assertion_result))
                     if not assertion_result['passed']:
-                        step_result.status = TestStatus.FAILED
+                        step_result.status = ExecutionTestStatus.FAILED
                         step_result.error_message = assertion_result['message']
                         break
                 else:
-                    step_result.status = TestStatus.PASSED
+                    step_result.status = ExecutionTestStatus.PASSED
 
             elif action == 'wait':
                 await asyncio.sleep(1.0)
-                step_result.status = TestStatus.PASSED
+                step_result.status = ExecutionTestStatus.PASSED
 
             elif action == 'wait_for_element':
                 if not target_selector:
                     raise Exception("未找到目标选择器")
-                await self.playwright_utils.wait_for_element(target_selector)
-                step_result.status = TestStatus.PASSED
+                await playwright_utils.wait_for_element(target_selector)
+                step_result.status = ExecutionTestStatus.PASSED
 
             else:
                 raise Exception(f"不支持的操作类型: {action}")
 
+            # 验证和等待操作本身不截图，有 visual_match 断言时补截一张供视觉对比
+            if visual and step_result.screenshot_path is None and step_result.status == ExecutionTestStatus.PASSED:
+                step_result.screenshot_path = await playwright_utils.take_screenshot(exact=True)
+
         except Exception as e:
-            step_result.status = TestStatus.ERROR
+            step_result.status = ExecutionTestStatus.ERROR
             step_result.error_message = str(e)
 
         finally:
@@ -203,6 +380,154 @@ class TestRunner:
 
         return step_result
 
+    async def _execute_form_plan(self, playwright_utils: PlaywrightUtils, form_plan: FormPlan) -> List[Tuple[PlannedStep, TestStepResult]]:
+        """执行表单级计划：一次填写所有字段、提交一次，再为覆盖到的每条测试数据校验断言"""
+        start_time = datetime.now()
+        result = await playwright_utils.fill_form(
+            [{'selector': fill.selector, 'action': fill.action, 'value': fill.value} for fill in form_plan.fills],
+            submit=form_plan.submit,
+            submit_selector=form_plan.submit_selector,
+            exact_screenshot=any(self._visual_params(planned.test_data) is not None
+                                 for planned, _ in form_plan.members)
+        )
+        end_time = datetime.now()
+
+        results = []
+        for planned, selector in form_plan.members:
+            test_data = planned.test_data
+            step_result = TestStepResult(
+                step_id=test_data.id,
+                step_number=0,
+                action=planned.viewpoint.strategy.value,
+                status=ExecutionTestStatus.RUNNING,
+                start_time=start_time,
+                end_time=end_time,
+                duration=(end_time - start_time).total_seconds(),
+                input_data=None if test_data.input_value is None else str(test_data.input_value),
+                screenshot_path=result.get('screenshot_path')
+            )
+
+            with trace_span("assertions", "assertion", test_data=test_data.id):
+                if result['status'] == 'error':
+                    step_result.status = ExecutionTestStatus.ERROR
+                    step_result.error_message = result['message']
+                elif selector is None:
+                    self._check_form_values(step_result, test_data, result['fields'])
+                elif planned.viewpoint.target_node.type == NodeType.BUTTON:
+                    # 提交按钮：表单已通过该按钮提交即通过
+                    if result['submitted']:
+                        step_result.status = ExecutionTestStatus.PASSED
+                    else:
+                        step_result.status = ExecutionTestStatus.FAILED
+                        step_result.error_message = f"未能通过 {selector} 提交表单: {result.get('submit_message') or '未提交'}"
+                else:
+                    self._check_field_assertions(step_result, test_data, result['fields'].get(selector, {}))
+            results.append((planned, step_result))
+        return results
+
+    @staticmethod
+    def _visual_params(test_data: TestData) -> Optional[Dict[str, Any]]:
+        """测试数据 visual_match 断言的参数，没有该断言时返回None"""
+        for assertion in test_data.assertion_functions:
+            if isinstance(assertion, (tuple, list)):
+                if assertion[0] == VISUAL_ASSERTION:
+                    return dict(assertion[1]) if len(assertion) > 1 and assertion[1] else {}
+            elif assertion == VISUAL_ASSERTION:
+                return {}
+        return None
+
+    def _check_visual(self, test_case_id: str, step_result: TestStepResult, params: Dict[str, Any]):
+        """把步骤截图与基线对比，记录差异分数和差异图；步骤没有基线时以本次截图为基线，没有截图时断言失败"""
+        from utils.visual_diff import VisualDiffer, parse_regions
+
+        threshold = float(params.get('threshold', 0.001))
+        baseline = self.visual_baselines.get(test_case_id, step_result.step_id)
+        if not step_result.screenshot_path:
+            message = "步骤没有截图，无法进行视觉对比"
+        elif baseline is None:
+            self.visual_baselines.save(test_case_id, step_result.step_id, step_result.screenshot_path)
+            step_result.visual_score = 0.0
+            message = "没有视觉基线，已将本次截图保存为基线"
+        else:
+            differ = VisualDiffer(pixel_tolerance=int(params.get('pixel_tolerance', 16)))
+            diff = differ.compare(baseline, step_result.screenshot_path, parse_regions(params.get('ignore_regions')))
+            step_result.visual_score = diff.score
+            if diff.diff_image is not None:
+                step_result.diff_path = self.screenshot_store.put(diff.diff_image)
+            message = (f"与基线相比 {diff.changed_pixels}/{diff.compared_pixels} 个像素变化（{diff.score:.4%}，"
+                       f"阈值 {threshold:.4%}）" + ("，截图尺寸不同" if diff.size_mismatch else ""))
+
+        assertion_result = AssertionUtils.execute_assertion(VISUAL_ASSERTION, step_result.visual_score, threshold, message)
+        step_result.assertions.append(AssertionResult(**assertion_result))
+        if not assertion_result['passed']:
+            step_result.status = ExecutionTestStatus.FAILED
+            step_result.error_message = message
+
+    def _check_field_assertions(self, step_result: TestStepResult, test_data: TestData, state: Dict[str, Any]):
+        """根据字段填写后的状态校验测试数据的断言
+
+        只校验能由字段状态判断的断言（可见、可用、值、选中），其余断言在表单级执行中不适用，跳过。
+        """
+        step_result.output_data = None if state.get('value') is None else str(state['value'])
+        if state.get('error'):
+            step_result.status = ExecutionTestStatus.FAILED
+            step_result.error_message = state['error']
+            return
+
+        expected_value = '' if test_data.expected_value is None else str(test_data.expected_value)
+        for assertion in test_data.assertion_functions:
+            assertion_type = assertion[0] if isinstance(assertion, (tuple, list)) else assertion
+            if assertion_type == 'element_visible':
+                actual, expected = state.get('visible'), True
+            elif assertion_type == 'element_enabled':
+                actual, expected = state.get('enabled'), True
+            elif assertion_type in ('value_equals', 'option_selected'):
+                actual, expected = state.get('value'), expected_value
+            elif assertion_type == 'checkbox_checked':
+                actual, expected = state.get('checked'), True
+            else:
+                continue
+
+            assertion_result = AssertionUtils.execute_assertion(
+                'equals' if assertion_type == 'checkbox_checked' else assertion_type,
+                actual,
+                expected,
+                test_data.description
+            )
+            assertion_result['assertion_type'] = assertion_type
+            step_result.assertions.append(AssertionResult(**assertion_result))
+
+        failed = [a for a in step_result.assertions if not a.passed]
+        if failed:
+            step_result.status = ExecutionTestStatus.FAILED
+            step_result.error_message = failed[0].message
+        else:
+            step_result.status = ExecutionTestStatus.PASSED
+
+    def _check_form_values(self, step_result: TestStepResult, test_data: TestData, fields: Dict[str, Dict[str, Any]]):
+        """校验整表单组合测试数据：每个字段填写后的值或选中状态与测试数据一致"""
+        step_result.output_data = json.dumps({selector: state.get('value') for selector, state in fields.items()}, ensure_ascii=False)
+        for entry in test_data.input_value:
+            state = fields.get(entry['selector'], {})
+            if entry['action'] in ('check', 'uncheck'):
+                actual, expected = state.get('checked'), entry['action'] == 'check'
+            else:
+                actual, expected = state.get('value'), '' if entry.get('value') is None else str(entry['value'])
+            assertion_result = AssertionUtils.execute_assertion(
+                'equals', actual, expected, state.get('error') or f"字段 {entry['selector']}"
+            )
+            assertion_result['assertion_type'] = 'value_equals'
+            if state.get('error'):
+                assertion_result['passed'] = False
+            step_result.assertions.append(AssertionResult(**assertion_result))
+
+        failed = [a for a in step_result.assertions if not a.passed]
+        if failed:
+            step_result.status = ExecutionTestStatus.FAILED
+            step_result.error_message = failed[0].message
+        else:
+            step_result.status = ExecutionTestStatus.PASSED
+
     def _determine_action_for_node(self, node):
         if not node:
             return 'click'
@@ -227,49 +552,33 @@ class TestRunner:
         return 'click'
 
     def save_execution(self, execution: TestExecution):
-        filename = f"{execution.id}.json"
-        filepath = os.path.join(self.data_dir, filename)
-        execution.save_to_file(filepath)
+        with trace_span("save_execution", "storage", steps=len(execution.step_results)):
+            self.execution_log.append(execution)
 
     def load_execution(self, execution_id: str) -> Optional[TestExecution]:
-        filepath = os.path.join(self.data_dir, f"{execution_id}.json")
-        if os.path.exists(filepath):
-            return TestExecution.load_from_file(filepath)
-        return None
+        return self.execution_log.get(execution_id)
 
     def list_executions(self) -> Dict[str, Any]:
-        executions = []
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.data_dir, filename)
-                try:
-                    execution = TestExecution.load_from_file(filepath)
-                    executions.append(execution)
-                except Exception as e:
-                    print(f"加载执行记录失败 {filename}: {e}")
-        executions.sort(key=lambda x: x.start_time, reverse=True)
+        # 只读取日志索引中的摘要，不解析执行记录
+        executions = self.execution_log.summaries()
+        for exe in executions:
+            exe['start_time'] = datetime.fromisoformat(exe['start_time'])
+            exe['end_time'] = datetime.fromisoformat(exe['end_time']) if exe['end_time'] else None
+        executions.sort(key=lambda x: x['start_time'], reverse=True)
         # 可根据需要自定义表格格式
         return {'headers': ['ID', '测试用例ID', '测试用例名称', '状态', '开始时间', '结束时间', '时长', '总步骤', '通过步骤', '失败步骤'],
                 'rows': [
-                    [exe.id, exe.test_case_id, exe.test_case_name, exe.status.value, exe.start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                     exe.end_time.strftime('%Y-%m-%d %H:%M:%S') if exe.end_time else '', exe.duration, exe.total_steps, exe.passed_steps, exe.failed_steps]
+                    [exe['id'], exe['test_case_id'], exe['test_case_name'], exe['status'], exe['start_time'].strftime('%Y-%m-%d %H:%M:%S'),
+                     exe['end_time'].strftime('%Y-%m-%d %H:%M:%S') if exe['end_time'] else '', exe['duration'], exe['total_steps'], exe['passed_steps'], exe['failed_steps']]
                     for exe in executions
                 ]}
 
     def get_execution_statistics(self) -> Dict[str, Any]:
-        executions = []
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.data_dir, filename)
-                try:
-                    execution = TestExecution.load_from_file(filepath)
-                    executions.append(execution)
-                except Exception as e:
-                    print(f"加载执行记录失败 {filename}: {e}")
-        total = len(executions)
-        passed = len([exe for exe in executions if exe.status == TestStatus.PASSED])
-        failed = len([exe for exe in executions if exe.status == TestStatus.FAILED])
-        error = len([exe for exe in executions if exe.status == TestStatus.ERROR])
+        statuses = [summary['status'] for summary in self.execution_log.summaries()]
+        total = len(statuses)
+        passed = statuses.count(ExecutionTestStatus.PASSED.value)
+        failed = statuses.count(ExecutionTestStatus.FAILED.value)
+        error = statuses.count(ExecutionTestStatus.ERROR.value)
         success_rate = (passed / total * 100) if total > 0 else 0
         return {
             'total_executions': total,
@@ -313,8 +622,9 @@ class TestRunner:
         return None
 
     def delete_execution(self, execution_id: str) -> bool:
-        filepath = os.path.join(self.data_dir, f"{execution_id}.json")
-        if os.path.exists(filepath):
-            os.remove(filepath)
-            return True
-        return False
+        """删除执行记录，并删除不再被其他执行记录或页面结构引用的步骤截图"""
+        summary = self.execution_log.summary(execution_id)
+        if summary is None or not self.execution_log.delete(execution_id):
+            return False
+        self.retention.release(summary['screenshots'])
+        return True
@@ -130,7 +130,7 @@ async def example_workflow():
     print("📊 生成的文件:")
     print(f"   - 页面结构: data/page_nodes/{page_structure.id}.json")
     print(f"   - 测试用例: data/test_cases/{test_case.id}.json")
-    print(f"   - 执行记录: data/reports/{execution.id}.json")
+    print(f"   - 执行记录: data/reports/executions/ (ID {execution.id})")
     print(f"   - HTML报告: {report_path}")
     print(f"   - JSON报告: {json_report_path}")
 
@@ -0,0 +1,63 @@
+"""
+测试用的假浏览器：不启动浏览器运行测试用例
+
+各测试继承 FakePlaywrightUtils 覆盖需要记录或模拟的方法，再用 use_fake_playwright 替换运行器使用的浏览器工具。
+"""
+
+from contextlib import contextmanager
+from typing import List, Optional
+
+import core.test_runner as test_runner_module
+from utils.playwright_utils import PlaywrightUtils
+
+
+class FakePage:
+    """假页面：点击和等待不做任何事，截图依次返回 frames 中的图片"""
+
+    def __init__(self, url: str = "https://example.com/", frames: Optional[List[bytes]] = None):
+        self.url = url
+        self.frames = frames if frames is not None else []
+
+    async def click(self, selector):
+        pass
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def screenshot(self, path=None):
+        return self.frames.pop(0) if self.frames else b''
+
+
+class FakePlaywrightUtils(PlaywrightUtils):
+    """不启动浏览器的浏览器工具
+
+    start_browser 创建 FakePage，页面地址为 url，截图取自类属性 frames；navigate_to_page 返回 title。
+    """
+    url = "https://example.com/"
+    title = "示例"
+    frames: List[bytes] = []
+
+    async def start_browser(self, headless=True, storage_state=None):
+        self.page = FakePage(self.url, self.frames)
+
+    async def navigate_to_page(self, url):
+        return self.title
+
+    async def close_browser(self):
+        pass
+
+
+@contextmanager
+def use_fake_playwright(fake_class=FakePlaywrightUtils, **attributes):
+    """在 with 块内让测试运行器使用 fake_class 代替 PlaywrightUtils
+
+    attributes 覆盖类属性（如 frames、url），只对本次替换生效。
+    """
+    if attributes:
+        fake_class = type(fake_class.__name__, (fake_class,), attributes)
+    original = test_runner_module.PlaywrightUtils
+    test_runner_module.PlaywrightUtils = fake_class
+    try:
+        yield fake_class
+    finally:
+        test_runner_module.PlaywrightUtils = original
@@ -26,6 +26,9 @@ def create_app():
     main_ui = MainUI()
     main_ui.create_main_interface()
 
+    # 后台每小时回收一次不再被引用的截图和崩溃残留的临时文件
+    main_ui.services.retention.start_sweeper()
+
     return app
 
 
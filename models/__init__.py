@@ -2,12 +2,14 @@
 
 from .page_node import PageStructure, PageNode, NodeType
 from .test_case import TestCase, TestViewpoint, TestData, TestType, TestPriority, TestStrategy, TestStatus
-from .test_data import TestExecution, TestStepResult, TestStatus as ExecutionTestStatus, AssertionResult, TestSuite
+from .test_data import TestExecution, TestStepResult, TestStatus as ExecutionTestStatus, AssertionResult, TestSuite, TimingSpan
+from .compact_node import CompactNode, CompactPageStructure
 
 __all__ = [
     'PageStructure', 'PageNode', 'NodeType',
     'TestCase', 'TestViewpoint', 'TestData', 'TestType', 'TestPriority', 'TestStrategy', 'TestStatus',
-    'TestExecution', 'TestStepResult', 'ExecutionTestStatus', 'AssertionResult', 'TestSuite'
+    'TestExecution', 'TestStepResult', 'ExecutionTestStatus', 'AssertionResult', 'TestSuite', 'TimingSpan',
+    'CompactNode', 'CompactPageStructure'
 ]
 
 
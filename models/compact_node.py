@@ -0,0 +1,221 @@
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .node_index import NodeIndex
+from .page_node import NodeType, PageNode, PageStructure
+
+
+_intern = sys.intern
+_EMPTY: Tuple = ()
+# 不带时区的创建时间存为距该时刻的微秒数，可精确还原
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _items(mapping: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+    """字典转为键已驻留的 (键, 值) 元组，空字典共用同一个空元组"""
+    if not mapping:
+        return _EMPTY
+    return tuple((_intern(key), value) for key, value in mapping.items())
+
+
+def _attribute_items(attributes: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    """属性同 _items，较短的属性值（type、class 等大量重复的值）也驻留"""
+    if not attributes:
+        return _EMPTY
+    return tuple((_intern(key), _intern(value) if len(value) <= 32 else value) for key, value in attributes.items())
+
+
+def _optional_intern(value: Optional[str]) -> Optional[str]:
+    return _intern(value) if value else value
+
+
+class CompactNode:
+    """只读的紧凑页面节点
+
+    与 PageNode 字段同名，但不是 Pydantic 模型：用 __slots__ 存储，属性、位置、尺寸等字典
+    改为 (键, 值) 元组，标签名、属性键、节点ID和页面URL驻留为共享字符串，创建时间存为整数。
+    用于大页面结构的只读批量访问（节点树、表单字段列表等）；需要修改或对外返回 PageNode 时
+    用 to_page_node() 转换。attributes、position、size、constraints、options 每次访问返回新的副本。
+    """
+
+    __slots__ = ('id', 'type', 'tag_name', 'text_content', 'xpath', 'css_selector', 'is_visible', 'is_interactive',
+                 'parent_id', 'children', 'page_url', '_attributes', '_position', '_size', '_options', '_constraints',
+                 '_created_at')
+
+    def __init__(self, node: PageNode):
+        setattr_ = object.__setattr__
+        setattr_(self, 'id', _intern(node.id))
+        setattr_(self, 'type', node.type)
+        setattr_(self, 'tag_name', _intern(node.tag_name))
+        setattr_(self, 'text_content', node.text_content)
+        setattr_(self, 'xpath', node.xpath)
+        setattr_(self, 'css_selector', node.css_selector)
+        setattr_(self, 'is_visible', node.is_visible)
+        setattr_(self, 'is_interactive', node.is_interactive)
+        setattr_(self, 'parent_id', _optional_intern(node.parent_id))
+        setattr_(self, 'children', tuple(_intern(child) for child in node.children) if node.children else _EMPTY)
+        setattr_(self, 'page_url', _intern(node.page_url))
+        setattr_(self, '_attributes', _attribute_items(node.attributes))
+        setattr_(self, '_position', _items(node.position))
+        setattr_(self, '_size', _items(node.size))
+        setattr_(self, '_options', tuple(_items(option) for option in node.options) if node.options else _EMPTY)
+        setattr_(self, '_constraints', _items(node.constraints))
+        created_at = node.created_at
+        setattr_(self, '_created_at', (created_at - _EPOCH) // _MICROSECOND if created_at.tzinfo is None else created_at)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CompactNode 为只读对象，不能修改 {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"CompactNode 为只读对象，不能删除 {name}")
+
+    def __repr__(self) -> str:
+        return f"CompactNode(id={self.id!r}, type={self.type.value!r}, tag_name={self.tag_name!r})"
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        return dict(self._attributes)
+
+    @property
+    def position(self) -> Dict[str, Union[int, float]]:
+        return dict(self._position)
+
+    @property
+    def size(self) -> Dict[str, Union[int, float]]:
+        return dict(self._size)
+
+    @property
+    def options(self) -> List[Dict[str, Any]]:
+        return [dict(option) for option in self._options]
+
+    @property
+    def constraints(self) -> Dict[str, Any]:
+        return dict(self._constraints)
+
+    @property
+    def created_at(self) -> datetime:
+        created_at = self._created_at
+        return _EPOCH + created_at * _MICROSECOND if isinstance(created_at, int) else created_at
+
+    def get_attribute(self, key: str, default: Any = None) -> Any:
+        """读取单个属性，不构造字典"""
+        for name, value in self._attributes:
+            if name == key:
+                return value
+        return default
+
+    def get_constraint(self, key: str, default: Any = None) -> Any:
+        """读取单个输入约束，不构造字典"""
+        for name, value in self._constraints:
+            if name == key:
+                return value
+        return default
+
+    def to_page_node(self) -> PageNode:
+        """转换为可修改的 PageNode"""
+        return PageNode.model_construct(
+            id=self.id,
+            type=self.type,
+            tag_name=self.tag_name,
+            text_content=self.text_content,
+            attributes=self.attributes,
+            xpath=self.xpath,
+            css_selector=self.css_selector,
+            position=self.position,
+            size=self.size,
+            is_visible=self.is_visible,
+            is_interactive=self.is_interactive,
+            parent_id=self.parent_id,
+            children=list(self.children),
+            options=self.options,
+            constraints=self.constraints,
+            page_url=self.page_url,
+            created_at=self.created_at
+        )
+
+
+class CompactPageStructure:
+    """只读的紧凑页面结构，节点为 CompactNode
+
+    提供与 PageStructure 相同的只读查询（按ID、按类型、子节点、搜索），复用 NodeIndex。
+    """
+
+    __slots__ = ('id', 'url', 'title', 'screenshot_path', 'created_at', 'updated_at', 'nodes', '_node_index')
+
+    def __init__(self, structure: PageStructure):
+        setattr_ = object.__setattr__
+        setattr_(self, 'id', structure.id)
+        setattr_(self, 'url', structure.url)
+        setattr_(self, 'title', structure.title)
+        setattr_(self, 'screenshot_path', structure.screenshot_path)
+        setattr_(self, 'created_at', structure.created_at)
+        setattr_(self, 'updated_at', structure.updated_at)
+        setattr_(self, 'nodes', tuple(CompactNode(node) for node in structure.nodes))
+        setattr_(self, '_node_index', None)
+
+    @classmethod
+    def from_structure(cls, structure: PageStructure) -> 'CompactPageStructure':
+        return cls(structure)
+
+    @classmethod
+    def load_from_file(cls, file_path: str) -> 'CompactPageStructure':
+        """从文件加载，加载后不保留 Pydantic 模型"""
+        return cls(PageStructure.load_from_file(file_path))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CompactPageStructure 为只读对象，不能修改 {name}")
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[CompactNode]:
+        return iter(self.nodes)
+
+    def _get_index(self) -> NodeIndex:
+        index = self._node_index
+        if index is None:
+            index = NodeIndex(self.nodes)
+            object.__setattr__(self, '_node_index', index)
+        return index
+
+    def get_node(self, node_id: str) -> Optional[CompactNode]:
+        return self._get_index().get(node_id)
+
+    def get_nodes_by_ids(self, node_ids: List[str]) -> List[CompactNode]:
+        return self._get_index().get_many(node_ids)
+
+    def get_nodes_by_type(self, node_type: Union[NodeType, str]) -> List[CompactNode]:
+        return list(self._get_index().by_type(getattr(node_type, 'value', node_type)))
+
+    def get_children(self, node_id: Optional[str]) -> List[CompactNode]:
+        return self._get_index().children(node_id)
+
+    def search_nodes(self, keyword: str) -> List[CompactNode]:
+        return self._get_index().search(keyword)
+
+    def to_table_format(self) -> Dict[str, Any]:
+        """转换为表格格式 { headers: [], rows: [] }，与 PageStructure 相同"""
+        return {
+            'headers': ['ID', '标题', 'URL', '节点数', '创建时间'],
+            'rows': [[
+                self.id,
+                self.title,
+                self.url,
+                len(self.nodes),
+                self.created_at.isoformat()
+            ]]
+        }
+
+    def to_structure(self) -> PageStructure:
+        """转换为可修改的 PageStructure"""
+        return PageStructure(
+            id=self.id,
+            url=self.url,
+            title=self.title,
+            nodes=[node.to_page_node() for node in self.nodes],
+            screenshot_path=self.screenshot_path,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
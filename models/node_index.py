@@ -0,0 +1,202 @@
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.page_node import PageNode
+
+
+class NodeList(list):
+    """记录修改次数的节点列表
+
+    PageStructure.nodes 使用该类型，增删、替换节点和排序时 version 加一，索引据此判断是否失效。
+    """
+    version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self._changed()
+        return result
+
+    def __imul__(self, count):
+        result = super().__imul__(count)
+        self._changed()
+        return result
+
+    def append(self, node):
+        super().append(node)
+        self._changed()
+
+    def extend(self, nodes):
+        super().extend(nodes)
+        self._changed()
+
+    def insert(self, index, node):
+        super().insert(index, node)
+        self._changed()
+
+    def pop(self, index=-1):
+        node = super().pop(index)
+        self._changed()
+        return node
+
+    def remove(self, node):
+        super().remove(node)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+
+def _signature(nodes: List['PageNode']):
+    return id(nodes), len(nodes), getattr(nodes, 'version', 0)
+
+
+class NodeIndex:
+    """页面节点索引
+
+    为 PageStructure 的节点列表按需构建二级索引：按ID、按类型、父子关系以及文本三元组索引。
+    各索引在第一次使用时才构建。节点列表被替换、增删或替换节点后索引自动失效；
+    就地修改节点字段后需调用 PageStructure.invalidate_index()。
+    """
+
+    # 拼接搜索字段时使用的分隔符，三元组不会跨越字段
+    _SEPARATOR = '\x00'
+
+    def __init__(self, nodes: List['PageNode']):
+        self._nodes = nodes
+        self._signature = _signature(nodes)
+        self._by_id: Optional[Dict[str, int]] = None
+        self._by_type: Optional[Dict[str, List['PageNode']]] = None
+        self._children: Optional[Dict[Optional[str], List['PageNode']]] = None
+        self._haystacks: Optional[List[str]] = None
+        self._trigrams: Optional[Dict[str, List[int]]] = None
+
+    def __deepcopy__(self, memo):
+        # 复制页面结构时不复制索引，由副本按需重建
+        return None
+
+    def matches(self, nodes: List['PageNode']) -> bool:
+        """索引是否仍对应该节点列表"""
+        return self._signature == _signature(nodes)
+
+    def _positions(self) -> Dict[str, int]:
+        if self._by_id is None:
+            by_id: Dict[str, int] = {}
+            for position, node in enumerate(self._nodes):
+                # 与线性查找一致：ID重复时取第一个
+                by_id.setdefault(node.id, position)
+            self._by_id = by_id
+        return self._by_id
+
+    def get(self, node_id: str) -> Optional['PageNode']:
+        """按ID获取节点"""
+        position = self._positions().get(node_id)
+        return None if position is None else self._nodes[position]
+
+    def get_many(self, node_ids: List[str]) -> List['PageNode']:
+        """按ID批量获取节点，结果保持节点顺序，忽略不存在的ID"""
+        positions = self._positions()
+        found = sorted({positions[node_id] for node_id in node_ids if node_id in positions})
+        return [self._nodes[position] for position in found]
+
+    def by_type(self, node_type: str) -> List['PageNode']:
+        """按类型获取节点"""
+        if self._by_type is None:
+            by_type: Dict[str, List['PageNode']] = {}
+            for node in self._nodes:
+                by_type.setdefault(node.type.value, []).append(node)
+            self._by_type = by_type
+        return self._by_type.get(node_type, [])
+
+    def children(self, node_id: Optional[str]) -> List['PageNode']:
+        """获取子节点：合并 parent_id 指向该节点的节点和该节点 children 中存在的节点，保持文档顺序
+
+        node_id 为 None 时返回根节点（没有 parent_id 的节点）。
+        """
+        if self._children is None:
+            children: Dict[Optional[str], List['PageNode']] = {}
+            for node in self._nodes:
+                children.setdefault(node.parent_id or None, []).append(node)
+            self._children = children
+
+        result = list(self._children.get(node_id, []))
+        if node_id is not None:
+            parent = self.get(node_id)
+            if parent and parent.children:
+                seen = {child.id for child in result}
+                for child_id in parent.children:
+                    child = self.get(child_id)
+                    if child is not None and child_id not in seen and child_id != node_id:
+                        seen.add(child_id)
+                        result.append(child)
+        return result
+
+    def search(self, keyword: str) -> List['PageNode']:
+        """在文本内容、XPath、CSS选择器中做不区分大小写的子串搜索，结果保持节点顺序"""
+        keyword = keyword.lower()
+        haystacks = self._get_haystacks()
+        if not keyword:
+            # 与线性查找一致：空关键词匹配至少有一个字段非空的节点
+            return [self._nodes[i] for i, haystack in enumerate(haystacks) if haystack.strip(self._SEPARATOR)]
+
+        if len(keyword) < 3 or self._SEPARATOR in keyword:
+            candidates = range(len(haystacks))
+        else:
+            trigrams = self._get_trigrams()
+            # 只取最稀有的三元组对应的候选，再逐个校验子串
+            best: Optional[List[int]] = None
+            for i in range(len(keyword) - 2):
+                posting = trigrams.get(keyword[i:i + 3])
+                if posting is None:
+                    return []
+                if best is None or len(posting) < len(best):
+                    best = posting
+            candidates = best or []
+
+        return [self._nodes[i] for i in candidates if keyword in haystacks[i]]
+
+    def _get_haystacks(self) -> List[str]:
+        if self._haystacks is None:
+            self._haystacks = [
+                self._SEPARATOR.join(((node.text_content or '').lower(), (node.xpath or '').lower(), (node.css_selector or '').lower()))
+                for node in self._nodes
+            ]
+        return self._haystacks
+
+    def _get_trigrams(self) -> Dict[str, List[int]]:
+        if self._trigrams is None:
+            trigrams: Dict[str, List[int]] = {}
+            separator = self._SEPARATOR
+            for position, haystack in enumerate(self._get_haystacks()):
+                seen: Set[str] = set()
+                for i in range(len(haystack) - 2):
+                    trigram = haystack[i:i + 3]
+                    if trigram in seen or separator in trigram:
+                        continue
+                    seen.add(trigram)
+                    posting = trigrams.get(trigram)
+                    if posting is None:
+                        trigrams[trigram] = [position]
+                    else:
+                        posting.append(position)
+            self._trigrams = trigrams
+        return self._trigrams
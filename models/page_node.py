@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, field_validator
 from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 import json
 from datetime import datetime
+from .node_index import NodeIndex, NodeList
+from utils.atomic_io import atomic_write_text
 
 
 class NodeType(str, Enum):
@@ -37,21 +39,19 @@ class PageNode(BaseModel):
     is_interactive: bool = Field(False, description="是否可交互")
     parent_id: Optional[str] = Field(None, description="父节点ID")
     children: List[str] = Field(default_factory=list, description="子节点ID列表")
+    options: List[Dict[str, Any]] = Field(default_factory=list, description="下拉框选项 [{value, text, disabled}]")
+    constraints: Dict[str, Any] = Field(default_factory=dict, description="输入约束（min、max、step、pattern、minlength、maxlength、required）")
     page_url: str = Field(..., description="页面URL")
     created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
 
-    @validator('position', 'size', pre=True)
+    @field_validator('position', 'size', mode='before')
+    @classmethod
     def convert_float_to_int(cls, v):
         """将浮点数转换为整数"""
         if isinstance(v, dict):
             return {k: int(float(val)) if isinstance(val, (int, float)) else val for k, val in v.items()}
         return v
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
     def to_table_format(self) -> Dict[str, Any]:
         """转换为表格格式 { headers: [], rows: [] }"""
         return {
@@ -68,11 +68,9 @@ class PageNode(BaseModel):
             ]]
         }
 
-    def dict(self, *args, **kwargs):
-        d = super().dict(*args, **kwargs)
-        if isinstance(d.get("created_at"), datetime):
-            d["created_at"] = d["created_at"].isoformat()
-        return d
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式（时间为ISO字符串，可直接写入JSON）"""
+        return self.model_dump(mode='json')
 
 
 class PageStructure(BaseModel):
@@ -85,6 +83,51 @@ class PageStructure(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
     updated_at: Optional[datetime] = Field(None, description="更新时间")
 
+    _node_index: Optional[NodeIndex] = PrivateAttr(default=None)
+
+    @field_validator('nodes')
+    @classmethod
+    def track_nodes(cls, v):
+        """节点列表换成 NodeList，增删和替换节点时索引自动失效"""
+        return NodeList(v)
+
+    def __setattr__(self, name, value):
+        if name == 'nodes' and not isinstance(value, NodeList):
+            value = NodeList(value)
+        super().__setattr__(name, value)
+
+    def _get_index(self) -> NodeIndex:
+        """获取节点索引，节点列表变化后自动重建"""
+        index = self._node_index
+        if index is None or not index.matches(self.nodes):
+            index = NodeIndex(self.nodes)
+            self._node_index = index
+        return index
+
+    def invalidate_index(self):
+        """就地修改节点字段后使索引失效"""
+        self._node_index = None
+
+    def get_node(self, node_id: str) -> Optional[PageNode]:
+        """按ID获取节点"""
+        return self._get_index().get(node_id)
+
+    def get_nodes_by_ids(self, node_ids: List[str]) -> List[PageNode]:
+        """按ID批量获取节点，结果保持页面中的节点顺序"""
+        return self._get_index().get_many(node_ids)
+
+    def get_nodes_by_type(self, node_type: Union[NodeType, str]) -> List[PageNode]:
+        """按类型获取节点"""
+        return list(self._get_index().by_type(getattr(node_type, 'value', node_type)))
+
+    def get_children(self, node_id: Optional[str]) -> List[PageNode]:
+        """获取子节点，node_id 为 None 时返回根节点"""
+        return self._get_index().children(node_id)
+
+    def search_nodes(self, keyword: str) -> List[PageNode]:
+        """在文本内容、XPath、CSS选择器中搜索节点（不区分大小写）"""
+        return self._get_index().search(keyword)
+
     def to_table_format(self) -> Dict[str, Any]:
         """转换为表格格式 { headers: [], rows: [] }"""
         return {
@@ -99,32 +142,32 @@ class PageStructure(BaseModel):
         }
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return {
-            "id": self.id,
-            "url": self.url,
-            "title": self.title,
-            "nodes": [node.dict() for node in self.nodes],
-            "screenshot_path": self.screenshot_path,
-            "created_at": self.created_at.isoformat() if isinstance(self.created_at, datetime) else str(self.created_at),
-            "updated_at": self.updated_at.isoformat() if self.updated_at and isinstance(self.updated_at, datetime) else None
-        }
+        """转换为字典格式（时间为ISO字符串，可直接写入JSON）"""
+        return self.model_dump(mode='json')
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """转换为JSON字符串"""
+        return self.model_dump_json(indent=indent)
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> 'PageStructure':
+        """从JSON字符串创建，缺失的 updated_at 等字段取默认值"""
+        # 当前 pydantic-core(2.14) 的 model_validate_json 实测比 json.loads 后再 model_validate 慢，加载走后者
+        return cls.model_validate(json.loads(data))
 
     def save_to_file(self, file_path: str):
         """保存到文件"""
         # 更新updated_at字段
         self.updated_at = datetime.now()
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        # 由 pydantic-core 直接序列化，不经过中间字典；写临时文件后替换，中途崩溃不损坏原文件
+        atomic_write_text(file_path, self.to_json())
 
     @classmethod
     def load_from_file(cls, file_path: str) -> 'PageStructure':
         """从文件加载"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            return cls.from_json(f.read())
 
-        # 处理缺失的updated_at字段
-        if 'updated_at' not in data:
-            data['updated_at'] = None
 
-        return cls(**data)
+# 节点列表的批量校验和序列化（节点不在同一个页面结构中时使用，如测试用例各测试观点的目标节点）
+PageNodeList = TypeAdapter(List[PageNode])
@@ -1,11 +1,11 @@
-import os
 import json
 import uuid
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 from enum import Enum
-from dataclasses import dataclass, asdict
-from models.page_node import PageNode
+from dataclasses import dataclass
+from models.page_node import PageNode, PageNodeList
+from utils.atomic_io import atomic_write_json
 
 
 class TestType(Enum):
@@ -60,9 +60,15 @@ class TestData:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        data = asdict(self)
-        data['created_at'] = self.created_at.isoformat() if self.created_at else None
-        return data
+        # 逐字段构造，避免 asdict 对每个值做深拷贝
+        return {
+            'id': self.id,
+            'input_value': self.input_value,
+            'expected_value': self.expected_value,
+            'assertion_functions': list(self.assertion_functions),
+            'description': self.description,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TestData':
@@ -96,20 +102,22 @@ class TestViewpoint:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        data = asdict(self)
-        data['strategy'] = self.strategy.value
-        data['target_node'] = self.target_node.dict() if self.target_node else None
-        data['test_data_list'] = [td.to_dict() for td in self.test_data_list]
-        data['created_at'] = self.created_at.isoformat() if self.created_at else None
-        return data
+        return {
+            'id': self.id,
+            'name': self.name,
+            'strategy': self.strategy.value,
+            'description': self.description,
+            'target_node': self.target_node.model_dump(mode='json') if self.target_node else None,
+            'test_data_list': [td.to_dict() for td in self.test_data_list],
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TestViewpoint':
         """从字典创建"""
-        from models.page_node import PageNode
-
         data['strategy'] = TestStrategy(data['strategy'])
-        data['target_node'] = PageNode.parse_obj(data['target_node']) if data.get('target_node') else None
+        # 已是 PageNode 实例（TestCase.from_dict 批量校验过）时直接使用
+        data['target_node'] = PageNode.model_validate(data['target_node']) if data.get('target_node') else None
         data['test_data_list'] = [TestData.from_dict(td) for td in data.get('test_data_list', [])]
         data['created_at'] = datetime.fromisoformat(data['created_at']) if data.get('created_at') else None
         return cls(**data)
@@ -164,13 +172,17 @@ class TestCase:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        data = asdict(self)
-        data['test_type'] = self.test_type.value
-        data['priority'] = self.priority.value
-        data['viewpoints'] = [vp.to_dict() for vp in self.viewpoints]
-        data['created_at'] = self.created_at.isoformat() if self.created_at else None
-        data['updated_at'] = self.updated_at.isoformat() if self.updated_at else None
-        return data
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'test_type': self.test_type.value,
+            'priority': self.priority.value,
+            'page_url': self.page_url,
+            'viewpoints': [vp.to_dict() for vp in self.viewpoints],
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TestCase':
@@ -181,16 +193,19 @@ class TestCase:
 
         data['test_type'] = TestType(data['test_type'])
         data['priority'] = TestPriority(data['priority'])
-        data['viewpoints'] = [TestViewpoint.from_dict(vp) for vp in data.get('viewpoints', [])]
+        viewpoints = data.get('viewpoints', [])
+        # 所有测试观点的目标节点一次性校验，避免逐个调用校验器
+        with_node = [vp for vp in viewpoints if vp.get('target_node')]
+        for vp, node in zip(with_node, PageNodeList.validate_python([vp['target_node'] for vp in with_node])):
+            vp['target_node'] = node
+        data['viewpoints'] = [TestViewpoint.from_dict(vp) for vp in viewpoints]
         data['created_at'] = datetime.fromisoformat(data['created_at']) if data.get('created_at') else None
         data['updated_at'] = datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None
         return cls(**data)
 
     def save_to_file(self, filepath: str):
         """保存到文件"""
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        atomic_write_json(filepath, self.to_dict(), indent=2)
 
     @classmethod
     def load_from_file(cls, filepath: str) -> 'TestCase':
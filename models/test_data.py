@@ -4,6 +4,7 @@ from enum import Enum
 import json
 from datetime import datetime
 from .test_case import TestCase
+from utils.atomic_io import atomic_write_text
 
 
 class TestStatus(str, Enum):
@@ -40,6 +41,16 @@ class AssertionResult(BaseModel):
         }
 
 
+class TimingSpan(BaseModel):
+    """执行过程中一段操作的耗时（浏览器启动、导航、页面操作、截图、断言、保存等）"""
+    name: str = Field(..., description="名称")
+    category: str = Field(..., description="分类：browser/playwright/wait/screenshot/assertion/storage/report 等")
+    start_us: int = Field(..., description="开始时间（Unix时间戳，微秒）")
+    duration_us: int = Field(..., description="时长(微秒)")
+    track: str = Field("main", description="所在的执行轨道，同一轨道上的区间按嵌套关系显示")
+    args: Dict[str, Any] = Field(default_factory=dict, description="附加信息")
+
+
 class TestStepResult(BaseModel):
     """测试步骤结果模型"""
     step_id: str = Field(..., description="步骤ID")
@@ -54,11 +65,9 @@ class TestStepResult(BaseModel):
     assertions: List[AssertionResult] = Field(default_factory=list, description="断言结果")
     error_message: Optional[str] = Field(None, description="错误信息")
     screenshot_path: Optional[str] = Field(None, description="截图路径")
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    visual_score: Optional[float] = Field(None, description="与视觉基线的差异（变化像素比例）")
+    diff_path: Optional[str] = Field(None, description="与视觉基线的差异图路径")
+    duplicate_of: Optional[str] = Field(None, description="复用其执行结果的等价步骤ID（本步骤未单独执行）")
 
     def to_table_format(self) -> Dict[str, Any]:
         """转换为表格格式 { headers: [], rows: [] }"""
@@ -95,11 +104,7 @@ class TestExecution(BaseModel):
     error_message: Optional[str] = Field(None, description="错误信息")
     browser_info: Dict[str, str] = Field(default_factory=dict, description="浏览器信息")
     environment_info: Dict[str, str] = Field(default_factory=dict, description="环境信息")
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    spans: List[TimingSpan] = Field(default_factory=list, description="耗时区间（关闭计时时为空）")
 
     def calculate_summary(self):
         """计算执行摘要"""
@@ -129,35 +134,20 @@ class TestExecution(BaseModel):
         }
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return {
-            "id": self.id,
-            "test_case_id": self.test_case_id,
-            "test_case_name": self.test_case_name,
-            "status": self.status.value,
-            "start_time": self.start_time.isoformat(),
-            "end_time": self.end_time.isoformat() if self.end_time else None,
-            "duration": self.duration,
-            "step_results": [step.dict() for step in self.step_results],
-            "total_steps": self.total_steps,
-            "passed_steps": self.passed_steps,
-            "failed_steps": self.failed_steps,
-            "error_message": self.error_message,
-            "browser_info": self.browser_info,
-            "environment_info": self.environment_info
-        }
+        """转换为字典格式（时间为ISO字符串，可直接写入JSON）"""
+        return self.model_dump(mode='json')
 
     def save_to_file(self, file_path: str):
         """保存到文件"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        # 由 pydantic-core 直接序列化，不经过中间字典；写临时文件后替换，中途崩溃不损坏原文件
+        atomic_write_text(file_path, self.model_dump_json(indent=2))
 
     @classmethod
     def load_from_file(cls, file_path: str) -> 'TestExecution':
         """从文件加载"""
+        # 与 PageStructure.from_json 相同，解析后再校验比 model_validate_json 快
         with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return cls(**data)
+            return cls.model_validate(json.load(f))
 
 
 class TestSuite(BaseModel):
@@ -171,28 +161,19 @@ class TestSuite(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now, description="更新时间")
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "test_case_ids": self.test_case_ids,
-            "executions": [execution.to_dict() for execution in self.executions],
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+        """转换为字典格式（时间为ISO字符串，可直接写入JSON）"""
+        return self.model_dump(mode='json')
 
     def save_to_file(self, file_path: str):
         """保存到文件"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        atomic_write_text(file_path, self.model_dump_json(indent=2))
 
     @classmethod
     def load_from_file(cls, file_path: str) -> 'TestSuite':
         """从文件加载"""
+        # 与 PageStructure.from_json 相同，解析后再校验比 model_validate_json 快
         with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return cls(**data)
+            return cls.model_validate(json.load(f))
 
     def to_table_format(self) -> Dict[str, Any]:
         """转换为表格格式 { headers: [], rows: [] }"""
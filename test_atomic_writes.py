@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+测试原子写入和分组落盘
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import utils.atomic_io as atomic_io
+from benchmarks.storage import synthetic_page_structure, synthetic_test_case, synthetic_execution
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.test_data import TestExecution, TestSuite
+from utils.atomic_io import atomic_write_text, configure_fsync, flush_pending_writes, get_fsync_batcher, sync_written_file
+
+
+def _count_fsync(action) -> int:
+    calls = []
+    original = os.fsync
+    os.fsync = lambda fd: calls.append(fd)
+    try:
+        action()
+    finally:
+        os.fsync = original
+    return len(calls)
+
+
+def test_atomic_save():
+    """测试各模型保存为原子替换，写入失败时原文件不变"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. 保存后不留下临时文件
+        print("1. 测试保存...")
+        suite = TestSuite(id="suite", name="套件")
+        models = [synthetic_page_structure(5), synthetic_test_case(5), synthetic_execution(5), suite]
+        for model in models:
+            path = os.path.join(tmp_dir, "nested", f"{type(model).__name__}.json")
+            model.save_to_file(path)
+            assert type(model).load_from_file(path).id == model.id
+        assert len(os.listdir(os.path.join(tmp_dir, "nested"))) == 4
+
+        # 2. 替换前崩溃：原文件完整，临时文件被删除
+        print("2. 测试写入中断...")
+        path = os.path.join(tmp_dir, "nested", "TestExecution.json")
+        before = open(path, 'rb').read()
+        original_replace = os.replace
+
+        def crash(src, dst):
+            raise KeyboardInterrupt()
+
+        os.replace = crash
+        try:
+            synthetic_execution(50).save_to_file(path)
+            assert False
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.replace = original_replace
+        assert open(path, 'rb').read() == before
+        assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')]
+
+        # 3. 残留的临时文件不会被当成执行记录
+        print("3. 测试列表忽略临时文件...")
+        runner = TestRunner(os.path.join(tmp_dir, "reports"),
+                            test_generator=TestGenerator(os.path.join(tmp_dir, "cases")))
+        execution = synthetic_execution(3)
+        runner.save_execution(execution)
+        with open(os.path.join(tmp_dir, "reports", f"{execution.id}.json.0123.tmp"), 'w') as f:
+            f.write('{"id": "半截')
+        output = io.StringIO()
+        with redirect_stdout(output):
+            rows = runner.list_executions()['rows']
+        assert [row[0] for row in rows] == [execution.id] and "加载执行记录失败" not in output.getvalue()
+
+        # 4. 并发写同一个文件时，读到的总是完整内容
+        print("4. 测试并发写入...")
+        path = os.path.join(tmp_dir, "concurrent.json")
+        execution.save_to_file(path)
+        errors = []
+
+        def writer(n):
+            for i in range(20):
+                synthetic_execution(n + i % 3).save_to_file(path)
+
+        def reader():
+            for _ in range(100):
+                try:
+                    TestExecution.load_from_file(path)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in (10, 40)] + [threading.Thread(target=reader)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+
+    print("\n✅ 原子写入测试通过！")
+
+
+def test_fsync_modes():
+    """测试 always、batch、never 三种落盘方式"""
+    mode, batch_size = atomic_io.get_fsync_mode(), get_fsync_batcher().batch_size
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = [os.path.join(tmp_dir, f"{i}.json") for i in range(10)]
+
+            def write_all():
+                for path in paths:
+                    atomic_write_text(path, "{}")
+
+            # 1. always：每个文件 fsync 文件和目录
+            print("1. 测试 always...")
+            configure_fsync('always')
+            assert _count_fsync(write_all) == 20
+
+            # 2. batch：每个文件重命名前 fsync，目录每4个文件一组落盘，剩余的由 flush 落盘
+            print("2. 测试 batch...")
+            configure_fsync('batch', batch_size=4, interval=3600)
+            flush_pending_writes()
+            batcher = get_fsync_batcher()
+            flushes = batcher.flushes
+            calls = _count_fsync(write_all)
+            assert batcher.flushes - flushes == 2 and calls == 10 + 2
+            assert batcher.pending() == 2
+            assert _count_fsync(flush_pending_writes) == 1 and batcher.pending() == 0
+
+            # 追加写入的文件和目录一起分组落盘
+            log_path = os.path.join(tmp_dir, "log.jsonl")
+            with open(log_path, 'ab') as f:
+                f.write(b'{}\n')
+            assert _count_fsync(lambda: sync_written_file(log_path)) == 0 and batcher.pending() == 1
+            assert _count_fsync(flush_pending_writes) == 2
+
+            # 写入停止后由定时器在 interval 秒内落盘
+            configure_fsync(interval=0.05)
+            atomic_write_text(paths[0], "{}")
+            deadline = time.time() + 5
+            while batcher.pending() and time.time() < deadline:
+                time.sleep(0.01)
+            assert batcher.pending() == 0
+            configure_fsync(interval=3600)
+
+            # 3. never：不 fsync
+            print("3. 测试 never...")
+            configure_fsync('never')
+            assert _count_fsync(write_all) == 0 and batcher.pending() == 0
+
+            # 4. 不支持的方式
+            print("4. 测试参数校验...")
+            for kwargs in [{'mode': 'sometimes'}, {'batch_size': 0}]:
+                try:
+                    configure_fsync(**kwargs)
+                    assert False
+                except ValueError:
+                    pass
+    finally:
+        configure_fsync(mode, batch_size=batch_size, interval=1.0)
+
+    print("\n✅ 落盘方式测试通过！")
+
+
+if __name__ == "__main__":
+    test_atomic_save()
+    test_fsync_modes()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+测试登录状态缓存
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.test_case import TestCase, TestType, TestPriority
+from models.test_data import TestStatus
+from utils.auth_state import StorageStateStore, origin_of
+from fake_playwright import FakePlaywrightUtils, use_fake_playwright
+
+
+class _FakePlaywrightUtils(FakePlaywrightUtils):
+    """记录加载的登录状态的假浏览器工具"""
+    url = "https://example.com/admin"
+    title = "后台"
+    loaded_states = []
+
+    async def start_browser(self, headless=True, storage_state=None):
+        await super().start_browser(headless, storage_state)
+        self.loaded_states.append(storage_state)
+
+    async def get_storage_state(self):
+        return {'cookies': [{'name': 'session', 'value': 'abc', 'domain': 'example.com', 'path': '/'}], 'origins': []}
+
+
+def test_storage_state_store():
+    """测试按源和角色缓存、过期和并发刷新"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        calls = []
+
+        async def refresher(login_test_case_id, origin, role, headless):
+            calls.append((login_test_case_id, origin, role))
+            await asyncio.sleep(0.01)
+            return {'cookies': [], 'origins': [{'origin': origin, 'localStorage': [{'name': 'role', 'value': role}]}]}
+
+        store = StorageStateStore(tmp_dir, refresher=refresher)
+
+        # 1. 按源区分，同源不同路径共用登录配置
+        print("1. 测试登录配置...")
+        assert origin_of("HTTPS://Example.com:8443/a?b=1") == "https://example.com:8443"
+        store.register_login("https://example.com/login", "admin", "login-case", ttl=1)
+        assert StorageStateStore(tmp_dir).get_login("https://example.com/other", "admin").login_test_case_id == "login-case"
+        assert store.get("https://example.com/", "admin") is None
+
+        # 2. 并发请求只运行一次登录用例
+        print("2. 测试并发刷新...")
+
+        async def ensure_many():
+            return await asyncio.gather(*(store.ensure("https://example.com/page", "admin") for _ in range(5)))
+
+        paths = asyncio.run(ensure_many())
+        assert len(set(paths)) == 1 and len(calls) == 1
+        with open(paths[0], 'r', encoding='utf-8') as f:
+            assert json.load(f)['origins'][0]['localStorage'][0]['value'] == "admin"
+        assert asyncio.run(store.ensure("https://example.com/", "admin")) == paths[0]
+        assert len(calls) == 1
+
+        # 3. 过期后重新登录；没有登录配置的角色报错
+        print("3. 测试过期和未配置角色...")
+        time.sleep(1.1)
+        assert store.get("https://example.com/", "admin") is None
+        asyncio.run(store.ensure("https://example.com/", "admin"))
+        assert len(calls) == 2
+        try:
+            asyncio.run(store.ensure("https://example.com/", "guest"))
+            assert False
+        except Exception as e:
+            assert "guest" in str(e)
+        assert store.unregister_login("https://example.com", "admin")
+        assert not os.path.exists(paths[0])
+
+    print("\n✅ 登录状态缓存测试通过！")
+
+
+def test_runner_storage_state():
+    """测试运行器运行登录用例获取状态，之后的用例直接加载"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"))
+        for case_id in ["login", "admin-page"]:
+            test_generator.save_test_case(TestCase(id=case_id, name=case_id, description="", test_type=TestType.FUNCTIONAL,
+                                                   priority=TestPriority.MEDIUM, page_url="https://example.com/admin",
+                                                   viewpoints=[]))
+        store = StorageStateStore(os.path.join(tmp_dir, "auth"))
+        runner = TestRunner(os.path.join(tmp_dir, "reports"), test_generator=test_generator, auth_store=store)
+        store.refresher = runner.refresh_storage_state
+        store.register_login("https://example.com", "admin", "login")
+
+        _FakePlaywrightUtils.loaded_states = []
+        with use_fake_playwright(_FakePlaywrightUtils):
+            print("1. 测试首次运行登录用例...")
+            executions = asyncio.run(runner.run_test_suite(["admin-page", "admin-page"], auth_role="admin"))
+
+        state_path = store.state_path("https://example.com", "admin")
+        # 登录用例在干净的浏览器中运行一次，两个用例都加载登录状态
+        assert _FakePlaywrightUtils.loaded_states == [None, state_path, state_path]
+        assert all(execution.status == TestStatus.PASSED for execution in executions)
+        assert executions[0].environment_info["auth_role"] == "admin"
+
+    print("\n✅ 运行器登录状态测试通过！")
+
+
+if __name__ == "__main__":
+    test_storage_state_store()
+    test_runner_storage_state()
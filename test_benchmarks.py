@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+测试性能基准测试的夹具服务器和计时工具
+"""
+
+import os
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.app import main as bench_main
+from benchmarks.fixture_server import FixtureServer, FormSpec
+from benchmarks.harness import BenchmarkResult, measure, compare_results, write_results, load_results
+from benchmarks.pipeline import run_pipeline_benchmarks, synthetic_page_structure
+from benchmarks.storage import run_storage_benchmarks, synthetic_test_case, synthetic_execution
+from models.page_node import NodeType
+
+
+def test_fixture_server():
+    """测试夹具服务器按参数生成表单页面"""
+    spec = FormSpec(fields=15, depth=3, iframes=2, select_options=7)
+
+    # 1. 页面规模与参数一致
+    print("1. 测试合成表单页面...")
+    with FixtureServer() as server:
+        assert FormSpec.from_query(spec.to_query()) == spec
+        with urllib.request.urlopen(server.form_url(spec)) as response:
+            page = response.read().decode('utf-8')
+        with urllib.request.urlopen(f"{server.base_url}/frame?fields=3") as response:
+            frame = response.read().decode('utf-8')
+    assert page.count('<label') == 15 and page.count('<select') == 2
+    assert page.count('<option') == 2 * 8 and page.count('<iframe') == 2
+    assert page.count('class="wrap-') == 15 * 3
+    assert frame.count('<label') == 3
+
+    # 2. 构造的页面结构与页面一致
+    print("2. 测试构造的页面结构...")
+    structure = synthetic_page_structure(spec, "http://127.0.0.1/form")
+    assert len(structure.get_nodes_by_type(NodeType.SELECT)) == 2
+    assert len(structure.get_nodes_by_type(NodeType.DIV)) == 15 * 3
+    assert structure.get_node("select_4").options[-1]['value'] == "v6"
+    assert structure.get_node("text_0").parent_id == "text_0_wrap_0"
+
+    print("\n✅ 夹具服务器测试通过！")
+
+
+def test_harness():
+    """测试计时、结果文件和回归对比"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. 计时和峰值内存
+        print("1. 测试计时...")
+        result = measure("alloc", lambda: [0] * 100000, iterations=3, params={'n': 100000},
+                         unit="item", units_per_call=100000, track_memory=True)
+        assert result.iterations == 3 and result.key == "alloc[n=100000]"
+        assert result.throughput > 0 and result.peak_memory_bytes >= 100000 * 8
+
+        # 2. 写入和读取
+        print("2. 测试结果文件...")
+        path = write_results([result, BenchmarkResult.skip("browser", "浏览器不可用")],
+                             os.path.join(tmp_dir, "base.json"), "test")
+        loaded = load_results(path)
+        assert loaded[0] == result and loaded[1].skipped
+
+        # 3. 吞吐量下降超过阈值时判定为回归，跳过的项不参与对比
+        print("3. 测试回归对比...")
+        slower = BenchmarkResult(**{**result.__dict__, 'throughput': result.throughput * 0.8})
+        rows = compare_results(loaded, [slower, BenchmarkResult.skip("browser", "浏览器不可用")], threshold=0.1)
+        assert len(rows) == 1 and rows[0]['regressed']
+        assert not compare_results(loaded, [slower], threshold=0.25)[0]['regressed']
+        write_results([slower], os.path.join(tmp_dir, "current.json"), "test")
+        assert bench_main(['compare', path, os.path.join(tmp_dir, "current.json")]) == 1
+        assert bench_main(['compare', path, path]) == 0
+
+    print("\n✅ 计时工具测试通过！")
+
+
+def test_pipeline_without_browser():
+    """测试不启动浏览器时测量生成和报告环节"""
+    print("1. 测试各环节结果...")
+    results = {result.name: result for result in run_pipeline_benchmarks(FormSpec(fields=10), iterations=2, browser=False)}
+    assert results['extract_page_nodes'].skipped and results['run_test_case'].skipped
+    assert results['generate_test_case_from_nodes'].units_per_call == 11
+    for name in ['report_html', 'report_json', 'report_junit']:
+        assert not results[name].skipped and results[name].throughput > 0
+
+    print("\n✅ 基准测试流程测试通过！")
+
+
+def test_storage_benchmarks():
+    """测试模型序列化基准测试和回归门禁"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. 每个模型、每种格式各有序列化和反序列化两项
+        print("1. 测试各模型和格式...")
+        assert synthetic_test_case(25).get_test_data_count() == 25
+        assert synthetic_execution(25).total_steps == 25
+        results = run_storage_benchmarks([50], iterations=1)
+        assert len(results) == 3 * 3 * 2
+        assert {result.name for result in results} >= {"page_structure.ser.file", "test_case.deser.dict",
+                                                       "test_execution.deser.json"}
+        assert all(result.params == {'size': 50} and result.peak_memory_bytes > 0 for result in results)
+
+        # 2. 与基准结果对比：吞吐量明显下降时退出码为 1
+        print("2. 测试回归门禁...")
+        baseline = os.path.join(tmp_dir, "baseline.json")
+        args = ['storage', '--size', '50', '--model', 'test_case', '--format', 'dict', '--no-memory']
+        assert bench_main(args + ['--output', baseline]) == 0
+        faster = [BenchmarkResult(**{**result.__dict__, 'throughput': result.throughput * 100})
+                  for result in load_results(baseline)]
+        write_results(faster, baseline, "storage")
+        assert bench_main(args + ['--output', os.path.join(tmp_dir, "current.json"), '--baseline', baseline]) == 1
+        assert bench_main(args + ['--output', baseline, '--baseline', baseline, '--threshold', '0.999']) == 0
+
+    print("\n✅ 存储基准测试通过！")
+
+
+if __name__ == "__main__":
+    test_fixture_server()
+    test_harness()
+    test_pipeline_without_browser()
+    test_storage_benchmarks()
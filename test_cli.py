@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+测试无界面命令行入口
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from cli.app import main, parse_shard, select_test_cases, UsageError, EXIT_USAGE_ERROR
+
+
+def test_select_and_shard():
+    """测试用例过滤和分片"""
+    cases = [(f"case-{i}", f"登录测试{i}" if i % 2 else f"搜索测试{i}") for i in range(10)]
+
+    # 1. 分片互不重叠且覆盖全部用例
+    print("1. 测试分片...")
+    shards = [select_test_cases(cases, shard=(k, 3)) for k in range(1, 4)]
+    all_ids = sorted(case_id for shard in shards for case_id, _ in shard)
+    assert all_ids == sorted(case_id for case_id, _ in cases)
+    assert sum(len(shard) for shard in shards) == len(cases)
+
+    # 2. 按名称和ID过滤
+    print("2. 测试过滤...")
+    assert all('登录' in name for _, name in select_test_cases(cases, filters=['登录*']))
+    assert [case_id for case_id, _ in select_test_cases(cases, filters=['CASE-3'])] == ['case-3']
+
+    # 3. 非法分片参数
+    print("3. 测试非法分片参数...")
+    assert parse_shard('2/4') == (2, 4)
+    for value in ['0/2', '3/2', 'a/b', '1']:
+        try:
+            parse_shard(value)
+            assert False, value
+        except UsageError:
+            pass
+
+    assert main(['run', '--shard', '5/2']) == EXIT_USAGE_ERROR
+    print("\n✅ 过滤和分片测试通过！")
+
+
+def test_no_ui_imports():
+    """测试命令行不会导入nicegui和ui模块"""
+    code = (
+        "import sys; from cli.app import main; main(['list', 'cases']); "
+        "bad = [m for m in sys.modules if m == 'nicegui' or m.startswith(('nicegui.', 'ui.')) or m == 'ui']; "
+        "print(bad); sys.exit(1 if bad else 0)"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=str(project_root), capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    print("✅ 命令行未导入界面模块")
+
+
+if __name__ == "__main__":
+    test_select_and_shard()
+    test_no_ui_imports()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+测试表单字段的组合覆盖生成
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.page_parser import PageParser
+from core.test_generator import TestGenerator
+from models.page_node import PageStructure, PageNode, NodeType
+from models.test_case import TestStrategy
+from utils.combination_utils import generate_covering_array, count_uncovered
+from utils.object_cache import ObjectCache
+
+
+def test_covering_array():
+    """测试覆盖数组完整覆盖且远小于全组合"""
+    cases = [
+        ([3, 3, 3, 3], 2),
+        ([2] * 13, 2),
+        ([2, 6, 7, 3, 5, 10, 4, 8], 2),
+        ([4] * 8, 3),
+        ([5], 2),
+        ([2, 3], 3),
+        ([3] * 13, 2),
+        ([10] * 4, 2),
+        ([2] * 10, 3),
+    ]
+    for domain_sizes, strength in cases:
+        rows = generate_covering_array(domain_sizes, strength)
+        assert count_uncovered(rows, domain_sizes, strength) == 0, (domain_sizes, strength)
+        assert all(0 <= value < size for row in rows for value, size in zip(row, domain_sizes))
+
+    # 13个二值参数的两两组合远少于 2^13
+    assert len(generate_covering_array([2] * 13, 2)) <= 20
+    # 未确定的取值用于覆盖之后的组合，多值参数和三元组合的行数接近已知的最优规模
+    assert len(generate_covering_array([3] * 13, 2)) <= 20
+    assert len(generate_covering_array([10] * 4, 2)) <= 120
+    assert len(generate_covering_array([2] * 10, 3)) <= 20
+    assert generate_covering_array([3] * 13, 2) == generate_covering_array([3] * 13, 2)
+    assert generate_covering_array([], 2) == []
+
+    print("\n✅ 覆盖数组测试通过！")
+
+
+def test_form_combination():
+    """测试从表单节点生成两两组合测试数据"""
+    url = "https://example.com/register"
+    nodes = [
+        PageNode(id="form_0", type=NodeType.FORM, tag_name="form", xpath="//form", page_url=url),
+        PageNode(id="email", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"email\"]",
+                 attributes={"id": "email", "type": "email"}, parent_id="form_0", page_url=url),
+        PageNode(id="age", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"age\"]",
+                 attributes={"id": "age", "type": "number"}, parent_id="form_0", page_url=url),
+        PageNode(id="country", type=NodeType.SELECT, tag_name="select", xpath="//*[@id=\"country\"]",
+                 attributes={"id": "country"}, parent_id="form_0", page_url=url),
+        PageNode(id="agree", type=NodeType.CHECKBOX, tag_name="input", xpath="//*[@id=\"agree\"]",
+                 attributes={"id": "agree", "type": "checkbox"}, parent_id="form_0", page_url=url),
+        PageNode(id="token", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"token\"]",
+                 attributes={"id": "token", "type": "hidden"}, parent_id="form_0", page_url=url),
+        PageNode(id="submit", type=NodeType.BUTTON, tag_name="button", xpath="//*[@id=\"submit\"]",
+                 attributes={"id": "submit", "type": "submit"}, parent_id="form_0", page_url=url),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ObjectCache()
+        page_parser = PageParser(os.path.join(tmp_dir, "page_nodes"), cache=cache)
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"), page_parser=page_parser, cache=cache)
+        page_parser.save_page_structure(PageStructure(id="register", url=url, title="注册", nodes=nodes))
+
+        test_case = test_generator.generate_form_combination_test_case("register", "form_0", "注册表单组合")
+        viewpoint = test_case.viewpoints[0]
+        assert viewpoint.strategy == TestStrategy.COMPREHENSIVE
+        assert viewpoint.target_node.id == "form_0"
+
+        # 隐藏字段和按钮不参与组合
+        selectors = {entry['selector'] for data in viewpoint.test_data_list for entry in data.input_value}
+        assert selectors == {"#email", "#age", "#country", "#agree"}
+
+        # 每对字段的每对取值都被覆盖
+        domains = {
+            "#email": len(test_generator._get_field_domain(nodes[1], (TestStrategy.BASIC, TestStrategy.EQUIVALENCE))),
+            "#age": len(test_generator._get_field_domain(nodes[2], (TestStrategy.BASIC, TestStrategy.EQUIVALENCE))),
+            "#country": len(test_generator._get_field_domain(nodes[3], (TestStrategy.BASIC, TestStrategy.EQUIVALENCE))),
+            "#agree": 2,
+        }
+        fields = list(domains)
+        for i, first in enumerate(fields):
+            for second in fields[i + 1:]:
+                pairs = {(data.expected_value[first], data.expected_value[second]) for data in viewpoint.test_data_list}
+                assert len(pairs) == domains[first] * domains[second], (first, second)
+
+        total = 1
+        for size in domains.values():
+            total *= size
+        print(f"   {len(viewpoint.test_data_list)} 组表单数据（全组合 {total} 组）")
+        assert len(viewpoint.test_data_list) < total / 10
+
+        # 复选框的取值转换为选中/取消选中操作
+        actions = {entry['action'] for data in viewpoint.test_data_list for entry in data.input_value if entry['selector'] == "#agree"}
+        assert actions == {"check", "uncheck"}
+
+        # 保存后可以原样加载
+        test_generator.save_test_case(test_case)
+        reloaded = TestGenerator(test_generator.data_dir, cache=ObjectCache()).load_test_case(test_case.id)
+        assert reloaded.viewpoints[0].test_data_list[0].input_value == viewpoint.test_data_list[0].input_value
+
+    print("\n✅ 表单组合测试通过！")
+
+
+if __name__ == "__main__":
+    test_covering_array()
+    test_form_combination()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+测试紧凑页面节点
+"""
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.storage import synthetic_page_structure
+from core.page_parser import PageParser
+from models.compact_node import CompactPageStructure
+from models.page_node import NodeType, PageStructure
+from utils.object_cache import ObjectCache
+
+
+def _traced_size(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        obj = build()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] if obj is not None else 0
+    finally:
+        tracemalloc.stop()
+
+
+def test_compact_structure():
+    """测试与 PageStructure 互相转换、只读查询和内存占用"""
+    structure = synthetic_page_structure(2000)
+    compact = CompactPageStructure.from_structure(structure)
+
+    # 1. 转换往返不丢失信息
+    print("1. 测试转换...")
+    assert compact.to_structure().to_dict() == structure.to_dict()
+    node = compact.get_node("node_1")
+    assert node.to_page_node() == structure.get_node("node_1")
+    assert node.options == structure.get_node("node_1").options and node.created_at == structure.nodes[1].created_at
+
+    # 2. 只读，字典字段返回副本
+    print("2. 测试只读...")
+    for target, name in [(node, 'text_content'), (compact, 'title')]:
+        try:
+            setattr(target, name, "x")
+            assert False
+        except AttributeError:
+            pass
+    node.attributes['name'] = "changed"
+    assert node.get_attribute('name') == "field_1"
+
+    # 3. 标签名、属性键、节点ID驻留为共享字符串
+    print("3. 测试字符串驻留...")
+    a, b = compact.get_node("node_0"), compact.get_node("node_4")
+    assert a.tag_name is b.tag_name and a._attributes[2][0] is b._attributes[2][0]
+    assert compact.get_node("node_11").parent_id is compact.get_node("node_10").id
+
+    # 4. 查询结果与 PageStructure 一致
+    print("4. 测试查询...")
+    assert [n.id for n in compact.get_nodes_by_type(NodeType.SELECT)] == [n.id for n in structure.get_nodes_by_type(NodeType.SELECT)]
+    assert [n.id for n in compact.get_children("node_10")] == [n.id for n in structure.get_children("node_10")]
+    assert [n.id for n in compact.search_nodes("节点 19")] == [n.id for n in structure.search_nodes("节点 19")]
+
+    # 5. 内存占用小于 PageStructure
+    print("5. 测试内存占用...")
+    data = json.dumps(structure.to_dict())
+    full_size = _traced_size(lambda: PageStructure.model_validate(json.loads(data)))
+    compact_size = _traced_size(lambda: CompactPageStructure(PageStructure.model_validate(json.loads(data))))
+    print(f"   PageStructure {full_size / 1024:.0f}KB, CompactPageStructure {compact_size / 1024:.0f}KB")
+    assert compact_size < full_size * 0.75
+
+    print("\n✅ 紧凑页面结构测试通过！")
+
+
+def test_parser_compact_views():
+    """测试页面解析器的只读视图使用紧凑页面结构"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache, compact_cache = ObjectCache(), ObjectCache()
+        page_parser = PageParser(tmp_dir, cache=cache, compact_cache=compact_cache)
+        structure = synthetic_page_structure(40)
+        page_parser.save_page_structure(structure)
+        cache.clear()
+
+        # 1. 列表、节点树和表单字段不加载完整模型
+        print("1. 测试只读视图...")
+        assert page_parser.list_page_structures()['rows'][0][3] == 40
+        assert page_parser.get_node_children(structure.id, "node_0")['total'] == 9
+        fields = page_parser.get_form_fields(structure.id)
+        assert fields[0] == {'id': "node_0", 'name': "field_0", 'type': "input", 'placeholder': '', 'required': True,
+                             'value': '', 'selector': "#node_0", 'is_interactive': True, 'options': [],
+                             'constraints': {'required': True, 'maxlength': 50}}
+        assert fields[1]['options'][0]['value'] == "v0"
+        assert len(page_parser.get_form_buttons(structure.id)) == 10
+        assert cache.stats()['entries'] == 0 and compact_cache.stats()['entries'] == 1
+
+        # 2. 保存和删除后紧凑缓存失效
+        print("2. 测试缓存失效...")
+        structure.title = "新标题"
+        page_parser.save_page_structure(structure)
+        assert page_parser.load_compact_structure(structure.id).title == "新标题"
+        assert page_parser.delete_page_structure(structure.id)
+        assert page_parser.load_compact_structure(structure.id) is None
+        assert not os.listdir(tmp_dir)
+
+    print("\n✅ 解析器紧凑视图测试通过！")
+
+
+if __name__ == "__main__":
+    test_compact_structure()
+    test_parser_compact_views()
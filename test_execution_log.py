@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+测试分段执行记录日志
+"""
+
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.storage import synthetic_execution
+from cli.app import main
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.test_data import TestExecution
+from utils.execution_log import ExecutionLog
+
+
+def _segments(log_dir):
+    return sorted(name for name in os.listdir(log_dir) if name.startswith('segment_'))
+
+
+def _execution(size, days_ago=0):
+    execution = synthetic_execution(size)
+    execution.start_time -= timedelta(days=days_ago)
+    return execution
+
+
+def test_execution_log():
+    """测试追加、读取、换段、崩溃恢复、保留策略和压缩"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_dir = os.path.join(tmp_dir, "executions")
+        log = ExecutionLog(log_dir, segment_size=20000, compact_ratio=None)
+
+        # 1. 追加和读取，同一ID以最后一次为准
+        print("1. 测试追加和读取...")
+        executions = [_execution(10, days_ago=i) for i in range(12)]
+        for execution in executions:
+            log.append(execution)
+        first = executions[0]
+        first.test_case_name = "已修改"
+        log.append(first)
+        assert log.get(first.id).test_case_name == "已修改" and log.get("missing") is None
+        assert log.get(executions[5].id).model_dump() == executions[5].model_dump()
+        assert len(log) == 12 and len(_segments(log_dir)) > 1
+
+        # 2. 列表只读摘要，不解析记录
+        print("2. 测试摘要...")
+        original = TestExecution.model_validate
+        TestExecution.model_validate = None
+        try:
+            summaries = {summary['id']: summary for summary in log.summaries()}
+        finally:
+            TestExecution.model_validate = original
+        assert summaries[first.id]['test_case_name'] == "已修改" and summaries[first.id]['status'] == "failed"
+
+        # 3. 重新打开：从索引快照和之后追加的行恢复
+        print("3. 测试重新打开...")
+        assert os.path.exists(os.path.join(log_dir, "index.json"))
+        reopened = ExecutionLog(log_dir, segment_size=20000, compact_ratio=None)
+        assert sorted(s['id'] for s in reopened.summaries()) == sorted(summaries)
+        assert reopened.get(executions[11].id).total_steps == 10
+
+        # 4. 崩溃时写了一半的行被忽略，下次追加时截掉
+        print("4. 测试崩溃恢复...")
+        with open(os.path.join(log_dir, _segments(log_dir)[-1]), 'ab') as f:
+            f.write(b'{"op":"put","id":"half","execution":{"id"')
+        recovered = ExecutionLog(log_dir, segment_size=20000, compact_ratio=None)
+        assert len(recovered) == 12
+        recovered.append(_execution(3))
+        assert len(ExecutionLog(log_dir, segment_size=20000, compact_ratio=None)) == 13
+
+        # 5. 其他实例的写入、删除可以读到
+        print("5. 测试多个实例...")
+        assert len(log) == 13
+        assert recovered.delete(first.id) and not recovered.delete(first.id)
+        assert log.get(first.id) is None
+
+        # 6. 保留策略和压缩
+        print("6. 测试保留策略和压缩...")
+        removed = log.prune(max_age=timedelta(days=8, hours=12), now=datetime.now())
+        assert sorted(removed) == sorted(e.id for e in executions[9:])
+        removed = log.prune(max_count=5)
+        assert len(removed) == 4 and executions[1].id in log and executions[8].id not in log
+        before = log.stats()
+        assert before['garbage_ratio'] > 0.5
+        reclaimed = log.compact()
+        after = log.stats()
+        assert reclaimed > 0 and after['total_bytes'] == after['live_bytes'] == before['live_bytes']
+        assert len(_segments(log_dir)) == after['segments']
+        # 压缩前打开的实例读取时重新加载索引
+        assert recovered.get(executions[1].id).id == executions[1].id and len(recovered) == 5
+        assert len(ExecutionLog(log_dir)) == 5
+
+    print("\n✅ 执行记录日志测试通过！")
+
+
+def test_runner_execution_log():
+    """测试测试运行器使用执行记录日志，并导入旧格式的执行记录文件"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        reports_dir = os.path.join(tmp_dir, "reports")
+        os.makedirs(reports_dir)
+        legacy = _execution(4)
+        legacy.save_to_file(os.path.join(reports_dir, f"{legacy.id}.json"))
+        with open(os.path.join(reports_dir, "report_x_20240101_000000.json"), 'w') as f:
+            f.write("{}")
+
+        # 1. 创建运行器不改动旧文件；migrate 命令导入旧格式执行记录，报告文件不受影响，可重复执行
+        print("1. 测试导入旧格式...")
+        runner = TestRunner(reports_dir, test_generator=TestGenerator(os.path.join(tmp_dir, "cases")))
+        assert runner.load_execution(legacy.id) is None and os.path.exists(os.path.join(reports_dir, f"{legacy.id}.json"))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert main(['migrate', '--reports-dir', reports_dir]) == 0
+            assert main(['migrate', '--reports-dir', reports_dir]) == 0
+        assert "导入旧格式执行记录 1 条" in output.getvalue() and "导入旧格式执行记录 0 条" in output.getvalue()
+        assert sorted(os.listdir(reports_dir)) == ["executions", "report_x_20240101_000000.json"]
+        assert runner.load_execution(legacy.id).total_steps == 4
+
+        # 中途崩溃（原文件未删除）后重新导入不会重复追加
+        legacy.save_to_file(os.path.join(reports_dir, f"{legacy.id}.json"))
+        assert runner.execution_log.import_legacy(reports_dir) == 0 and len(runner.execution_log) == 1
+        assert sorted(os.listdir(reports_dir)) == ["executions", "report_x_20240101_000000.json"]
+
+        # 2. 保存、列表、统计、删除
+        print("2. 测试运行器接口...")
+        execution = _execution(6)
+        execution.start_time = legacy.start_time + timedelta(seconds=1)
+        runner.save_execution(execution)
+        rows = runner.list_executions()['rows']
+        assert [row[0] for row in rows] == [execution.id, legacy.id]
+        assert rows[0][3] == "failed" and rows[0][4] == execution.start_time.strftime('%Y-%m-%d %H:%M:%S')
+        assert runner.get_execution_statistics()['failed_executions'] == 2
+        assert runner.delete_execution(legacy.id) and runner.load_execution(legacy.id) is None
+
+        # 3. 命令行压缩
+        print("3. 测试 compact 命令...")
+        runner.save_execution(_execution(2))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert main(['compact', '--keep', '1', '--reports-dir', reports_dir]) == 0
+        assert "删除 1 条执行记录" in output.getvalue() and len(runner.list_executions()['rows']) == 1
+        assert main(['compact', '--keep', '-1', '--reports-dir', reports_dir]) == 4
+
+    print("\n✅ 运行器执行记录日志测试通过！")
+
+
+if __name__ == "__main__":
+    test_execution_log()
+    test_runner_execution_log()
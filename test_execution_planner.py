@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+测试执行计划的等价测试数据去重
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.execution_planner import ExecutionPlanner, FormPlan
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.page_node import PageNode, NodeType
+from models.test_case import TestCase, TestData, TestType, TestPriority
+from models.test_data import TestStatus as ExecutionTestStatus
+from utils.object_cache import ObjectCache
+from utils.playwright_utils import PlaywrightUtils
+
+
+def test_execution_planner():
+    """测试等价键的判定和去重统计"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_generator = TestGenerator(tmp_dir, cache=ObjectCache())
+        nodes = [
+            PageNode(id="username", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"username\"]",
+                     attributes={"id": "username", "type": "text"}, page_url="https://example.com"),
+            PageNode(id="email", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"email\"]",
+                     attributes={"id": "email", "type": "email"}, page_url="https://example.com"),
+        ]
+        test_case = TestCase(id="plan-test", name="去重", description="", test_type=TestType.FUNCTIONAL,
+                             priority=TestPriority.MEDIUM, page_url="https://example.com",
+                             viewpoints=test_generator.generate_viewpoints_for_nodes(nodes, "https://example.com"))
+
+    # 1. 同一节点上不同策略产生的相同输入被合并
+    print("1. 测试去重...")
+    planner = ExecutionPlanner()
+    plan = planner.plan(test_case)
+    assert len(plan.steps) == test_case.get_test_data_count()
+    assert plan.duplicate_count > 0
+    keys_by_node = {}
+    for step in plan.steps:
+        keys_by_node.setdefault(step.key, set()).add(step.viewpoint.target_node.id)
+    # 不同节点的测试数据不会被合并
+    assert all(len(node_ids) == 1 for node_ids in keys_by_node.values())
+
+    # 空字符串在用户名的边界值、等价类、异常测试中各出现一次
+    empty_keys = {step.key for step in plan.steps
+                  if step.viewpoint.target_node.id == "username" and step.test_data.input_value == ""}
+    assert len(empty_keys) == 1
+
+    # 2. 断言或预期值不同则不等价
+    print("2. 测试等价判定...")
+    viewpoint = test_case.viewpoints[1]
+    data = viewpoint.test_data_list[0]
+    same = TestData(id="same", input_value=data.input_value, expected_value=data.expected_value,
+                    assertion_functions=[tuple(a) if isinstance(a, list) else a for a in data.assertion_functions],
+                    description="另一条")
+    other = TestData(id="other", input_value=data.input_value, expected_value="不同的预期值",
+                     assertion_functions=data.assertion_functions, description="另一条")
+    assert planner.equivalence_key(viewpoint, same) == planner.equivalence_key(viewpoint, data)
+    assert planner.equivalence_key(viewpoint, other) != planner.equivalence_key(viewpoint, data)
+
+    # 3. 关闭去重时每条测试数据单独执行
+    print("3. 测试关闭去重...")
+    assert ExecutionPlanner(deduplicate=False).plan(test_case).duplicate_count == 0
+
+    print("\n✅ 执行计划测试通过！")
+
+
+class _FakeFormPage:
+    """模拟 PlaywrightUtils.fill_form：字段值按填写的值回读，记录调用次数"""
+
+    def __init__(self, submitted=True, submit_message=''):
+        self.calls = []
+        self.submitted = submitted
+        self.submit_message = submit_message
+
+    async def fill_form(self, fields, submit=True, submit_selector=None, wait_time=1.0, exact_screenshot=False):
+        self.calls.append((fields, submit, submit_selector))
+        states = {
+            field['selector']: {
+                'value': field['value'] if field['action'] in ('fill', 'select_option') else 'on',
+                'checked': field['action'] == 'check',
+                'visible': True,
+                'enabled': True,
+                'error': None
+            }
+            for field in fields
+        }
+        return {'status': 'success', 'message': '', 'fields': states, 'submitted': submit and self.submitted,
+                'submit_message': self.submit_message, 'screenshot_path': 'form.png'}
+
+
+def test_form_plans():
+    """测试同一表单的字段编成整表单填写计划并校验断言"""
+    url = "https://example.com/login"
+    nodes = [
+        PageNode(id="username", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"username\"]",
+                 attributes={"id": "username", "type": "text"}, parent_id="login", page_url=url),
+        PageNode(id="password", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"password\"]",
+                 attributes={"id": "password", "type": "password"}, parent_id="login", page_url=url),
+        PageNode(id="remember", type=NodeType.CHECKBOX, tag_name="input", xpath="//*[@id=\"remember\"]",
+                 attributes={"id": "remember", "type": "checkbox"}, parent_id="login", page_url=url),
+        PageNode(id="submit", type=NodeType.BUTTON, tag_name="button", xpath="//*[@id=\"submit\"]",
+                 attributes={"id": "submit", "type": "submit"}, parent_id="login", page_url=url),
+        PageNode(id="help", type=NodeType.LINK, tag_name="a", xpath="//*[@id=\"help\"]",
+                 attributes={"id": "help"}, page_url=url),
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_generator = TestGenerator(tmp_dir, cache=ObjectCache())
+        test_case = TestCase(id="form-plan", name="登录", description="", test_type=TestType.FUNCTIONAL,
+                             priority=TestPriority.MEDIUM, page_url=url,
+                             viewpoints=test_generator.generate_viewpoints_for_nodes(nodes, url))
+        runner = TestRunner(tmp_dir, test_generator=test_generator)
+
+    # 1. 表单字段编成若干轮整表单填写，链接单独执行
+    print("1. 测试表单计划编排...")
+    plan = ExecutionPlanner().plan(test_case)
+    form_plans = [unit for unit in plan.units if isinstance(unit, FormPlan)]
+    single_steps = [unit for unit in plan.units if not isinstance(unit, FormPlan)]
+    assert [step.viewpoint.target_node.id for step in single_steps] == ["help"]
+
+    field_steps = [step for step in plan.steps if step.viewpoint.target_node.id in ("username", "password", "remember")]
+    assert len(form_plans) == max(len({s.key for s in field_steps if s.viewpoint.target_node.id == node_id})
+                                  for node_id in ("username", "password"))
+    assert all(len(form_plan.fills) == 3 and form_plan.submit_selector == "#submit" for form_plan in form_plans)
+    members = [planned.key for form_plan in form_plans for planned, _ in form_plan.members]
+    assert len(members) == len(set(members)) == plan.unique_count - len(single_steps)
+
+    # 2. 每轮只调用一次填写，按字段状态校验断言
+    print("2. 测试表单计划执行...")
+    page = _FakeFormPage()
+    results = asyncio.run(runner._execute_form_plan(page, form_plans[0]))
+    assert len(page.calls) == 1 and page.calls[0][1] is True
+    by_node = {planned.viewpoint.target_node.id: result for planned, result in results}
+    assert set(by_node) == {"username", "password", "remember", "submit"}
+    assert all(result.status == ExecutionTestStatus.PASSED for result in by_node.values())
+    assert {a.assertion_type for a in by_node["username"].assertions} == {"element_visible", "element_enabled", "value_equals"}
+    assert by_node["remember"].assertions[-1].assertion_type == "checkbox_checked"
+
+    # 3. 回读的值与预期不一致时失败
+    print("3. 测试断言失败...")
+    state = {'value': 'truncated', 'checked': None, 'visible': True, 'enabled': True, 'error': None}
+    planned, result = results[0]
+    result.assertions = []
+    runner._check_field_assertions(result, planned.test_data, state)
+    assert result.status == ExecutionTestStatus.FAILED
+
+    # 4. 表单未实际提交时提交按钮的测试数据失败，并给出原因
+    print("4. 测试提交失败...")
+    page = _FakeFormPage(submitted=False, submit_message="表单校验未通过: email")
+    by_node = {planned.viewpoint.target_node.id: result
+               for planned, result in asyncio.run(runner._execute_form_plan(page, form_plans[0]))}
+    assert by_node["submit"].status == ExecutionTestStatus.FAILED
+    assert "表单校验未通过: email" in by_node["submit"].error_message
+    assert by_node["username"].status == ExecutionTestStatus.PASSED
+
+    # 5. 关闭表单计划时逐条执行
+    assert not any(isinstance(unit, FormPlan) for unit in ExecutionPlanner(form_plans=False).plan(test_case).units)
+
+    print("\n✅ 表单计划测试通过！")
+
+
+def test_submit_outcome():
+    """测试按页面记录的提交过程判断表单是否实际提交"""
+    outcome = lambda **kwargs: {'attempted': True, 'disabled': False, 'direct': False, 'invalid': [],
+                                'dispatched': True, 'prevented': False, **kwargs}
+
+    # 1. 派发了 submit 事件且未被取消，或页面已跳转
+    print("1. 测试已提交...")
+    assert PlaywrightUtils._submit_outcome(True, outcome(), False, False) == (True, "")
+    assert PlaywrightUtils._submit_outcome(True, None, True, False) == (True, "")
+    assert PlaywrightUtils._submit_outcome(True, outcome(dispatched=False, direct=True), False, False)[0]
+
+    # 2. 按钮不可用、校验未通过、事件被取消都不算提交
+    print("2. 测试未提交...")
+    assert PlaywrightUtils._submit_outcome(False, None, False, False) == (False, "未找到提交按钮或表单")
+    assert PlaywrightUtils._submit_outcome(True, outcome(dispatched=False, disabled=True), False, False) == (False, "提交按钮不可用")
+    submitted, message = PlaywrightUtils._submit_outcome(True, outcome(dispatched=False, invalid=['email']), False, False)
+    assert not submitted and message == "表单校验未通过: email"
+    assert PlaywrightUtils._submit_outcome(True, outcome(prevented=True), False, False) == (False, "提交被页面脚本取消")
+    assert PlaywrightUtils._submit_outcome(True, None, False, False)[0] is False
+
+    # 3. 事件被取消后由页面脚本发出写请求（单页应用）算作提交
+    print("3. 测试脚本提交...")
+    assert PlaywrightUtils._submit_outcome(True, outcome(prevented=True), False, True) == (True, "")
+
+    print("\n✅ 表单提交结果测试通过！")
+
+
+if __name__ == "__main__":
+    test_execution_planner()
+    test_form_plans()
+    test_submit_outcome()
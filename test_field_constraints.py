@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+测试解析时采集的下拉框选项和输入约束
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.test_generator import TestGenerator
+from models.page_node import PageNode, NodeType
+from models.test_case import TestStrategy
+
+
+def _viewpoint_inputs(viewpoints, strategy):
+    return [[td.input_value for td in vp.test_data_list] for vp in viewpoints if vp.strategy == strategy]
+
+
+def test_field_constraints():
+    """测试真实选项、数值范围和长度约束参与测试数据生成"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _check_field_constraints(TestGenerator(tmp_dir))
+
+    print("\n✅ 字段约束测试通过！")
+
+
+def _check_field_constraints(test_generator: TestGenerator):
+
+    # 1. 下拉框使用真实选项，异常测试只选择禁用项和空选项
+    print("1. 测试下拉框真实选项...")
+    select = PageNode(
+        id="city", type=NodeType.SELECT, tag_name="select", xpath="//*[@id=\"city\"]",
+        options=[
+            {"value": "", "text": "请选择", "disabled": False},
+            {"value": "bj", "text": "北京", "disabled": False},
+            {"value": "sh", "text": "上海", "disabled": False},
+            {"value": "gz", "text": "广州", "disabled": True},
+        ],
+        constraints={"required": True}, is_interactive=True, page_url="https://example.com"
+    )
+    viewpoints = test_generator._generate_all_viewpoints_for_node(select, "https://example.com")
+    assert test_generator._get_select_options(select) == ["bj", "sh"]
+    assert _viewpoint_inputs(viewpoints, TestStrategy.EQUIVALENCE) == [["bj", "sh"]]
+    negative = [vp for vp in viewpoints if vp.strategy == TestStrategy.NEGATIVE][0]
+    assert [td.input_value for td in negative.test_data_list] == ["gz", ""]
+    assert "必填" in negative.test_data_list[1].description
+    basic = [vp for vp in viewpoints if vp.strategy == TestStrategy.BASIC][0]
+    assert basic.test_data_list[0].input_value == "bj"
+
+    # 没有禁用项和空选项时不生成异常测试观点
+    select.options = [{"value": "bj", "text": "北京", "disabled": False}]
+    viewpoints = test_generator._generate_all_viewpoints_for_node(select, "https://example.com")
+    assert not [vp for vp in viewpoints if vp.strategy == TestStrategy.NEGATIVE]
+
+    # 2. 数值输入框只有最小值和步长
+    print("2. 测试数值范围...")
+    number = PageNode(id="age", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"age\"]",
+                      attributes={"type": "number"}, constraints={"min": "0.5", "step": "0.5"},
+                      is_interactive=True, page_url="https://example.com")
+    boundary = _viewpoint_inputs(test_generator._generate_all_viewpoints_for_node(number, "https://example.com"),
+                                 TestStrategy.BOUNDARY)[0]
+    assert boundary[:3] == ["0", "0.5", "1"]
+    assert len(boundary) == len(set(boundary))
+
+    # 3. 长度约束替换通用长度测试，pattern 标注是否符合格式
+    print("3. 测试长度和格式约束...")
+    text = PageNode(id="code", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"code\"]",
+                    attributes={"type": "text"},
+                    constraints={"minlength": 2, "maxlength": 4, "pattern": "[a-z]+", "required": True},
+                    is_interactive=True, page_url="https://example.com")
+    viewpoints = test_generator._generate_all_viewpoints_for_node(text, "https://example.com")
+    boundary = _viewpoint_inputs(viewpoints, TestStrategy.BOUNDARY)[0]
+    assert boundary[:6] == ["", "a", "aa", "aaa", "aaaa", "aaaaa"]
+    assert "a" * 1000 not in boundary
+    equivalence = [vp for vp in viewpoints if vp.strategy == TestStrategy.EQUIVALENCE][0]
+    assert all("格式" in td.description for td in equivalence.test_data_list if td.input_value)
+
+    # 约束不同的节点不共用模板
+    other = test_generator._copy_node(text)
+    other.constraints = {"maxlength": 8}
+    assert test_generator._template_key(other) != test_generator._template_key(text)
+
+
+if __name__ == "__main__":
+    test_field_constraints()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+测试表单解析只导航一次
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.page_parser import PageParser
+from models.page_node import NodeType
+from utils.object_cache import ObjectCache
+from utils.playwright_utils import PlaywrightUtils
+
+
+def _element(element_id, tag_name, attributes, parent_id=None, **extra):
+    data = {
+        'id': element_id, 'tag_name': tag_name, 'text_content': '', 'xpath': f'//*[@id="{element_id}"]',
+        'css_selector': f'#{element_id}', 'attributes': attributes, 'is_visible': True, 'is_interactive': True,
+        'size': {'width': 100, 'height': 20}, 'position': {'x': 0, 'y': 0}, 'parent_id': parent_id, 'children': []
+    }
+    data.update(extra)
+    return data
+
+
+class FakePage:
+    """记录导航、截图和页面脚本调用次数的假页面"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def goto(self, url):
+        self.calls.append('goto')
+
+    async def title(self):
+        self.calls.append('title')
+        return "登录页"
+
+    async def screenshot(self, path=None):
+        self.calls.append('screenshot')
+        return b'\x89PNG'
+
+    async def evaluate(self, script, with_forms=True):
+        self.calls.append('evaluate')
+        self.with_forms = with_forms
+        return {
+            'title': "登录页",
+            'forms': [] if not with_forms else [{'formId': 'login', 'formName': '', 'formAction': '/login', 'formMethod': 'post',
+                       'formEnctype': 'application/x-www-form-urlencoded',
+                       'formFields': [{'id': 'user', 'name': 'user', 'type': 'text'}],
+                       'formButtons': [{'id': 'go', 'name': '', 'type': 'submit', 'text': '登录'}]}],
+            'elements': [
+                _element('login', 'form', {'action': '/login', 'method': 'post'}),
+                _element('user', 'input', {'type': 'text'}, 'login', constraints={'required': True}),
+                _element('go', 'button', {'type': 'submit'}, 'login'),
+            ]
+        }
+
+
+class FakePlaywrightUtils(PlaywrightUtils):
+    async def start_browser(self, headless: bool = False, storage_state=None):
+        self.page = FakePage()
+
+    async def close_browser(self):
+        pass
+
+
+def test_form_page():
+    """测试表单结构和节点在一次导航、一次提取中得到"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page_parser = PageParser(os.path.join(tmp_dir, "page_nodes"), cache=ObjectCache())
+        page_parser._playwright_utils = FakePlaywrightUtils()
+
+        # 1. 解析表单只导航一次、截图一次、提取一次
+        print("1. 测试单次导航...")
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            structure = asyncio.run(page_parser.parse_forms_from_url("https://example.com/login"))
+        finally:
+            os.chdir(cwd)
+        assert page_parser.playwright_utils.page.calls == ['goto', 'screenshot', 'evaluate']
+        # 表单结构信息用不到，不在浏览器中收集
+        assert page_parser.playwright_utils.page.with_forms is False
+        assert structure.title == "表单结构 - 登录页"
+        assert [node.type for node in structure.nodes] == [NodeType.FORM, NodeType.INPUT, NodeType.BUTTON]
+        assert page_parser.load_page_structure(structure.id).nodes[1].constraints == {'required': True}
+
+        # 2. 表单结构信息与节点来自同一次提取
+        print("2. 测试表单结构信息...")
+        utils = FakePlaywrightUtils()
+        asyncio.run(utils.start_browser())
+        form_structure = asyncio.run(utils.extract_form_structure("https://example.com/login"))
+        assert utils.page.calls == ['goto', 'evaluate'] and utils.page.with_forms is True
+        assert form_structure['title'] == "登录页"
+        assert form_structure['forms'][0]['formFields'][0]['id'] == structure.nodes[1].id
+
+    print("\n✅ 表单单次导航测试通过！")
+
+
+if __name__ == "__main__":
+    test_form_page()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+测试测试数据模板复用和批量生成
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.page_parser import PageParser
+from core.test_generator import TestGenerator
+from models.page_node import PageStructure, PageNode, NodeType
+from models.test_case import TestStrategy
+from utils.object_cache import ObjectCache
+
+
+def _make_nodes(count: int):
+    node_types = [NodeType.INPUT, NodeType.SELECT, NodeType.BUTTON, NodeType.LINK]
+    input_types = ["text", "email", "number"]
+    return [
+        PageNode(id=f"node_{i}", type=node_types[i % len(node_types)], tag_name="input",
+                 xpath=f"//*[@id=\"node_{i}\"]", attributes={"type": input_types[i % len(input_types)]},
+                 is_interactive=True, page_url="https://example.com")
+        for i in range(count)
+    ]
+
+
+def test_generation_templates():
+    """测试模板复用后的生成结果、ID唯一性和批量生成耗时"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ObjectCache()
+        page_parser = PageParser(os.path.join(tmp_dir, "page_nodes"), cache=cache)
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"), page_parser=page_parser, cache=cache)
+
+        # 1. 每种节点生成的观点和数据
+        print("1. 测试生成结果...")
+        nodes = _make_nodes(4)
+        viewpoints = test_generator.generate_viewpoints_for_nodes(nodes, "https://example.com")
+        by_node = {}
+        for viewpoint in viewpoints:
+            by_node.setdefault(viewpoint.target_node.id, []).append(viewpoint)
+        strategies = [TestStrategy.BASIC, TestStrategy.BOUNDARY, TestStrategy.EQUIVALENCE, TestStrategy.NEGATIVE]
+        assert [v.strategy for v in by_node["node_0"]] == strategies
+        assert [v.strategy for v in by_node["node_1"]] == strategies
+        assert [v.strategy for v in by_node["node_2"]] == [TestStrategy.BASIC]
+        assert by_node["node_0"][1].name == "input边界值测试"
+        assert by_node["node_0"][1].test_data_list[0].description.startswith("边界值测试: ")
+
+        # 2. 相同签名的节点共用模板，但测试数据互不影响
+        print("2. 测试模板复用...")
+        twins = test_generator.generate_viewpoints_for_nodes(_make_nodes(16)[12:], "https://example.com")
+        assert len(test_generator._templates) == 4
+        assert [len(v.test_data_list) for v in twins] == [len(v.test_data_list) for v in viewpoints]
+        twins[0].test_data_list[0].assertion_functions.append("extra")
+        assert "extra" not in viewpoints[0].test_data_list[0].assertion_functions
+        # 断言参数也不共享：修改一条测试数据的 value_equals 参数不影响其他测试数据
+        name, params = twins[1].test_data_list[0].assertion_functions[2]
+        assert name == "value_equals"
+        params["expected"] = "changed"
+        assert twins[1].test_data_list[1].assertion_functions[2][1]["expected"] != "changed"
+        assert viewpoints[1].test_data_list[0].assertion_functions[2][1]["expected"] != "changed"
+
+        # 3. ID唯一
+        print("3. 测试ID唯一...")
+        ids = [v.id for v in viewpoints + twins] + [d.id for v in viewpoints + twins for d in v.test_data_list]
+        assert len(ids) == len(set(ids))
+
+        # 4. 批量生成10000个节点
+        print("4. 测试批量生成...")
+        nodes = _make_nodes(10000)
+        page_parser.save_page_structure(PageStructure(id="bulk", url="https://example.com", title="批量", nodes=nodes))
+        # 之前的测试留下的对象不计入：冻结后循环垃圾回收只扫描本次生成的对象
+        gc.collect()
+        gc.freeze()
+        try:
+            start = time.perf_counter()
+            test_case = test_generator.generate_test_case_from_nodes("bulk", [node.id for node in nodes], "批量用例")
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.unfreeze()
+        print(f"   {len(test_case.viewpoints)} 个测试观点，耗时 {elapsed:.3f}s")
+        assert len(test_case.viewpoints) == 25000
+        assert elapsed < 1.0
+
+        # 生成的节点是副本，不影响缓存中的页面结构
+        test_case.viewpoints[0].target_node.attributes["type"] = "changed"
+        assert page_parser.load_page_structure("bulk", shared=True).nodes[0].attributes["type"] == "text"
+
+    print("\n✅ 测试数据模板测试通过！")
+
+
+def test_bulk_generation():
+    """测试多个页面结构的批量生成、进度回调和错误汇总"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ObjectCache()
+        page_parser = PageParser(os.path.join(tmp_dir, "page_nodes"), cache=cache)
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"), page_parser=page_parser, cache=cache)
+        structure_ids = [f"page_{i}" for i in range(5)]
+        for structure_id in structure_ids:
+            page_parser.save_page_structure(PageStructure(id=structure_id, url="https://example.com",
+                                                          title=structure_id, nodes=_make_nodes(8)))
+        page_parser.save_page_structure(PageStructure(id="empty", url="https://example.com", title="空页面", nodes=[]))
+
+        for max_workers in (1, 2):
+            print(f"{max_workers} 个进程批量生成...")
+            progress = []
+            summary = test_generator.generate_test_cases_for_structures(
+                structure_ids + ["empty", "missing"], max_workers=max_workers, batch_size=2,
+                progress_callback=lambda done, total, structure_id, error: progress.append((done, total)))
+
+            assert summary['succeeded'] == 5 and summary['failed'] == 2
+            assert set(summary['errors']) == {"empty", "missing"}
+            assert sorted(progress) == [(i, 7) for i in range(1, 8)]
+            for structure_id, test_case_id in summary['test_case_ids'].items():
+                test_case = test_generator.load_test_case(test_case_id, shared=True)
+                assert test_case.name == f"{structure_id}测试用例"
+                assert len(test_case.viewpoints) == 20
+
+        assert len(test_generator.list_test_cases()['rows']) == 10
+
+        # 写入文件失败不会被当作无法创建进程池而改为串行重新生成
+        print("写入失败...")
+        write_batch = test_generator._write_test_case_batch
+        failures = []
+
+        def fail_once(batch):
+            if not failures:
+                failures.append(len(batch))
+                raise OSError("磁盘已满")
+            write_batch(batch)
+
+        test_generator._write_test_case_batch = fail_once
+        try:
+            test_generator.generate_test_cases_for_structures(structure_ids, max_workers=2, batch_size=2)
+            raise AssertionError("写入失败应抛出异常")
+        except OSError as e:
+            assert str(e) == "磁盘已满" and failures == [2]
+        finally:
+            test_generator._write_test_case_batch = write_batch
+
+    print("\n✅ 批量生成测试通过！")
+
+
+if __name__ == "__main__":
+    test_generation_templates()
+    test_bulk_generation()
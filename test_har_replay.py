@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+测试按测试用例录制和回放网络流量
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.test_case import TestCase, TestType, TestPriority
+from models.test_data import TestStatus
+from utils.network_utils import HarConfig, HarMode
+from fake_playwright import FakePlaywrightUtils, use_fake_playwright
+
+
+class _FakePlaywrightUtils(FakePlaywrightUtils):
+    """记录 HAR 调用的假浏览器工具"""
+    har_calls = []
+
+    async def use_har(self, har_path, update=False, strict=False, url=None):
+        self.har_calls.append((os.path.basename(har_path), update, strict))
+        if update:
+            # 录制文件在关闭浏览器上下文时写入
+            Path(har_path).write_bytes(b'har')
+
+
+def test_har_config():
+    """测试各模式下实际使用的录制回放方式"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        har_dir = os.path.join(tmp_dir, "har")
+
+        # 1. 录制、自动和关闭
+        print("1. 测试模式解析...")
+        assert HarConfig().resolve("case") == (HarMode.OFF, None)
+        assert HarConfig(HarMode.AUTO, har_dir).resolve("case")[0] == HarMode.RECORD
+        assert os.path.isdir(har_dir)
+        Path(HarConfig(har_dir=har_dir).har_path("case")).write_bytes(b'har')
+        assert HarConfig(HarMode.AUTO, har_dir).resolve("case")[0] == HarMode.REPLAY
+        assert HarConfig(HarMode.RECORD, har_dir).resolve("case")[0] == HarMode.RECORD
+
+        # 2. 回放时没有录制文件
+        print("2. 测试回放回退...")
+        assert HarConfig(HarMode.REPLAY, har_dir).resolve("other") == (HarMode.OFF, None)
+        try:
+            HarConfig(HarMode.REPLAY, har_dir, fallback_to_live=False).resolve("other")
+            assert False
+        except FileNotFoundError:
+            pass
+
+    print("\n✅ HAR 配置测试通过！")
+
+
+def test_har_runner():
+    """测试运行器第一次录制、之后回放"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"))
+        test_generator.save_test_case(TestCase(id="case-har", name="HAR用例", description="", test_type=TestType.FUNCTIONAL,
+                                               priority=TestPriority.MEDIUM, page_url="https://example.com/", viewpoints=[]))
+        har_config = HarConfig(HarMode.AUTO, os.path.join(tmp_dir, "har"), strict=True)
+        runner = TestRunner(os.path.join(tmp_dir, "reports"), test_generator=test_generator, har_config=har_config)
+
+        _FakePlaywrightUtils.har_calls = []
+        with use_fake_playwright(_FakePlaywrightUtils):
+            print("1. 测试录制后回放...")
+            first = asyncio.run(runner.run_test_case("case-har"))
+            second = asyncio.run(runner.run_test_case("case-har"))
+
+        assert first.status == TestStatus.PASSED and second.status == TestStatus.PASSED
+        assert first.environment_info["har_mode"] == "record"
+        assert second.environment_info["har_mode"] == "replay"
+        assert _FakePlaywrightUtils.har_calls == [("case-har.har.zip", True, True), ("case-har.har.zip", False, True)]
+
+    print("\n✅ HAR 录制回放测试通过！")
+
+
+if __name__ == "__main__":
+    test_har_config()
+    test_har_runner()
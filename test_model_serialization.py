@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+测试模型的序列化和反序列化
+"""
+
+import json
+import os
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.storage import synthetic_page_structure, synthetic_test_case, synthetic_execution
+from models.page_node import PageNode, PageStructure, PageNodeList
+from models.test_case import TestCase
+from models.test_data import TestExecution
+
+
+def test_model_serialization():
+    """测试保存加载往返一致、兼容旧文件、不使用已弃用的接口"""
+    with tempfile.TemporaryDirectory() as tmp_dir, warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+
+        # 1. 保存后加载与原模型一致
+        print("1. 测试保存和加载...")
+        for model in [synthetic_page_structure(30), synthetic_test_case(30), synthetic_execution(30)]:
+            path = os.path.join(tmp_dir, f"{type(model).__name__}.json")
+            model.save_to_file(path)
+            loaded = type(model).load_from_file(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                assert loaded.to_dict() == json.load(f)
+
+        # 2. 时间为ISO字符串，中文不转义，坐标取整
+        print("2. 测试字典格式...")
+        structure = synthetic_page_structure(3)
+        data = structure.to_dict()
+        assert data['created_at'] == structure.created_at.isoformat() and data['updated_at'] is None
+        assert data['nodes'][0]['created_at'] == structure.nodes[0].created_at.isoformat()
+        assert "节点" in structure.to_json()
+        assert PageNode(id="a", type="div", tag_name="div", xpath="/a", page_url="u",
+                        position={'x': 1.7}).position == {'x': 1}
+
+        # 3. 旧文件缺少 updated_at、options、constraints 时取默认值
+        print("3. 测试旧格式文件...")
+        old = structure.to_dict()
+        del old['updated_at']
+        for node in old['nodes']:
+            del node['options'], node['constraints']
+        path = os.path.join(tmp_dir, "old.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(old, f, ensure_ascii=False)
+        loaded = PageStructure.load_from_file(path)
+        assert loaded.updated_at is None and loaded.nodes[1].options == []
+
+        # 4. 测试用例的目标节点批量校验为 PageNode
+        print("4. 测试目标节点批量校验...")
+        test_case = TestCase.from_dict(synthetic_test_case(25).to_dict())
+        assert all(isinstance(viewpoint.target_node, PageNode) for viewpoint in test_case.viewpoints)
+        assert PageNodeList.validate_python(data['nodes'])[2].id == structure.nodes[2].id
+        execution = synthetic_execution(5)
+        assert TestExecution.model_validate_json(execution.model_dump_json()).step_results == execution.step_results
+
+    print("\n✅ 模型序列化测试通过！")
+
+
+if __name__ == "__main__":
+    test_model_serialization()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+测试浏览器网络路由：资源拦截和静态资源磁盘缓存
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from utils.network_utils import NetworkConfig, NetworkRouter, StaticAssetCache
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, method='GET'):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    """记录路由处理结果的假路由，fetch 返回预设的响应"""
+
+    def __init__(self, request, response=None):
+        self.request = request
+        self.response = response
+        self.outcome = None
+        self.fulfilled = None
+
+    async def abort(self, error_code=None):
+        self.outcome = 'abort'
+
+    async def continue_(self):
+        self.outcome = 'continue'
+
+    async def fetch(self):
+        self.outcome = 'fetch'
+        return self.response
+
+    async def fulfill(self, status=None, headers=None, body=None, response=None):
+        self.outcome = 'fetch+fulfill' if self.outcome == 'fetch' else 'cache'
+        self.fulfilled = (status or response.status, body)
+
+
+def _route(router, url, resource_type, headers=None, body=b'body'):
+    route = FakeRoute(FakeRequest(url, resource_type), FakeResponse(200, headers or {}, body))
+    asyncio.run(router.handle(route))
+    return route
+
+
+def test_network_router():
+    """测试资源拦截、缓存命中、不可缓存响应和跨实例共享"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = NetworkConfig(blocked_resource_types=['media'], blocked_hosts=['tracker.com'], cache_dir=tmp_dir)
+        router = NetworkRouter(config)
+
+        # 1. 按资源类型和主机（含子域名）拦截
+        print("1. 测试资源拦截...")
+        assert _route(router, "https://example.com/video.mp4", "media").outcome == 'abort'
+        assert _route(router, "https://cdn.tracker.com/t.js", "script").outcome == 'abort'
+        assert _route(router, "https://nottracker.com/t.js", "script").outcome != 'abort'
+        assert _route(router, "https://example.com/", "document").outcome == 'continue'
+        assert router.blocked == 2
+
+        # 2. 静态资源第一次从网络获取，之后从缓存返回
+        print("2. 测试静态资源缓存...")
+        headers = {'Content-Type': 'text/css', 'Content-Encoding': 'gzip', 'Cache-Control': 'max-age=600'}
+        assert _route(router, "https://example.com/app.css", "stylesheet", headers, b'body{}').outcome == 'fetch+fulfill'
+        route = _route(router, "https://example.com/app.css", "stylesheet")
+        assert route.outcome == 'cache' and route.fulfilled == (200, b'body{}')
+        status, cached_headers, _ = router.cache.get("https://example.com/app.css")
+        assert 'content-encoding' not in cached_headers and cached_headers['content-type'] == 'text/css'
+
+        # 3. 不可缓存的响应每次都从网络获取
+        print("3. 测试不可缓存响应...")
+        for _ in range(2):
+            route = _route(router, "https://example.com/user.js", "script", {'Cache-Control': 'no-store'})
+            assert route.outcome == 'fetch+fulfill'
+
+        # 4. 缓存目录在路由器实例之间共享，过期后失效
+        print("4. 测试共享和过期...")
+        other = NetworkRouter(NetworkConfig(cache_dir=tmp_dir))
+        assert _route(other, "https://example.com/app.css", "stylesheet").outcome == 'cache'
+        cache = StaticAssetCache(tmp_dir)
+        cache.put("https://example.com/old.png", 200, {'Cache-Control': 'max-age=1'}, b'png')
+        assert cache.get("https://example.com/old.png") is not None
+        time.sleep(1.1)
+        assert cache.get("https://example.com/old.png") is None
+        assert router.stats()['stores'] == 2
+
+    print("\n✅ 网络路由测试通过！")
+
+
+if __name__ == "__main__":
+    test_network_router()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+测试页面结构的节点索引
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.page_parser import PageParser
+from models.page_node import PageStructure, PageNode, NodeType
+from utils.object_cache import ObjectCache
+
+
+def _linear_search(nodes, keyword):
+    keyword_lower = keyword.lower()
+    return [
+        node for node in nodes
+        if (node.text_content and keyword_lower in node.text_content.lower()) or
+           (node.xpath and keyword_lower in node.xpath.lower()) or
+           (node.css_selector and keyword_lower in node.css_selector.lower())
+    ]
+
+
+def test_node_index():
+    """测试索引查询结果与线性扫描一致"""
+    node_types = [NodeType.FORM, NodeType.INPUT, NodeType.SELECT, NodeType.BUTTON]
+    nodes = []
+    for i in range(500):
+        nodes.append(PageNode(
+            id=f"node_{i}",
+            type=node_types[i % len(node_types)],
+            tag_name="input",
+            text_content=f"用户名 Field{i}",
+            xpath=f"/html/body/form[{i // 50}]/input[{i}]",
+            css_selector=f"input[name=\"field{i}\"]",
+            parent_id=None if i % 50 == 0 else f"node_{i - i % 50}",
+            page_url="https://example.com"
+        ))
+    structure = PageStructure(id="index-test", url="https://example.com", title="索引测试", nodes=nodes)
+
+    # 1. 搜索结果与线性扫描一致（包括短关键词和跨字段关键词）
+    print("1. 测试搜索...")
+    for keyword in ["", "field12", "FIELD1", "用户", "in", "form[3]/input", "名 f", "not-found", "]\"f"]:
+        assert structure.search_nodes(keyword) == _linear_search(nodes, keyword), keyword
+
+    # 2. 按ID、类型和父子关系查询
+    print("2. 测试ID、类型和层级查询...")
+    assert structure.get_node("node_42") is nodes[42]
+    assert structure.get_node("missing") is None
+    assert structure.get_nodes_by_ids(["node_9", "node_3", "missing"]) == [nodes[3], nodes[9]]
+    assert structure.get_nodes_by_type(NodeType.SELECT) == [n for n in nodes if n.type == NodeType.SELECT]
+    assert structure.get_nodes_by_type("select") == structure.get_nodes_by_type(NodeType.SELECT)
+    assert len(structure.get_children(None)) == 10
+    assert structure.get_children("node_50") == nodes[51:100]
+
+    # 3. 增加节点后索引自动重建
+    print("3. 测试索引失效...")
+    extra = PageNode(id="extra", type=NodeType.BUTTON, tag_name="button", text_content="新增按钮",
+                     xpath="//*[@id=\"extra\"]", page_url="https://example.com")
+    structure.nodes.append(extra)
+    assert structure.get_node("extra") is extra
+    assert structure.search_nodes("新增按钮") == [extra]
+
+    # 就地修改节点需要手动失效
+    extra.text_content = "修改后的按钮"
+    structure.invalidate_index()
+    assert structure.search_nodes("修改后") == [extra]
+
+    # 同样长度的就地替换和重新赋值的节点列表也会使索引失效
+    replacement = extra.model_copy(update={"id": "replaced", "text_content": "替换按钮"})
+    structure.nodes[-1] = replacement
+    assert structure.get_node("extra") is None and structure.search_nodes("替换按钮") == [replacement]
+    structure.nodes = nodes + [extra]
+    assert structure.get_node("extra") is extra
+    structure.nodes[-1] = replacement
+    assert structure.get_node("replaced") is replacement
+
+    # 空关键词不匹配所有字段都为空的节点
+    blank = PageNode(id="blank", type=NodeType.DIV, tag_name="div", xpath="", page_url="https://example.com")
+    assert PageStructure(id="blank", url="https://example.com", title="空", nodes=[blank, extra]).search_nodes("") == [extra]
+
+    print("\n✅ 节点索引测试通过！")
+
+
+def test_lazy_hierarchy():
+    """测试深层DOM的迭代建树和按层展开"""
+    depth = 3000  # 超过默认递归深度
+    nodes = [
+        PageNode(id=f"div_{i}", type=NodeType.DIV, tag_name="div", xpath=f"/div[{i}]",
+                 parent_id=f"div_{i - 1}" if i else None, page_url="https://example.com")
+        for i in range(depth)
+    ]
+    # 自引用和指回祖先的 children 不应导致死循环
+    nodes[-1].children = [nodes[-1].id, "div_0"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page_parser = PageParser(tmp_dir, cache=ObjectCache())
+        page_parser.save_page_structure(PageStructure(id="deep", url="https://example.com", title="深层结构", nodes=nodes))
+
+        # 1. 完整层级
+        print("1. 测试完整层级...")
+        tree_node = page_parser.get_node_hierarchy("deep")['root_nodes'][0]
+        levels = 1
+        while tree_node['children']:
+            tree_node = tree_node['children'][0]
+            levels += 1
+        assert levels == depth
+
+        # 2. 只返回根节点，子节点按需展开
+        print("2. 测试按层展开...")
+        roots = page_parser.get_node_hierarchy("deep", max_depth=1)['root_nodes']
+        assert [(r['id'], r['children'], r['child_count']) for r in roots] == [("div_0", [], 1)]
+        level = page_parser.get_node_children("deep", "div_0")
+        assert level['total'] == 1 and level['nodes'][0]['id'] == "div_1"
+        assert page_parser.get_node_children("deep", None, limit=1)['nodes'][0]['id'] == "div_0"
+
+    print("\n✅ 层级展开测试通过！")
+
+
+if __name__ == "__main__":
+    test_node_index()
+    test_lazy_hierarchy()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+测试页面结构和测试用例的对象缓存
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.page_parser import PageParser
+from core.test_generator import TestGenerator
+from models.page_node import PageStructure, PageNode, NodeType
+from models.test_case import TestCase, TestData
+from utils.object_cache import ObjectCache
+
+
+def _make_structure(structure_id: str) -> PageStructure:
+    nodes = [
+        PageNode(id="username", type=NodeType.INPUT, tag_name="input", xpath="//*[@id=\"username\"]",
+                 attributes={"type": "text"}, is_interactive=True, page_url="https://example.com"),
+        PageNode(id="submit", type=NodeType.BUTTON, tag_name="button", text_content="提交",
+                 xpath="//*[@id=\"submit\"]", is_interactive=True, page_url="https://example.com"),
+    ]
+    return PageStructure(id=structure_id, url="https://example.com", title="缓存测试", nodes=nodes)
+
+
+def test_object_cache():
+    """测试缓存命中、写穿、外部修改失效和删除失效"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ObjectCache(max_entries=2)
+        page_parser = PageParser(os.path.join(tmp_dir, "page_nodes"), cache=cache)
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"), page_parser=page_parser, cache=cache)
+
+        # 1. 保存后直接命中缓存
+        print("1. 测试写穿缓存...")
+        page_parser.save_page_structure(_make_structure("s1"))
+        assert len(page_parser.get_interactive_nodes("s1")) == 2
+        assert len(page_parser.search_nodes("s1", "提交")) == 1
+        assert cache.misses == 0 and cache.hits == 2
+
+        # 2. 默认返回副本，修改不影响缓存
+        print("2. 测试副本隔离...")
+        structure = page_parser.load_page_structure("s1")
+        structure.nodes.clear()
+        assert len(page_parser.load_page_structure("s1", shared=True).nodes) == 2
+
+        # 3. 文件被外部修改后重新加载
+        print("3. 测试文件修改失效...")
+        time.sleep(0.01)
+        external = _make_structure("s1")
+        external.title = "外部修改"
+        external.save_to_file(os.path.join(page_parser.data_dir, "s1.json"))
+        assert page_parser.load_page_structure("s1", shared=True).title == "外部修改"
+
+        # 4. 测试用例CRUD只解析一次文件
+        print("4. 测试用例增删改...")
+        test_case = test_generator.generate_test_case_from_nodes("s1", ["username"], "缓存用例")
+        test_generator.save_test_case(test_case)
+        viewpoint = test_case.viewpoints[0]
+        misses = cache.misses
+        test_generator.add_test_data_to_viewpoint(test_case.id, viewpoint.id, TestData(
+            id="extra", input_value="x", expected_value="x", assertion_functions=[], description="额外数据"))
+        test_generator.remove_test_data_from_viewpoint(test_case.id, viewpoint.id, viewpoint.test_data_list[0].id)
+        assert cache.misses == misses
+        reloaded = TestGenerator(test_generator.data_dir, cache=ObjectCache()).load_test_case(test_case.id)
+        assert [td.id for td in reloaded.get_viewpoint(viewpoint.id).test_data_list] == ["extra"]
+
+        # 修改在副本上进行，写入失败时共享实例和缓存保持原样
+        shared = test_generator.load_test_case(test_case.id, shared=True)
+
+        def fail_save(self, filepath):
+            raise OSError("磁盘已满")
+
+        save_to_file = TestCase.save_to_file
+        TestCase.save_to_file = fail_save
+        try:
+            test_generator.remove_viewpoint_from_test_case(test_case.id, viewpoint.id)
+            raise AssertionError("写入失败应抛出异常")
+        except OSError:
+            pass
+        finally:
+            TestCase.save_to_file = save_to_file
+        assert shared.get_viewpoint(viewpoint.id) is not None
+        assert test_generator.load_test_case(test_case.id, shared=True).get_viewpoint(viewpoint.id) is not None
+        test_generator.remove_viewpoint_from_test_case(test_case.id, viewpoint.id)
+        assert shared.get_viewpoint(viewpoint.id) is not None
+        assert test_generator.load_test_case(test_case.id, shared=True).get_viewpoint(viewpoint.id) is None
+
+        # 5. 删除后失效，超出容量时淘汰
+        print("5. 测试删除和淘汰...")
+        assert test_generator.delete_test_case(test_case.id)
+        assert test_generator.load_test_case(test_case.id) is None
+        for structure_id in ["s2", "s3", "s4"]:
+            page_parser.save_page_structure(_make_structure(structure_id))
+        assert cache.stats()["entries"] == 2
+
+    print("\n✅ 对象缓存测试通过！")
+
+
+if __name__ == "__main__":
+    test_object_cache()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+测试截图和执行记录的保留策略与回收
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.storage import synthetic_execution, synthetic_page_structure
+from cli.app import main
+from core.page_parser import PageParser
+from core.retention import RetentionManager, RetentionPolicy
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from utils.screenshot_store import ScreenshotStore
+
+
+def _screenshot(directory, name, size=100, age=0):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG' + b'0' * (size - 4))
+    if age:
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _execution(screenshots, days_ago=0):
+    execution = synthetic_execution(len(screenshots))
+    execution.start_time -= timedelta(days=days_ago)
+    for step, path in zip(execution.step_results, screenshots):
+        step.screenshot_path = path
+    return execution
+
+
+def _setup(tmp_dir):
+    screenshot_dir = os.path.join(tmp_dir, "screenshots")
+    os.makedirs(screenshot_dir)
+    page_parser = PageParser(os.path.join(tmp_dir, "pages"))
+    generator = TestGenerator(os.path.join(tmp_dir, "cases"), page_parser=page_parser)
+    runner = TestRunner(os.path.join(tmp_dir, "reports"), test_generator=generator)
+    runner.retention.screenshot_dir = screenshot_dir
+    return runner, page_parser, screenshot_dir
+
+
+def test_release_on_delete():
+    """测试删除执行记录时删除只被它引用的截图"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        runner, page_parser, screenshot_dir = _setup(tmp_dir)
+        own = _screenshot(screenshot_dir, "step_own.png", age=7200)
+        shared = _screenshot(screenshot_dir, "step_shared.png", age=7200)
+        page = _screenshot(screenshot_dir, "page.png", age=7200)
+        structure = synthetic_page_structure(3)
+        structure.screenshot_path = page
+        page_parser.save_page_structure(structure)
+        first, second = _execution([own, shared, page]), _execution([shared])
+        runner.save_execution(first)
+        runner.save_execution(second)
+
+        # 1. 只删除不再被引用的截图
+        print("1. 测试删除执行记录...")
+        assert runner.delete_execution(first.id) and not runner.delete_execution(first.id)
+        assert not os.path.exists(own) and os.path.exists(shared) and os.path.exists(page)
+
+        # 2. 最后一个引用删除后截图也被删除
+        print("2. 测试共享截图...")
+        assert runner.delete_execution(second.id)
+        assert not os.path.exists(shared) and os.path.exists(page)
+        assert runner.retention.total_reclaimed == 200
+
+        # 3. 运行中的用例刚重复使用的截图（尚无执行记录引用）在宽限期内不删除
+        print("3. 测试重复使用的截图...")
+        store = ScreenshotStore(screenshot_dir)
+        reused = store.put(b'\x89PNG reused')
+        old = time.time() - 7200
+        os.utime(reused, (old, old))
+        saved = _execution([reused])
+        runner.save_execution(saved)
+        assert store.put(b'\x89PNG reused') == reused
+        assert runner.delete_execution(saved.id)
+        assert os.path.exists(reused)
+        assert runner.retention.collect().screenshots_removed == 0 and os.path.exists(reused)
+
+    print("\n✅ 删除执行记录回收截图测试通过！")
+
+
+def test_collect():
+    """测试按保留策略回收，报告回收的字节数"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        runner, _, screenshot_dir = _setup(tmp_dir)
+        retention = runner.retention
+        old_orphan = _screenshot(screenshot_dir, "old_orphan.png", 300, age=7200)
+        new_orphan = _screenshot(screenshot_dir, "new_orphan.png", 300)
+        expired = _screenshot(screenshot_dir, "expired.png", 500, age=7200)
+        released_recently = _screenshot(screenshot_dir, "released_recently.png", 700, age=100)
+        kept = [_screenshot(screenshot_dir, f"step_{i}.png", 1000, age=10 * (5 - i)) for i in range(5)]
+        runner.save_execution(_execution([expired], days_ago=40))
+        runner.save_execution(_execution([released_recently], days_ago=40))
+        for path in kept:
+            runner.save_execution(_execution([path]))
+        temp_path = _screenshot(os.path.join(tmp_dir, "cases"), "case.json.abc.tmp", 50, age=7200)
+
+        # 1. 未被引用的旧截图、过期执行记录的截图、残留临时文件；宽限期内修改过的截图保留
+        print("1. 测试默认回收...")
+        report = retention.collect(RetentionPolicy(max_execution_age_days=30, compact_ratio=0.1))
+        assert report.executions_removed == 2 and report.screenshots_removed == 2
+        assert not os.path.exists(old_orphan) and not os.path.exists(expired) and os.path.exists(new_orphan)
+        assert os.path.exists(released_recently)
+        assert report.temp_files_removed == 1 and not os.path.exists(temp_path)
+        assert report.screenshot_bytes == 800 and report.temp_bytes == 50 and report.log_bytes > 0
+        assert report.reclaimed_bytes == 850 + report.log_bytes
+        assert report.screenshots_remaining == 7 and report.screenshot_bytes_remaining == 6000
+
+        os.remove(released_recently)
+
+        # 2. 数量和总大小上限：从最旧的开始删除
+        print("2. 测试数量和大小上限...")
+        report = retention.collect(RetentionPolicy(max_screenshots=5, max_screenshot_bytes=3500))
+        assert report.screenshots_removed == 2 and report.screenshot_bytes_remaining == 3300
+        assert not os.path.exists(kept[0]) and not os.path.exists(kept[1]) and os.path.exists(kept[2])
+        assert retention.last_report is report and len(runner.execution_log) == 5
+
+        # 3. 后台回收线程
+        print("3. 测试后台回收...")
+        os.utime(new_orphan, (time.time() - 7200, time.time() - 7200))
+        retention.last_report = None
+        retention.start_sweeper(interval=0.05)
+        try:
+            deadline = time.time() + 5
+            while retention.last_report is None and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            retention.stop_sweeper(timeout=5)
+        assert retention.last_report is not None and not os.path.exists(new_orphan)
+
+    print("\n✅ 保留策略回收测试通过！")
+
+
+def test_gc_command():
+    """测试 gc 命令"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        screenshot_dir = os.path.join(tmp_dir, "screenshots")
+        os.makedirs(screenshot_dir)
+        _screenshot(screenshot_dir, "orphan.png", 1234, age=7200)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(['gc', '--reports-dir', os.path.join(tmp_dir, "reports"), '--screenshot-dir', screenshot_dir])
+        assert code == 0 and "回收 1234 字节" in output.getvalue()
+        assert not os.listdir(screenshot_dir)
+        assert main(['gc', '--max-executions', '-1']) == 4
+
+    print("\n✅ gc 命令测试通过！")
+
+
+if __name__ == "__main__":
+    test_release_on_delete()
+    test_collect()
+    test_gc_command()
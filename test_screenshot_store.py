@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+测试按内容寻址的截图存储
+"""
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image, ImageDraw
+
+from utils.playwright_utils import PlaywrightUtils
+from utils.screenshot_store import ScreenshotStore, perceptual_hash, PERCEPTUAL_INDEX
+from fake_playwright import FakePage
+
+
+def _png(text="登录", dot=None, size=(320, 200)):
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([20, 20, 200, 60], fill='navy')
+    draw.rectangle([20, 100, 300, 140], outline='black')
+    if text == "注册":
+        draw.rectangle([120, 80, 300, 180], fill='darkred')
+    if dot:
+        draw.point(dot, fill='gray')
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+
+def test_exact_dedup():
+    """测试内容相同的截图只保存一份"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = ScreenshotStore(tmp_dir)
+        first, second = _png(), _png("注册")
+
+        # 1. 相同内容返回同一路径，只写一次
+        print("1. 测试相同截图...")
+        path = store.put(first)
+        old = time.time() - 7200
+        os.utime(path, (old, old))
+        assert store.put(first) == path and store.put(second) != path
+        assert sorted(os.listdir(tmp_dir)) == sorted(os.path.basename(p) for p in {path, store.put(second)})
+        assert store.stats['writes'] == 2 and store.stats['exact_hits'] == 2
+        assert store.stats['bytes_saved'] == len(first) + len(second)
+        # 重复使用时更新修改时间，保留策略视为新截图
+        assert os.path.getmtime(path) > old + 3600
+
+        # 2. 被删除后重新写入
+        print("2. 测试删除后重新写入...")
+        os.remove(path)
+        assert store.put(first) == path and os.path.exists(path)
+
+    print("\n✅ 截图去重测试通过！")
+
+
+def test_perceptual_dedup():
+    """测试按感知哈希合并近似截图"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base, near, other = _png(), _png(dot=(310, 190)), _png("注册")
+
+        # 1. 近似截图哈希相同或只差几位，不同页面相差较多
+        print("1. 测试感知哈希...")
+        assert base != near
+        assert (perceptual_hash(base) ^ perceptual_hash(near)).bit_count() <= 2
+        assert (perceptual_hash(base) ^ perceptual_hash(other)).bit_count() > 4
+
+        # 2. 近似截图引用已存的截图
+        print("2. 测试合并近似截图...")
+        store = ScreenshotStore(tmp_dir, perceptual_distance=4)
+        path = store.put(base)
+        assert store.put(near) == path and store.put(other) != path
+        assert store.stats['perceptual_hits'] == 1 and store.stats['writes'] == 2
+        assert os.path.exists(os.path.join(tmp_dir, PERCEPTUAL_INDEX))
+
+        # 3. 索引跨实例保留；已删除的截图不再被引用
+        print("3. 测试索引持久化...")
+        assert ScreenshotStore(tmp_dir, perceptual_distance=4).put(near) == path
+        os.remove(path)
+        restored = ScreenshotStore(tmp_dir, perceptual_distance=4).put(near)
+        assert restored != path and os.path.exists(restored)
+
+    print("\n✅ 近似截图合并测试通过！")
+
+
+def test_step_screenshots():
+    """测试测试步骤的截图指向共享文件"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print("1. 测试步骤截图...")
+        store = ScreenshotStore(os.path.join(tmp_dir, "screenshots"))
+        utils = PlaywrightUtils(screenshot_store=store)
+        utils.page = FakePage(frames=[_png(), _png(), _png("注册")])
+        step = {'action': 'click', 'target_selector': '#go', 'wait_time': 0}
+        paths = [asyncio.run(utils.execute_test_step(step))['screenshot_path'] for _ in range(3)]
+        assert paths[0] == paths[1] != paths[2]
+        assert len(os.listdir(store.directory)) == 2
+
+    print("\n✅ 步骤截图测试通过！")
+
+
+if __name__ == "__main__":
+    test_exact_dedup()
+    test_perceptual_dedup()
+    test_step_screenshots()
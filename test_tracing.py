@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+测试各阶段耗时记录
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.test_case import TestCase, TestType, TestPriority
+from models.test_data import TestStatus
+from utils.tracing import (Tracer, new_tracer, trace_span, traced, set_tracing_enabled,
+                           to_chrome_trace, export_chrome_trace, summarize_spans)
+from fake_playwright import FakePlaywrightUtils, use_fake_playwright
+
+
+class _FakePlaywrightUtils(FakePlaywrightUtils):
+    """记录导航耗时的假浏览器工具"""
+
+    async def start_browser(self, headless=True, storage_state=None):
+        with trace_span("browser_launch", "browser"):
+            await super().start_browser(headless, storage_state)
+
+    async def navigate_to_page(self, url):
+        with trace_span("navigate", "navigation", url=url):
+            await asyncio.sleep(0.001)
+        return self.title
+
+
+def test_tracer():
+    """测试区间嵌套、并发隔离、关闭计时和 Chrome trace 格式"""
+    # 1. 嵌套区间，内层先结束先记录
+    print("1. 测试嵌套区间...")
+    tracer = Tracer(track="case")
+    with tracer.activate():
+        with trace_span("outer", "step", index=1):
+            with trace_span("inner", "playwright"):
+                pass
+    assert [span.name for span in tracer.spans] == ["inner", "outer"]
+    inner, outer = tracer.spans
+    assert outer.start_us <= inner.start_us and inner.duration_us <= outer.duration_us
+    assert outer.args == {'index': '1'} and outer.track == "case"
+
+    # 没有当前记录器时不记录
+    with trace_span("orphan", "step"):
+        pass
+    assert len(tracer.spans) == 2
+
+    # 2. 并发任务各自记录到自己的记录器
+    print("2. 测试并发隔离...")
+
+    async def run(track):
+        task_tracer = Tracer(track)
+        with task_tracer.activate():
+            for _ in range(3):
+                await traced(asyncio.sleep(0.001), "wait", "wait")
+        return task_tracer
+
+    async def run_all():
+        return await asyncio.gather(run("a"), run("b"))
+
+    tracers = asyncio.run(run_all())
+    assert all(len(t.spans) == 3 and {s.track for s in t.spans} == {t.track} for t in tracers)
+
+    # 3. 关闭计时后不创建记录器，trace_span 不记录
+    print("3. 测试关闭计时...")
+    set_tracing_enabled(False)
+    try:
+        assert new_tracer() is None
+        with tracer.activate():
+            with trace_span("disabled", "step"):
+                pass
+        assert len(tracer.spans) == 2
+    finally:
+        set_tracing_enabled(True)
+
+    # 4. Chrome trace：每个轨道一个线程，区间为完整事件
+    print("4. 测试 Chrome trace 导出...")
+    spans = tracer.spans + tracers[0].spans
+    trace = to_chrome_trace(spans)
+    complete = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    threads = {event['args']['name']: event['tid'] for event in trace['traceEvents'] if event['name'] == 'thread_name'}
+    assert len(complete) == 5 and set(threads) == {"case", "a"}
+    assert complete[0]['name'] == "outer"
+    assert {event['tid'] for event in complete if event['name'] == "wait"} == {threads["a"]}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = export_chrome_trace(spans, os.path.join(tmp_dir, "trace", "trace.json"))
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == trace
+    assert summarize_spans(spans)['wait']['count'] == 3
+
+    print("\n✅ 耗时记录测试通过！")
+
+
+def test_runner_spans():
+    """测试执行记录中保存各阶段耗时"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"))
+        test_generator.save_test_case(TestCase(id="case-trace", name="计时用例", description="", test_type=TestType.FUNCTIONAL,
+                                               priority=TestPriority.MEDIUM, page_url="https://example.com/", viewpoints=[]))
+        runner = TestRunner(os.path.join(tmp_dir, "reports"), test_generator=test_generator)
+
+        with use_fake_playwright(_FakePlaywrightUtils):
+            print("1. 测试执行记录的耗时...")
+            execution = asyncio.run(runner.run_test_case("case-trace"))
+            set_tracing_enabled(False)
+            try:
+                untraced = asyncio.run(runner.run_test_case("case-trace"))
+            finally:
+                set_tracing_enabled(True)
+
+        assert execution.status == TestStatus.PASSED
+        names = [span.name for span in execution.spans]
+        assert {"browser_launch", "navigate", "browser_close", "run_test_case"} <= set(names)
+        # 保存执行记录的耗时记录在用例自己的记录器中
+        assert names[-2:] == ["run_test_case", "save_execution"]
+        assert execution.spans[-1].args == {'steps': '0'}
+        assert {span.track for span in execution.spans} == {"case-trace"}
+        assert untraced.spans == []
+
+        # 2. 耗时随执行记录保存和加载（保存本身的耗时在保存之后才得到）
+        print("2. 测试保存和加载...")
+        loaded = runner.load_execution(execution.id)
+        assert [span.name for span in loaded.spans] == names[:-1]
+        assert loaded.spans[-1].duration_us == execution.spans[-2].duration_us
+
+    print("\n✅ 执行记录耗时测试通过！")
+
+
+if __name__ == "__main__":
+    test_tracer()
+    test_runner_spans()
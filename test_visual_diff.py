@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+测试视觉回归对比
+"""
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from core.test_generator import TestGenerator
+from core.test_runner import TestRunner
+from models.page_node import PageNode, NodeType
+from models.test_case import TestCase, TestViewpoint, TestData, TestType, TestPriority, TestStrategy
+from models.test_data import TestStatus, TestStepResult
+from utils.assertion_utils import AssertionUtils
+from utils.screenshot_store import ScreenshotStore
+from utils.visual_baseline import VisualBaselineStore
+from utils.visual_diff import VisualDiffer, parse_regions
+from fake_playwright import FakePlaywrightUtils, use_fake_playwright
+
+
+def _png(banner='navy', clock=None, size=(1280, 720), panel=False):
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, size[0], 80], fill=banner)
+    draw.rectangle([100, 200, 700, 260], outline='black', width=2)
+    draw.rectangle([100, 300, 300, 360], fill='green')
+    if panel:
+        draw.rectangle([800, 120, 1200, 700], fill='black')
+    if clock:
+        # 时间戳等每次不同的区域
+        draw.rectangle([1100, 20, 1260, 60], fill=clock)
+    output = io.BytesIO()
+    image.save(output, format='PNG', compress_level=1)
+    return output.getvalue()
+
+
+def test_visual_differ():
+    """测试预筛、逐像素对比、忽略区域和差异图"""
+    differ = VisualDiffer()
+    base = _png()
+
+    # 1. 相同截图不解码
+    print("1. 测试相同截图...")
+    result = differ.compare(base, base)
+    assert result.method == 'identical' and result.score == 0 and result.diff_image is None
+
+    # 2. 变化区域的像素比例
+    print("2. 测试逐像素对比...")
+    changed = _png(clock='red')
+    result = differ.compare(base, changed)
+    assert result.method == 'pixel' and result.scale == 2
+    expected = (160 // 2) * (40 // 2) / (640 * 360)
+    assert abs(result.score - expected) < 0.0005 and not result.size_mismatch
+    diff = np.asarray(Image.open(io.BytesIO(result.diff_image)).convert('RGB'))
+    assert diff.shape == (360, 640, 3) and tuple(diff[20, 590]) == (255, 0, 0) and tuple(diff[200, 50]) != (255, 0, 0)
+
+    # 3. 忽略区域不参与对比
+    print("3. 测试忽略区域...")
+    regions = parse_regions("1090,10,180,60")
+    assert regions == [(1090, 10, 180, 60)] == parse_regions([{'x': 1090, 'y': 10, 'width': 180, 'height': 60}])
+    result = differ.compare(base, changed, regions)
+    assert result.score == 0 and result.changed_pixels == 0 and result.diff_image is None
+    assert result.compared_pixels < 640 * 360
+    assert differ.compare(base, _png(banner='darkred'), regions).score > 0.1
+
+    # 4. 容差内的颜色变化不计入，尺寸不同时多出的部分计为变化
+    print("4. 测试容差和尺寸...")
+    assert differ.compare(base, _png(banner=(0, 0, 140))).score == 0
+    result = differ.compare(base, _png(size=(1280, 800)))
+    assert result.size_mismatch and abs(result.score - 80 / 800) < 0.01
+
+    # 5. 感知哈希预筛：哈希接近时不做逐像素对比
+    print("5. 测试感知哈希预筛...")
+    result = VisualDiffer(prefilter_distance=4).compare(base, changed)
+    assert result.method == 'phash' and result.score == 0
+    assert VisualDiffer(prefilter_distance=4).compare(base, _png(panel=True)).method == 'pixel'
+
+    # 6. 批量对比
+    print("6. 测试批量对比...")
+    pairs = [(base, changed, ()), (base, base, ()), (base, changed, regions)] * 40
+    started = time.perf_counter()
+    results = differ.compare_many(pairs, diff_image=False)
+    elapsed = time.perf_counter() - started
+    assert [r.score > 0 for r in results[:3]] == [True, False, False] and len(results) == 120
+    print(f"   {len(pairs) / elapsed * 60:.0f} 对/分钟")
+
+    print("\n✅ 截图对比测试通过！")
+
+
+def test_visual_assertion():
+    """测试 visual_match 断言：建立基线、对比、更新基线"""
+    assert 'visual_match' in [a['name'] for a in AssertionUtils.get_assertions_by_node_type('button')]
+    assert AssertionUtils.execute_assertion('visual_match', 0.002, 0.001)['passed'] is False
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"))
+        button = PageNode(id="go", type=NodeType.BUTTON, tag_name="button", xpath="//*[@id=\"go\"]",
+                          attributes={"id": "go"}, page_url="https://example.com/")
+        data = TestData(id="click-go", input_value=None, expected_value=None, description="点击",
+                        assertion_functions=[("visual_match", {"threshold": 0.001, "ignore_regions": "1090,10,180,60"})])
+        test_generator.save_test_case(TestCase(
+            id="case-visual", name="视觉用例", description="", test_type=TestType.UI, priority=TestPriority.MEDIUM,
+            page_url="https://example.com/",
+            viewpoints=[TestViewpoint(id="vp", name="点击", strategy=TestStrategy.BASIC, description="",
+                                      target_node=button, test_data_list=[data])]))
+        store = ScreenshotStore(os.path.join(tmp_dir, "screenshots"))
+        baselines = VisualBaselineStore(os.path.join(tmp_dir, "baselines"))
+        runner = TestRunner(os.path.join(tmp_dir, "reports"), test_generator=test_generator,
+                            screenshot_store=store, visual_baselines=baselines)
+
+        # 每次运行截取 frames 中的下一张图
+        frames = [_png(), _png(clock='red'), _png(banner='darkred'), _png(banner='darkred')]
+        with use_fake_playwright(frames=frames):
+            run = lambda: asyncio.run(runner.run_test_case("case-visual"))
+
+            # 1. 第一次运行建立基线
+            print("1. 测试建立基线...")
+            execution = run()
+            assert execution.status == TestStatus.PASSED and baselines.get("case-visual", "click-go")
+            assert execution.step_results[0].visual_score == 0
+
+            # 2. 只有忽略区域变化时通过
+            print("2. 测试忽略区域...")
+            execution = run()
+            step = execution.step_results[0]
+            assert execution.status == TestStatus.PASSED and step.visual_score == 0 and step.diff_path is None
+
+            # 3. 超过阈值时失败，记录分数和差异图，差异图被执行记录引用
+            print("3. 测试视觉差异...")
+            execution = run()
+            step = execution.step_results[0]
+            assert execution.status == TestStatus.FAILED and step.visual_score > 0.1
+            assert step.assertions[-1].assertion_type == 'visual_match' and not step.assertions[-1].passed
+            assert os.path.exists(step.diff_path) and os.path.dirname(step.diff_path) == store.directory
+            runner.save_execution(execution)
+            assert step.diff_path in runner.execution_log.summary(execution.id)['screenshots']
+
+            # 4. 更新基线后通过
+            print("4. 测试更新基线...")
+            assert baselines.approve(execution) == ["click-go"]
+            assert run().status == TestStatus.PASSED
+            assert baselines.delete("case-visual") == 1 and baselines.get("case-visual", "click-go") is None
+
+    print("\n✅ 视觉断言测试通过！")
+
+
+class _TextPlaywrightUtils(FakePlaywrightUtils):
+    async def get_element_text(self, selector):
+        return "欢迎"
+
+
+def test_visual_assertion_steps():
+    """测试 visual_match 与步骤去重、近似截图复用和不截图的操作"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_generator = TestGenerator(os.path.join(tmp_dir, "test_cases"))
+        store = ScreenshotStore(os.path.join(tmp_dir, "screenshots"), perceptual_distance=8)
+        baselines = VisualBaselineStore(os.path.join(tmp_dir, "baselines"))
+        runner = TestRunner(os.path.join(tmp_dir, "reports"), test_generator=test_generator,
+                            screenshot_store=store, visual_baselines=baselines)
+        visual = [("visual_match", {"threshold": 0.001})]
+
+        def save_case(case_id, node, data_ids):
+            test_generator.save_test_case(TestCase(
+                id=case_id, name="视觉用例", description="", test_type=TestType.UI, priority=TestPriority.MEDIUM,
+                page_url="https://example.com/",
+                viewpoints=[TestViewpoint(id="vp", name="视觉", strategy=TestStrategy.BASIC, description="",
+                                          target_node=node, test_data_list=[
+                                              TestData(id=data_id, input_value=None, expected_value=None,
+                                                       description="视觉", assertion_functions=list(visual))
+                                              for data_id in data_ids])]))
+
+        button = PageNode(id="go", type=NodeType.BUTTON, tag_name="button", xpath="//*[@id=\"go\"]",
+                          attributes={"id": "go"}, page_url="https://example.com/")
+
+        # 1. 去重的步骤各自与自己的基线对比，不继承原步骤的对比结果
+        print("1. 测试去重步骤的视觉对比...")
+        save_case("case-dup", button, ["click-a", "click-b"])
+        baselines.save("case-dup", "click-a", store.put(_png(banner='darkred'), exact=True))
+        baselines.save("case-dup", "click-b", store.put(_png(), exact=True))
+        with use_fake_playwright(frames=[_png()]):
+            execution = asyncio.run(runner.run_test_case("case-dup"))
+        first, second = execution.step_results
+        assert second.duplicate_of == "click-a"
+        assert first.status == TestStatus.FAILED and first.visual_score > 0.1
+        assert second.status == TestStatus.PASSED and second.visual_score == 0
+        assert [a.passed for a in second.assertions] == [True]
+
+        # 2. 与已有截图近似（感知哈希相同）的截图也按原样保存并对比，不被旧截图代替
+        print("2. 测试近似截图不代替本次截图...")
+        previous = store.put(_png())
+        assert store.put(_png(clock='red')) == previous
+        save_case("case-near", button, ["click-near"])
+        baselines.save("case-near", "click-near", previous)
+        with use_fake_playwright(frames=[_png(clock='red')]):
+            step = asyncio.run(runner.run_test_case("case-near")).step_results[0]
+        assert step.screenshot_path != previous
+        assert step.status == TestStatus.FAILED and step.visual_score > 0.001
+
+        # 3. 验证文本这类本身不截图的操作，有 visual_match 时补截一张
+        print("3. 测试不截图的操作...")
+        text = PageNode(id="hello", type=NodeType.TEXT, tag_name="p", xpath="//*[@id=\"hello\"]",
+                        attributes={"id": "hello"}, page_url="https://example.com/")
+        save_case("case-text", text, ["text-hello"])
+        with use_fake_playwright(_TextPlaywrightUtils, frames=[_png(panel=True)]):
+            step = asyncio.run(runner.run_test_case("case-text")).step_results[0]
+        assert step.status == TestStatus.PASSED and step.screenshot_path
+        assert baselines.get("case-text", "text-hello")
+
+        # 4. 没有截图时视觉断言失败，而不是跳过
+        print("4. 测试没有截图...")
+        step = TestStepResult(step_id="text-hello", step_number=0, action="basic", status=TestStatus.PASSED,
+                              start_time=datetime.now())
+        runner._check_visual("case-text", step, {})
+        assert step.status == TestStatus.FAILED and step.assertions[-1].passed is False
+
+    print("\n✅ 视觉断言步骤测试通过！")
+
+
+if __name__ == "__main__":
+    test_visual_differ()
+    test_visual_assertion()
+    test_visual_assertion_steps()
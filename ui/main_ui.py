@@ -3,10 +3,7 @@ from typing import Dict, Any, List
 import asyncio
 import uuid
 import json
-from core.page_parser import PageParser
-from core.test_generator import TestGenerator
-from core.test_runner import TestRunner
-from core.report_generator import ReportGenerator
+from core.services import get_services
 from models.test_case import TestType, TestPriority
 from models.page_node import NodeType
 from utils.assertion_utils import AssertionUtils
@@ -17,10 +14,8 @@ class MainUI:
     """主界面类"""
 
     def __init__(self):
-        self.page_parser = PageParser()
-        self.test_generator = TestGenerator()
-        self.test_runner = TestRunner()
-        self.report_generator = ReportGenerator()
+        # 核心服务由共享容器按需创建
+        self.services = get_services()
 
         # 状态变量
         self.current_structure_id = None
@@ -31,6 +26,22 @@ class MainUI:
         self.tab_labels = ['页面结构', '测试用例', '执行记录']
         self.tab_table_container = None
 
+    @property
+    def page_parser(self):
+        return self.services.page_parser
+
+    @property
+    def test_generator(self):
+        return self.services.test_generator
+
+    @property
+    def test_runner(self):
+        return self.services.test_runner
+
+    @property
+    def report_generator(self):
+        return self.services.report_generator
+
     def create_main_interface(self):
         """创建主界面"""
         # 设置页面标题
@@ -707,7 +718,7 @@ class MainUI:
                                                         with container:
                                                             ui.label(f'{func_name} 参数:').classes('text-caption font-weight-bold')
                                                             for param_name, param_info in params.items():
-                                                                if param_info['type'] == 'int':
+                                                                if param_info['type'] in ('int', 'float'):
                                                                     ui.input(f'{param_name} ({param_info["description"]})', value=param_info.get('default', '')).style('width: 100%;')
                                                                 elif param_info['type'] == 'str':
                                                                     ui.input(f'{param_name} ({param_info["description"]})', value=param_info.get('default', '')).style('width: 100%;')
@@ -1,5 +1,5 @@
 from nicegui import ui
-from core.page_parser import PageParser
+from core.services import get_services
 from models.page_node import NodeType
 import asyncio
 
@@ -8,7 +8,7 @@ class PageParserUI:
     """页面解析界面"""
 
     def __init__(self):
-        self.page_parser = PageParser()
+        self.page_parser = get_services().page_parser
         self.current_structure = None
 
     def create_interface(self):
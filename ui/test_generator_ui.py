@@ -1,6 +1,5 @@
-from nicegui import ui
-from core.test_generator import TestGenerator
-from core.page_parser import PageParser
+from nicegui import ui, run
+from core.services import get_services
 from models.test_case import TestType, TestPriority
 import uuid
 
@@ -9,8 +8,9 @@ class TestGeneratorUI:
     """测试生成界面"""
 
     def __init__(self):
-        self.test_generator = TestGenerator()
-        self.page_parser = PageParser()
+        services = get_services()
+        self.test_generator = services.test_generator
+        self.page_parser = services.page_parser
         self.selected_structure_id = None
         self.selected_nodes = []
 
@@ -31,11 +31,14 @@ class TestGeneratorUI:
                 ui.label('生成测试用例').classes('text-h6 q-mb-md')
 
                 # 选择页面结构
-                structures = self.page_parser.list_page_structures()
-                if structures:
-                    structure_options = [(s['title'], s['id']) for s in structures]
+                structures_data = self.page_parser.list_page_structures()
+                if structures_data['rows']:
+                    structure_options = [(row[1], row[0]) for row in structures_data['rows']]  # (title, id)
                     structure_select = ui.select('选择页面结构', options=structure_options).classes('q-mb-md')
-                    ui.button('选择结构', on_click=lambda: self.select_structure(structure_select.value))
+                    with ui.row():
+                        ui.button('选择结构', on_click=lambda: self.select_structure(structure_select.value))
+                        ui.button('批量生成全部结构', icon='playlist_add',
+                                  on_click=lambda: self.generate_all_test_cases([row[0] for row in structures_data['rows']]))
                 else:
                     ui.label('请先解析页面结构').classes('text-caption text-grey')
 
@@ -215,6 +218,41 @@ class TestGeneratorUI:
         except Exception as e:
             ui.notify(f'测试用例生成失败: {str(e)}', type='negative')
 
+    async def generate_all_test_cases(self, structure_ids):
+        """为所有页面结构批量生成测试用例（在后台线程中执行，不阻塞界面）"""
+        progress = {'done': 0, 'total': len(structure_ids)}
+
+        def on_progress(done, total, structure_id, error):
+            progress['done'] = done
+
+        with ui.dialog() as dialog, ui.card().classes('w-96'):
+            ui.label('批量生成测试用例').classes('text-h6')
+            progress_bar = ui.linear_progress(value=0, show_value=False)
+            progress_label = ui.label(f"0 / {progress['total']}")
+        dialog.open()
+
+        def refresh():
+            progress_bar.set_value(progress['done'] / max(progress['total'], 1))
+            progress_label.set_text(f"{progress['done']} / {progress['total']}")
+
+        timer = ui.timer(0.2, refresh)
+        try:
+            summary = await run.io_bound(self.test_generator.generate_test_cases_for_structures,
+                                         structure_ids, progress_callback=on_progress)
+        except Exception as e:
+            ui.notify(f'批量生成失败: {str(e)}', type='negative')
+            return
+        finally:
+            timer.deactivate()
+            dialog.close()
+
+        if summary['failed']:
+            details = '; '.join(f"{structure_id}: {error}" for structure_id, error in summary['errors'].items())
+            ui.notify(f"生成完成: 成功 {summary['succeeded']} 个，失败 {summary['failed']} 个（{details}）",
+                      type='warning', multi_line=True)
+        else:
+            ui.notify(f"成功生成 {summary['succeeded']} 个测试用例", type='positive')
+
     def create_test_case_list(self):
         """创建测试用例列表"""
         with ui.card().classes('full-width'):
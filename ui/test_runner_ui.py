@@ -1,7 +1,5 @@
 from nicegui import ui
-from core.test_runner import TestRunner
-from core.test_generator import TestGenerator
-from core.report_generator import ReportGenerator
+from core.services import get_services
 import asyncio
 
 
@@ -9,9 +7,10 @@ class TestRunnerUI:
     """测试运行界面"""
 
     def __init__(self):
-        self.test_runner = TestRunner()
-        self.test_generator = TestGenerator()
-        self.report_generator = ReportGenerator()
+        services = get_services()
+        self.test_runner = services.test_runner
+        self.test_generator = services.test_generator
+        self.report_generator = services.report_generator
         self.running_tests = False
 
     def create_interface(self):
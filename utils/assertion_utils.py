@@ -14,6 +14,7 @@ class AssertionType(Enum):
     LENGTH = "length"
     FORMAT = "format"
     VALIDATION = "validation"
+    VISUAL = "visual"
 
 
 def assertion_function(func_name: str, description: str, assertion_type: AssertionType,
@@ -252,6 +253,26 @@ class SelectAssertions:
         return expected in actual if actual else False
 
 
+class VisualAssertions:
+    """视觉断言类"""
+
+    @assertion_function(
+        func_name="visual_match",
+        description="截图与基线一致",
+        assertion_type=AssertionType.VISUAL,
+        parameters={
+            "threshold": {"type": "float", "description": "允许变化的像素比例", "default": 0.001},
+            "pixel_tolerance": {"type": "int", "description": "像素任一通道差值超过该值记为变化", "default": 16},
+            "ignore_regions": {"type": "str", "description": "忽略区域 x,y,宽,高，多个用;分隔", "default": ""}
+        },
+        node_types=["button", "input", "link", "text", "image", "select", "checkbox", "radio", "table", "form",
+                    "div", "span", "other"]
+    )
+    def assert_visual_match(self, actual: float, expected: float = 0.001, message: str = "") -> bool:
+        """断言截图与基线的差异（变化像素比例）不超过阈值"""
+        return actual is not None and actual <= expected
+
+
 class AssertionUtils:
     """断言工具类 - 兼容旧版本"""
 
@@ -311,6 +332,7 @@ class AssertionUtils:
         input_assertions = InputAssertions()
         button_assertions = ButtonAssertions()
         select_assertions = SelectAssertions()
+        visual_assertions = VisualAssertions()
 
         # 映射断言类型到方法
         assertion_map = {
@@ -330,6 +352,7 @@ class AssertionUtils:
             "button_type": button_assertions.assert_button_type,
             "option_selected": select_assertions.assert_option_selected,
             "option_available": select_assertions.assert_option_available,
+            "visual_match": visual_assertions.assert_visual_match,
         }
 
         if assertion_type in assertion_map:
@@ -358,11 +381,12 @@ class AssertionUtils:
         input_assertions = InputAssertions()
         button_assertions = ButtonAssertions()
         select_assertions = SelectAssertions()
+        visual_assertions = VisualAssertions()
 
         assertions = []
 
         # 收集所有断言函数的信息
-        for obj in [input_assertions, button_assertions, select_assertions]:
+        for obj in [input_assertions, button_assertions, select_assertions, visual_assertions]:
             for method_name in dir(obj):
                 method = getattr(obj, method_name)
                 if hasattr(method, 'func_name'):
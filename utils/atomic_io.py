@@ -0,0 +1,194 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Optional, Set
+
+
+FSYNC_MODES = ('always', 'batch', 'never')
+
+
+def _fsync_path(path: str, directory: bool = False):
+    """对已写入的文件或目录调用 fsync；平台不支持对目录 fsync 时忽略"""
+    flags = os.O_RDONLY
+    if directory:
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        flags |= os.O_DIRECTORY
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        # 文件已被删除或替换，没有需要落盘的内容
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class FsyncBatcher:
+    """分组落盘
+
+    batch 模式下原子写入在重命名前照常 fsync 临时文件（保证重命名到位的文件内容完整），只把所在目录
+    记入待落盘集合；追加写入的文件记入待落盘文件。累计 batch_size 次写入、写入时距上次落盘已超过
+    interval 秒，或第一次写入后 interval 秒（后台定时器），一次性 fsync 这些文件和目录。
+    并行运行时大量执行记录共用一次目录落盘，不必每个文件等两次磁盘。进程退出时落盘剩余的写入。
+    """
+
+    def __init__(self, batch_size: int = 32, interval: float = 1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._count = 0
+        self._files: Set[str] = set()
+        self._dirs: Set[str] = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self.flushes = 0
+
+    def add(self, path: str, sync_file: bool = True):
+        """记录一次写入，达到批量条件时落盘
+
+        sync_file 为 False 表示文件内容已经 fsync，只需落盘所在目录（重命名）。
+        """
+        with self._lock:
+            self._count += 1
+            if sync_file:
+                self._files.add(path)
+            self._dirs.add(os.path.dirname(path) or '.')
+            due = self._count >= self.batch_size or time.monotonic() - self._last_flush >= self.interval
+            if not due and self._timer is None:
+                # 写入停止后也在 interval 秒内落盘，不等下一次写入
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._count
+
+    def flush(self) -> int:
+        """落盘所有待落盘的文件和目录，返回写入次数"""
+        with self._lock:
+            count, files, dirs = self._count, self._files, self._dirs
+            self._count, self._files, self._dirs = 0, set(), set()
+            self._last_flush = time.monotonic()
+            timer, self._timer = self._timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        if not count:
+            return 0
+        for path in files:
+            _fsync_path(path)
+        # 目录项（重命名、新建文件）在文件内容之后落盘
+        for directory in dirs:
+            _fsync_path(directory, directory=True)
+        with self._lock:
+            self.flushes += 1
+        return count
+
+
+# 环境变量 AI_TEST_FSYNC 设置落盘方式，AI_TEST_FSYNC_BATCH 设置分组大小
+_mode = os.environ.get('AI_TEST_FSYNC', 'batch')
+if _mode not in FSYNC_MODES:
+    _mode = 'batch'
+_batcher = FsyncBatcher(batch_size=int(os.environ.get('AI_TEST_FSYNC_BATCH', '32')))
+atexit.register(lambda: _batcher.flush())
+
+
+def configure_fsync(mode: Optional[str] = None, batch_size: Optional[int] = None, interval: Optional[float] = None):
+    """设置原子写入的落盘方式
+
+    always: 每个文件重命名前 fsync 文件、重命名后 fsync 目录，断电也不丢已返回的写入；
+    batch: 重命名前同样 fsync 文件，目录分组落盘（见 FsyncBatcher），断电时可能丢失最近一组重命名，
+    但不会出现内容不完整的文件；
+    never: 只保证原子替换，由操作系统决定何时落盘。
+    切换到其他方式前先落盘 batch 模式下积累的文件。
+    """
+    global _mode
+    if mode is not None:
+        if mode not in FSYNC_MODES:
+            raise ValueError(f"不支持的落盘方式: {mode}，可选 {', '.join(FSYNC_MODES)}")
+        if mode != 'batch':
+            _batcher.flush()
+        _mode = mode
+    if batch_size is not None:
+        if batch_size < 1:
+            raise ValueError("batch_size 必须大于 0")
+        _batcher.batch_size = batch_size
+    if interval is not None:
+        _batcher.interval = interval
+
+
+def get_fsync_mode() -> str:
+    return _mode
+
+
+def get_fsync_batcher() -> FsyncBatcher:
+    return _batcher
+
+
+def flush_pending_writes() -> int:
+    """立即落盘 batch 模式下积累的写入，返回写入次数"""
+    return _batcher.flush()
+
+
+def sync_written_file(path: str):
+    """按当前落盘方式落盘已写入并关闭的文件，用于追加写入等不经过 atomic_write_* 的文件"""
+    if _mode == 'always':
+        _fsync_path(path)
+    elif _mode == 'batch':
+        _batcher.add(path)
+
+
+def sync_now(path: str):
+    """不论落盘方式，立即 fsync 文件及其所在目录；用于删除源数据之前确认新数据已经落盘"""
+    _fsync_path(path)
+    _fsync_path(os.path.dirname(path) or '.', directory=True)
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """原子写入：先写同目录下的临时文件，再用 os.replace 替换目标文件
+
+    读取方只会看到旧内容或完整的新内容；写入失败时删除临时文件，目标文件保持不变。
+    临时文件名为 <目标文件>.<随机串>.tmp，按扩展名列出数据文件时不会被列入。
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    mode = _mode
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            # 内容必须在重命名之前落盘，否则断电后可能留下替换了旧文件的空文件
+            if mode != 'never':
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if mode == 'always':
+        _fsync_path(directory, directory=True)
+    elif mode == 'batch':
+        _batcher.add(path, sync_file=False)
+
+
+def atomic_write_text(path: str, text: str, encoding: str = 'utf-8'):
+    """原子写入文本，见 atomic_write_bytes"""
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = None):
+    """原子写入JSON（中文不转义），见 atomic_write_bytes"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=indent))
@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.atomic_io import atomic_write_json
+
+
+def origin_of(url: str) -> str:
+    """URL的源（协议://主机[:端口]）"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+@dataclass
+class LoginProfile:
+    """某个源、某个角色的登录方式：运行 login_test_case_id 对应的登录测试用例"""
+    origin: str
+    role: str
+    login_test_case_id: str
+    ttl: int = 3600  # 登录状态有效秒数
+
+
+# 刷新登录状态的回调：(登录测试用例ID, 源, 角色, 是否无头) -> 浏览器上下文的 storage_state
+StateRefresher = Callable[[str, str, str, bool], Awaitable[Dict[str, Any]]]
+
+
+class StorageStateStore:
+    """已登录浏览器状态（cookies 和 localStorage）的缓存
+
+    按源和角色保存 Playwright 的 storage_state，新建浏览器上下文时直接加载，跳过登录流程。
+    状态超过对应登录配置的 ttl 后过期，ensure() 通过 refresher 运行登录测试用例重新获取。
+    登录配置保存在 cache_dir/logins.json，状态文件为 cache_dir/<源哈希>_<角色>.json。
+    """
+
+    def __init__(self, cache_dir: str = "data/auth_states", default_ttl: int = 3600,
+                 refresher: Optional[StateRefresher] = None):
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+        self.refresher = refresher
+        self._logins: Optional[Dict[Tuple[str, str], LoginProfile]] = None
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._locks_loop = None
+
+    @property
+    def _logins_path(self) -> str:
+        return os.path.join(self.cache_dir, "logins.json")
+
+    def state_path(self, origin: str, role: str) -> str:
+        """登录状态文件路径"""
+        digest = hashlib.sha1(origin_of(origin).encode('utf-8')).hexdigest()[:16]
+        safe_role = re.sub(r'[^\w-]', '_', role)
+        return os.path.join(self.cache_dir, f"{digest}_{safe_role}.json")
+
+    def _load_logins(self) -> Dict[Tuple[str, str], LoginProfile]:
+        if self._logins is None:
+            logins = {}
+            if os.path.exists(self._logins_path):
+                with open(self._logins_path, 'r', encoding='utf-8') as f:
+                    for data in json.load(f):
+                        profile = LoginProfile(**data)
+                        logins[(profile.origin, profile.role)] = profile
+            self._logins = logins
+        return self._logins
+
+    def register_login(self, url: str, role: str, login_test_case_id: str, ttl: Optional[int] = None) -> LoginProfile:
+        """指定某个源、某个角色的登录测试用例"""
+        profile = LoginProfile(origin_of(url), role, login_test_case_id, ttl or self.default_ttl)
+        logins = self._load_logins()
+        logins[(profile.origin, role)] = profile
+        self._write_json(self._logins_path, [asdict(p) for p in logins.values()])
+        return profile
+
+    def unregister_login(self, url: str, role: str) -> bool:
+        """删除登录配置和已缓存的登录状态"""
+        logins = self._load_logins()
+        profile = logins.pop((origin_of(url), role), None)
+        if profile is None:
+            return False
+        self._write_json(self._logins_path, [asdict(p) for p in logins.values()])
+        self.invalidate(url, role)
+        return True
+
+    def list_logins(self) -> List[LoginProfile]:
+        """所有登录配置"""
+        return list(self._load_logins().values())
+
+    def get_login(self, url: str, role: str) -> Optional[LoginProfile]:
+        return self._load_logins().get((origin_of(url), role))
+
+    def get(self, url: str, role: str) -> Optional[str]:
+        """未过期的登录状态文件路径，没有或已过期时返回None"""
+        path = self.state_path(url, role)
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return None
+        profile = self.get_login(url, role)
+        ttl = profile.ttl if profile else self.default_ttl
+        return path if age < ttl else None
+
+    def save(self, url: str, role: str, state: Dict[str, Any]) -> str:
+        """保存登录状态（Playwright storage_state 格式）"""
+        path = self.state_path(url, role)
+        self._write_json(path, state)
+        return path
+
+    def invalidate(self, url: str, role: str):
+        """使登录状态失效，例如会话被服务端注销时"""
+        try:
+            os.remove(self.state_path(url, role))
+        except FileNotFoundError:
+            pass
+
+    async def ensure(self, url: str, role: str, headless: bool = True) -> str:
+        """获取可用的登录状态文件，过期或不存在时运行登录测试用例刷新
+
+        同一源和角色的并发请求只刷新一次。
+        """
+        path = self.get(url, role)
+        if path:
+            return path
+
+        async with self._lock_for((origin_of(url), role)):
+            # 等待期间可能已由其他任务刷新
+            path = self.get(url, role)
+            if path:
+                return path
+
+            profile = self.get_login(url, role)
+            if profile is None:
+                raise Exception(f"没有 {origin_of(url)} 角色 {role} 的登录配置")
+            if self.refresher is None:
+                raise Exception("未配置登录状态刷新方式")
+            state = await self.refresher(profile.login_test_case_id, profile.origin, role, headless)
+            return self.save(url, role, state)
+
+    def _lock_for(self, key: Tuple[str, str]) -> asyncio.Lock:
+        # asyncio.Lock 绑定事件循环，换了事件循环（如多次 asyncio.run）时重新创建
+        loop = asyncio.get_running_loop()
+        if self._locks_loop is not loop:
+            self._locks = {}
+            self._locks_loop = loop
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def _write_json(path: str, data: Any):
+        atomic_write_json(path, data)
@@ -0,0 +1,121 @@
+import random
+from itertools import combinations, product
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# 除按最小值选择外，另外尝试的随机种子个数
+COVERING_ARRAY_SEEDS = 4
+
+
+def generate_covering_array(domain_sizes: Sequence[int], strength: int = 2) -> List[Tuple[int, ...]]:
+    """生成 n-wise 组合覆盖（覆盖数组）
+
+    domain_sizes 为每个参数可取值的个数，返回的每一行是各参数取值的下标。
+    任意 strength 个参数的任意取值组合至少出现在一行中；strength=2 即两两组合（pairwise）。
+    使用 IPOG（逐个参数扩展）贪心算法：先对前 strength 个参数做全组合，
+    之后每加入一个参数，先横向为已有行选取覆盖最多未覆盖组合的值，再纵向补充新行；
+    不能覆盖新组合的取值暂不确定，在之后的横向、纵向扩展中用于覆盖新的组合。结果可重现。
+    """
+    sizes = list(domain_sizes)
+    if not sizes:
+        return []
+    if any(size <= 0 for size in sizes):
+        raise ValueError("每个参数至少需要一个取值")
+    if strength < 1:
+        raise ValueError("组合强度必须大于等于1")
+
+    # 取值多的参数先加入，生成的行数更少；最后再换回原来的参数顺序
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i])
+    sizes = [sizes[i] for i in order]
+
+    strength = min(strength, len(sizes))
+    # 覆盖数相同的取值总选最小的值会让各行趋同、行数明显增多，因此另按几个固定种子随机选择，取行数最少的结果
+    attempts = [None] + [random.Random(seed) for seed in range(COVERING_ARRAY_SEEDS)]
+    rows = min((_ipog(sizes, strength, rng) for rng in attempts), key=len)
+
+    # 未确定的取值轮流选用，让各取值出现得更均匀
+    result = []
+    for index, row in enumerate(rows):
+        values = [0] * len(sizes)
+        for column, value in enumerate(row):
+            values[order[column]] = value if value is not None else index % sizes[column]
+        result.append(tuple(values))
+    return result
+
+
+def _ipog(sizes: List[int], strength: int, rng: Optional[random.Random]) -> List[List[Optional[int]]]:
+    """IPOG 扩展，返回的行中可能有未确定（None）的取值；rng 为None时覆盖数相同的取值选最小的值"""
+    rows: List[List[Optional[int]]] = [list(values) for values in product(*(range(size) for size in sizes[:strength]))]
+
+    for k in range(strength, len(sizes)):
+        # 新参数 k 与之前任意 strength-1 个参数构成的所有未覆盖组合
+        uncovered: Dict[Tuple[int, ...], Set[Tuple[int, ...]]] = {}
+        for columns in combinations(range(k), strength - 1):
+            uncovered[columns] = set(product(*(range(sizes[c]) for c in columns), range(sizes[k])))
+
+        def cover(row: List[Optional[int]]):
+            for columns, missing in uncovered.items():
+                key = tuple(row[c] for c in columns + (k,))
+                if None not in key:
+                    missing.discard(key)
+
+        def choose(row: List[Optional[int]], column: int) -> Optional[int]:
+            """为 row 的 column 选择覆盖最多未覆盖组合的取值，不能覆盖新组合时返回None"""
+            best_values, best_gain = [], 0
+            for value in range(sizes[column]):
+                row[column] = value
+                value_gain = gain(row, column)
+                if value_gain > best_gain:
+                    best_values, best_gain = [value], value_gain
+                elif value_gain == best_gain and best_values:
+                    best_values.append(value)
+            row[column] = (rng.choice(best_values) if rng else best_values[0]) if best_values else None
+            return row[column]
+
+        def gain(row: List[Optional[int]], column: int) -> int:
+            """row 中 column 与其他已确定取值构成的未覆盖组合数"""
+            count = 0
+            for columns, missing in uncovered.items():
+                positions = columns + (k,)
+                if column in positions:
+                    key = tuple(row[c] for c in positions)
+                    if None not in key and key in missing:
+                        count += 1
+            return count
+
+        # 横向扩展：为每一行选择覆盖最多未覆盖组合的取值，再为该行未确定的取值选择能覆盖新组合的值
+        for row in rows:
+            row.append(None)
+            # 不能覆盖新组合时暂不确定，留给纵向扩展
+            if choose(row, k) is None:
+                continue
+            cover(row)
+            for column in range(k):
+                if row[column] is None and choose(row, column) is not None:
+                    cover(row)
+
+        # 纵向扩展：剩余的组合优先填入取值未确定且不冲突的已有行，否则新增一行
+        for columns, missing in uncovered.items():
+            positions = columns + (k,)
+            for values in sorted(missing):
+                for row in rows:
+                    if all(row[p] is None or row[p] == v for p, v in zip(positions, values)):
+                        break
+                else:
+                    row = [None] * (k + 1)
+                    rows.append(row)
+                for p, v in zip(positions, values):
+                    row[p] = v
+    return rows
+
+
+def count_uncovered(rows: Sequence[Sequence[int]], domain_sizes: Sequence[int], strength: int = 2) -> int:
+    """统计 rows 未覆盖的 strength 元组合数量，0 表示完全覆盖"""
+    strength = min(strength, len(domain_sizes))
+    uncovered = 0
+    for columns in combinations(range(len(domain_sizes)), strength):
+        seen = {tuple(row[c] for c in columns) for row in rows}
+        total = 1
+        for c in columns:
+            total *= domain_sizes[c]
+        uncovered += total - len(seen)
+    return uncovered
@@ -0,0 +1,411 @@
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，只保证同一进程内互斥
+    fcntl = None
+
+from models.test_data import TestExecution
+from utils.atomic_io import atomic_write_bytes, atomic_write_json, flush_pending_writes, sync_now, sync_written_file
+
+
+# 索引中为每条执行记录保存的摘要字段，列表和统计只读取摘要；
+# 摘要另有 screenshots（各步骤的截图和视觉差异图路径），供保留策略统计截图的引用
+SUMMARY_FIELDS = ('id', 'test_case_id', 'test_case_name', 'status', 'start_time', 'end_time', 'duration',
+                  'total_steps', 'passed_steps', 'failed_steps')
+INDEX_VERSION = 2
+_SUMMARY_SET = set(SUMMARY_FIELDS)
+_SEGMENT_RE = re.compile(r'^segment_(\d+)\.jsonl$')
+# 旧版本每条执行记录单独保存为 <UUID>.json
+_LEGACY_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.json$')
+
+# 索引项：(段号, 偏移, 长度, 摘要)
+Entry = Tuple[int, int, int, Dict[str, Any]]
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class ExecutionLog:
+    """只追加的分段执行记录日志
+
+    执行记录以 JSON Lines 追加写入 log_dir/segment_<段号>.jsonl，每行为
+    {"op": "put", "id": ..., "execution": {...}} 或删除标记 {"op": "delete", "id": ...}，
+    同一ID以最后一行为准。当前段超过 segment_size 后换新段。内存中按ID保存 (段号, 偏移, 长度, 摘要)，
+    读取单条记录只读对应的一行，列表和统计只用摘要，不解析记录。
+
+    换段、压缩时把索引快照写入 log_dir/index.json，打开时加载快照后只读取快照之后追加的行。
+    压缩把仍有效的记录复制到新段后删除旧段，回收被覆盖和删除的记录占用的空间；
+    prune() 按时间和数量删除旧记录。写入时持有 log_dir/.lock 文件锁，多个进程可以共用同一个目录；
+    每次读写前检查段文件的变化，读到其他实例追加或压缩后的内容。
+    """
+
+    def __init__(self, log_dir: str, segment_size: int = 16 * 1024 * 1024, compact_ratio: Optional[float] = 0.5):
+        self.log_dir = log_dir
+        self.segment_size = segment_size
+        # 换段时无效数据占比达到该值则自动压缩，None 为不自动压缩
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Entry] = {}
+        # 段号 -> 已读取到的位置（最后一个完整行之后）
+        self._segments: Dict[int, int] = {}
+        # 小于该段号的段是压缩中断后残留的旧段，不再读取
+        self._first_segment = 1
+        os.makedirs(log_dir, exist_ok=True)
+        with self._lock:
+            self._load_index()
+            self._catch_up()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.log_dir, 'index.json')
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.log_dir, f"segment_{number:06d}.jsonl")
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.log_dir, '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        """加载索引快照；快照不存在或与段文件不符时从头读取所有段"""
+        self._entries, self._segments, self._first_segment = {}, {}, 1
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data['version'] != INDEX_VERSION:
+                return
+            segments = {int(number): size for number, size in data['segments'].items()}
+            for number, size in segments.items():
+                if os.path.getsize(self._segment_path(number)) < size:
+                    return
+            entries = {execution_id: tuple(entry) for execution_id, entry in data['entries'].items()}
+            first_segment = data['first_segment']
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._entries, self._segments, self._first_segment = entries, segments, first_segment
+
+    def _save_index(self):
+        atomic_write_json(self._index_path, {
+            'version': INDEX_VERSION,
+            'first_segment': self._first_segment,
+            'segments': {str(number): size for number, size in self._segments.items()},
+            'entries': self._entries
+        })
+
+    def _segment_sizes(self) -> Optional[Dict[int, int]]:
+        """磁盘上各段的大小；列出期间段被删除时返回None"""
+        sizes = {}
+        try:
+            for name in os.listdir(self.log_dir):
+                match = _SEGMENT_RE.match(name)
+                if match and int(match.group(1)) >= self._first_segment:
+                    sizes[int(match.group(1))] = os.path.getsize(os.path.join(self.log_dir, name))
+        except FileNotFoundError:
+            return None
+        return sizes
+
+    def _catch_up(self):
+        """读取新追加的行；已读取的段被删除或截断（其他实例压缩过）时重新加载索引"""
+        sizes = self._segment_sizes()
+        for attempt in range(2):
+            if sizes is not None and all(sizes.get(number, -1) >= size for number, size in self._segments.items()):
+                break
+            if attempt == 0:
+                self._load_index()
+            else:
+                self._entries, self._segments, self._first_segment = {}, {}, 1
+            sizes = self._segment_sizes()
+        for number in sorted(sizes or {}):
+            if sizes[number] > self._segments.get(number, 0):
+                self._scan(number, self._segments.get(number, 0))
+
+    def _scan(self, number: int, start: int):
+        with open(self._segment_path(number), 'rb') as f:
+            f.seek(start)
+            data = f.read()
+        # 只处理完整的行，末尾不完整的行可能正在写入或是崩溃时写了一半
+        end = data.rfind(b'\n') + 1
+        position = 0
+        while position < end:
+            newline = data.index(b'\n', position)
+            self._apply(number, start + position, data[position:newline + 1])
+            position = newline + 1
+        self._segments[number] = start + end
+
+    def _apply(self, number: int, offset: int, line: bytes):
+        try:
+            record = json.loads(line)
+            op, execution_id = record['op'], record['id']
+        except (ValueError, KeyError, TypeError):
+            print(f"跳过损坏的执行记录 segment_{number:06d}.jsonl@{offset}")
+            return
+        if op == 'put':
+            execution = record.get('execution') or {}
+            summary = {field: execution.get(field) for field in SUMMARY_FIELDS}
+            summary['screenshots'] = [path for step in execution.get('step_results') or []
+                                      for path in (step.get('screenshot_path'), step.get('diff_path')) if path]
+            self._entries[execution_id] = (number, offset, len(line), summary)
+        elif op == 'delete':
+            self._entries.pop(execution_id, None)
+
+    def _write(self, data: bytes) -> Tuple[int, int, bool]:
+        """追加到当前段，返回 (段号, 偏移, 是否换了新段)；调用方持有写锁且已调用 _catch_up"""
+        number = max(self._segments) if self._segments else self._first_segment
+        offset = self._segments.get(number, 0)
+        path = self._segment_path(number)
+        if os.path.exists(path) and os.path.getsize(path) != offset:
+            # 截掉崩溃时写了一半的行
+            os.truncate(path, offset)
+        rotated = offset > 0 and offset + len(data) > self.segment_size
+        if rotated:
+            # 换段前保存索引快照，之后打开时只需读取新段
+            self._save_index()
+            number, offset = number + 1, 0
+            path = self._segment_path(number)
+        with open(path, 'ab') as f:
+            f.write(data)
+        sync_written_file(path)
+        self._segments[number] = offset + len(data)
+        return number, offset, rotated
+
+    def append(self, execution: TestExecution):
+        """追加执行记录，同一ID的旧记录被覆盖"""
+        with self._write_lock():
+            self._catch_up()
+            if self._append(execution):
+                self._maybe_compact()
+
+    def _append(self, execution: TestExecution) -> bool:
+        """写入一条记录，返回是否换了新段；调用方持有写锁且已调用 _catch_up"""
+        summary = execution.model_dump(mode='json', include=_SUMMARY_SET)
+        summary['screenshots'] = [path for step in execution.step_results
+                                  for path in (step.screenshot_path, step.diff_path) if path]
+        # 由 pydantic-core 直接序列化记录，不经过中间字典
+        line = f'{{"op":"put","id":{json.dumps(execution.id)},"execution":{execution.model_dump_json()}}}\n'.encode('utf-8')
+        number, offset, rotated = self._write(line)
+        self._entries[execution.id] = (number, offset, len(line), summary)
+        return rotated
+
+    def _delete(self, execution_ids: List[str]):
+        """写入删除标记；调用方持有写锁"""
+        if not execution_ids:
+            return
+        data = ''.join(f'{{"op":"delete","id":{json.dumps(execution_id)}}}\n' for execution_id in execution_ids)
+        self._write(data.encode('utf-8'))
+        for execution_id in execution_ids:
+            self._entries.pop(execution_id, None)
+
+    def delete(self, execution_id: str) -> bool:
+        with self._write_lock():
+            self._catch_up()
+            if execution_id not in self._entries:
+                return False
+            self._delete([execution_id])
+            return True
+
+    def delete_many(self, execution_ids: List[str]) -> List[str]:
+        """删除多条执行记录，返回实际删除的ID"""
+        with self._write_lock():
+            self._catch_up()
+            return self._delete_many(execution_ids)
+
+    def _delete_many(self, execution_ids: List[str]) -> List[str]:
+        """删除其中存在的记录；调用方持有写锁且已调用 _catch_up（文件锁不可重入）"""
+        existing = [execution_id for execution_id in execution_ids if execution_id in self._entries]
+        self._delete(existing)
+        return existing
+
+    def get(self, execution_id: str) -> Optional[TestExecution]:
+        """读取一条执行记录，只读取该记录所在的行"""
+        with self._lock:
+            self._catch_up()
+            for attempt in range(2):
+                entry = self._entries.get(execution_id)
+                if entry is None:
+                    return None
+                number, offset, length, _ = entry
+                try:
+                    with open(self._segment_path(number), 'rb') as f:
+                        f.seek(offset)
+                        line = f.read(length)
+                    break
+                except FileNotFoundError:
+                    # 段刚被其他实例压缩删除
+                    if attempt:
+                        raise
+                    self._catch_up()
+        # 与 TestExecution.load_from_file 相同，解析后再校验
+        return TestExecution.model_validate(json.loads(line)['execution'])
+
+    def summary(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """一条执行记录的摘要，不解析记录"""
+        with self._lock:
+            self._catch_up()
+            entry = self._entries.get(execution_id)
+            return dict(entry[3]) if entry else None
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """所有执行记录的摘要（SUMMARY_FIELDS 和 screenshots），不解析记录"""
+        with self._lock:
+            self._catch_up()
+            return [dict(entry[3]) for entry in self._entries.values()]
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            self._catch_up()
+            return list(self._entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._catch_up()
+            return len(self._entries)
+
+    def __contains__(self, execution_id: str) -> bool:
+        with self._lock:
+            self._catch_up()
+            return execution_id in self._entries
+
+    def expired(self, max_age: Optional[timedelta] = None, max_count: Optional[int] = None,
+                now: Optional[datetime] = None) -> List[str]:
+        """开始时间早于 max_age 之前的记录，以及最新 max_count 条之外的记录的ID"""
+        with self._lock:
+            self._catch_up()
+            return self._expired(max_age, max_count, now)
+
+    def _expired(self, max_age: Optional[timedelta], max_count: Optional[int], now: Optional[datetime]) -> List[str]:
+        ordered = sorted(self._entries.items(), key=lambda item: item[1][3].get('start_time') or '', reverse=True)
+        cutoff = (now or datetime.now()) - max_age if max_age is not None else None
+        expired = []
+        for index, (execution_id, entry) in enumerate(ordered):
+            start_time = _parse_time(entry[3].get('start_time'))
+            if (max_count is not None and index >= max_count) or \
+                    (cutoff is not None and start_time is not None and start_time < cutoff):
+                expired.append(execution_id)
+        return expired
+
+    def prune(self, max_age: Optional[timedelta] = None, max_count: Optional[int] = None,
+              now: Optional[datetime] = None) -> List[str]:
+        """保留策略：删除 expired() 返回的记录，返回删除的ID
+
+        只写入删除标记，占用的空间在压缩后回收。
+        """
+        with self._write_lock():
+            self._catch_up()
+            return self._delete_many(self._expired(max_age, max_count, now))
+
+    def stats(self) -> Dict[str, Any]:
+        """记录数、段数、日志总字节数、有效记录字节数和无效数据占比"""
+        with self._lock:
+            self._catch_up()
+            total = sum(self._segments.values())
+            live = sum(entry[2] for entry in self._entries.values())
+            return {'executions': len(self._entries), 'segments': len(self._segments), 'total_bytes': total,
+                    'live_bytes': live, 'garbage_ratio': (total - live) / total if total else 0.0}
+
+    def _maybe_compact(self):
+        if self.compact_ratio is None:
+            return
+        total = sum(self._segments.values())
+        live = sum(entry[2] for entry in self._entries.values())
+        if total > self.segment_size and (total - live) / total >= self.compact_ratio:
+            self._compact()
+
+    def compact(self) -> int:
+        """压缩：有效记录复制到新段，删除旧段，返回回收的字节数"""
+        with self._write_lock():
+            self._catch_up()
+            return self._compact()
+
+    def _compact(self) -> int:
+        old_numbers = sorted(self._segments)
+        before = sum(os.path.getsize(self._segment_path(number)) for number in old_numbers)
+        by_segment: Dict[int, List[Tuple[str, Entry]]] = {}
+        for execution_id, entry in self._entries.items():
+            by_segment.setdefault(entry[0], []).append((execution_id, entry))
+
+        first_segment = current = (old_numbers[-1] + 1) if old_numbers else self._first_segment
+        entries: Dict[str, Entry] = {}
+        segments: Dict[int, int] = {}
+        buffer = bytearray()
+        for number in old_numbers:
+            records = sorted(by_segment.get(number, []), key=lambda item: item[1][1])
+            if not records:
+                continue
+            with open(self._segment_path(number), 'rb') as f:
+                data = f.read()
+            for execution_id, (_, offset, length, summary) in records:
+                if buffer and len(buffer) + length > self.segment_size:
+                    atomic_write_bytes(self._segment_path(current), bytes(buffer))
+                    segments[current] = len(buffer)
+                    current, buffer = current + 1, bytearray()
+                entries[execution_id] = (current, len(buffer), length, summary)
+                buffer += data[offset:offset + length]
+        atomic_write_bytes(self._segment_path(current), bytes(buffer))
+        segments[current] = len(buffer)
+        # 删除旧段前新段必须已落盘
+        flush_pending_writes()
+
+        self._entries, self._segments, self._first_segment = entries, segments, first_segment
+        self._save_index()
+        # 按段号从小到大删除：中途崩溃时不会出现删除标记已被删除、而被删除的记录还在的情况
+        for name in sorted(os.listdir(self.log_dir)):
+            match = _SEGMENT_RE.match(name)
+            if match and int(match.group(1)) < first_segment:
+                try:
+                    os.remove(os.path.join(self.log_dir, name))
+                except OSError:
+                    pass
+        return before - sum(segments.values())
+
+    def import_legacy(self, directory: str) -> int:
+        """导入旧版本的 <ID>.json 执行记录文件，返回新导入的条数
+
+        由 migrate 命令显式调用。全部记录写入并 fsync 所在的段之后才删除原文件：中途崩溃时原文件都还在，
+        重新执行时已在日志中的记录不再重复追加，可以安全地重复执行。
+        """
+        try:
+            names = sorted(name for name in os.listdir(directory) if _LEGACY_RE.match(name))
+        except FileNotFoundError:
+            return 0
+        if not names:
+            return 0
+
+        migrated, touched, rotated = [], set(), False
+        with self._write_lock():
+            self._catch_up()
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    execution = TestExecution.load_from_file(path)
+                except Exception as e:
+                    print(f"导入执行记录失败 {name}: {e}")
+                    continue
+                if execution.id not in self._entries:
+                    rotated = self._append(execution) or rotated
+                    touched.add(execution.id)
+                migrated.append(path)
+            for number in sorted({self._entries[execution_id][0] for execution_id in touched}):
+                sync_now(self._segment_path(number))
+            if rotated:
+                self._maybe_compact()
+
+        for path in migrated:
+            os.remove(path)
+        return len(touched)
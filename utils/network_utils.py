@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from utils.atomic_io import atomic_write_bytes
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Route
+
+
+@dataclass
+class NetworkConfig:
+    """浏览器网络路由配置
+
+    blocked_resource_types 为直接拦截的资源类型（Playwright 的 resource_type，如 image、font、media）；
+    blocked_hosts 为直接拦截的主机，同时匹配其子域名。
+    cache_resource_types 中的 GET 请求从磁盘缓存读取，缓存目录在多个浏览器上下文和多次运行之间共享。
+    """
+    blocked_resource_types: List[str] = field(default_factory=list)
+    blocked_hosts: List[str] = field(default_factory=list)
+    cache_enabled: bool = True
+    cache_dir: str = "data/http_cache"
+    cache_resource_types: List[str] = field(default_factory=lambda: ['stylesheet', 'script', 'image', 'font'])
+    default_ttl: int = 24 * 3600  # 响应没有 max-age 时的缓存秒数
+    max_entry_bytes: int = 10 * 1024 * 1024
+
+
+class HarMode(Enum):
+    """HAR 录制回放模式"""
+    OFF = "off"        # 使用实际网络
+    RECORD = "record"  # 使用实际网络并录制，覆盖已有录制
+    REPLAY = "replay"  # 从录制文件回放
+    AUTO = "auto"      # 有录制文件时回放，否则录制
+
+
+@dataclass
+class HarConfig:
+    """按测试用例录制和回放网络流量的配置
+
+    每个测试用例的录制文件为 har_dir/<测试用例ID>.har.zip（响应体作为附件打包）。
+    strict 为 True 时回放中未录制的请求直接中止，否则交给实际网络；
+    fallback_to_live 为 True 时回放模式下没有录制文件的测试用例按实际网络运行，否则报错。
+    url_pattern 只录制和回放匹配的URL（glob），为空时包括全部请求。
+    """
+    mode: HarMode = HarMode.OFF
+    har_dir: str = "data/har"
+    strict: bool = False
+    fallback_to_live: bool = True
+    url_pattern: Optional[str] = None
+
+    def har_path(self, test_case_id: str) -> str:
+        """测试用例的录制文件路径"""
+        return os.path.join(self.har_dir, f"{test_case_id}.har.zip")
+
+    def resolve(self, test_case_id: str) -> Tuple[HarMode, Optional[str]]:
+        """确定测试用例本次运行实际使用的模式 (RECORD/REPLAY/OFF, 录制文件路径)"""
+        if self.mode == HarMode.OFF:
+            return HarMode.OFF, None
+
+        path = self.har_path(test_case_id)
+        exists = os.path.exists(path)
+        if self.mode == HarMode.RECORD or (self.mode == HarMode.AUTO and not exists):
+            os.makedirs(self.har_dir, exist_ok=True)
+            return HarMode.RECORD, path
+        if exists:
+            return HarMode.REPLAY, path
+        if self.fallback_to_live:
+            return HarMode.OFF, None
+        raise FileNotFoundError(f"测试用例没有录制文件: {path}")
+
+
+class StaticAssetCache:
+    """静态资源磁盘缓存
+
+    每个URL对应一个响应体文件和一个元数据文件（状态码、响应头、过期时间），以URL的SHA-256命名。
+    写入时先写临时文件再重命名，多个进程同时读写同一目录也不会读到不完整的文件。
+    遵循 Cache-Control：no-store、no-cache、private 的响应不缓存，有 max-age 时按其过期。
+    """
+
+    # 响应体已由 Playwright 解码，回放时不能再带这些头
+    _DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+    def __init__(self, cache_dir: str = "data/http_cache", default_ttl: int = 24 * 3600,
+                 max_entry_bytes: int = 10 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+        self.max_entry_bytes = max_entry_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + '.json', base + '.body'
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """读取未过期的缓存响应 (status, headers, body)，未命中时返回None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('url') != url or meta.get('expires', 0) < time.time():
+                raise FileNotFoundError(meta_path)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            if len(body) != meta.get('size'):
+                raise FileNotFoundError(body_path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return meta['status'], meta['headers'], body
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        """写入缓存，不可缓存的响应返回False"""
+        headers = {name.lower(): value for name, value in headers.items()}
+        ttl = self.cache_ttl(headers.get('cache-control', ''), self.default_ttl)
+        if status != 200 or ttl <= 0 or len(body) > self.max_entry_bytes:
+            return False
+
+        meta = {
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name not in self._DROPPED_HEADERS},
+            'size': len(body),
+            'expires': time.time() + ttl
+        }
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # 先写响应体再写元数据，读到元数据时响应体一定完整
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        with self._lock:
+            self.stores += 1
+        return True
+
+    @staticmethod
+    def cache_ttl(cache_control: str, default_ttl: int) -> int:
+        """根据 Cache-Control 计算缓存秒数，不可缓存时返回0"""
+        directives = cache_control.lower()
+        if 'no-store' in directives or 'private' in directives or 'no-cache' in directives:
+            return 0
+        match = re.search(r'(?:s-maxage|max-age)\s*=\s*(\d+)', directives)
+        return int(match.group(1)) if match else default_ttl
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        atomic_write_bytes(path, data)
+
+    def clear(self):
+        """清空缓存目录"""
+        for root, _, files in os.walk(self.cache_dir):
+            for filename in files:
+                os.remove(os.path.join(root, filename))
+
+    def stats(self) -> Dict[str, int]:
+        """缓存命中统计"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'stores': self.stores}
+
+
+class NetworkRouter:
+    """浏览器上下文的网络路由层
+
+    拦截配置中的资源类型和主机，静态资源从共享的磁盘缓存返回，未命中时从网络获取后写入缓存。
+    同一个路由器可以挂到多个浏览器上下文上。
+    """
+
+    def __init__(self, config: Optional[NetworkConfig] = None, cache: Optional[StaticAssetCache] = None):
+        self.config = config or NetworkConfig()
+        if cache is None and self.config.cache_enabled:
+            cache = StaticAssetCache(self.config.cache_dir, self.config.default_ttl, self.config.max_entry_bytes)
+        self.cache = cache
+        self._blocked_types = {resource_type.lower() for resource_type in self.config.blocked_resource_types}
+        self._blocked_hosts = [host.lower().lstrip('.') for host in self.config.blocked_hosts]
+        self._cache_types = {resource_type.lower() for resource_type in self.config.cache_resource_types}
+        self.blocked = 0
+
+    @property
+    def active(self) -> bool:
+        """是否需要挂载路由（没有拦截规则且不缓存时不挂载，避免路由本身的开销）"""
+        return bool(self._blocked_types or self._blocked_hosts or self.cache)
+
+    async def attach(self, context: 'BrowserContext'):
+        """把路由挂到浏览器上下文"""
+        if self.active:
+            await context.route("**/*", self.handle)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """请求是否应被拦截"""
+        if resource_type.lower() in self._blocked_types:
+            return True
+        host = (urlsplit(url).hostname or '').lower()
+        return any(host == blocked or host.endswith('.' + blocked) for blocked in self._blocked_hosts)
+
+    def is_cacheable(self, method: str, url: str, resource_type: str) -> bool:
+        """请求是否走静态资源缓存"""
+        return (self.cache is not None and method.upper() == 'GET' and
+                resource_type.lower() in self._cache_types and urlsplit(url).scheme in ('http', 'https'))
+
+    async def handle(self, route: 'Route'):
+        """路由处理函数"""
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked += 1
+            await route.abort('blockedbyclient')
+            return
+
+        if not self.is_cacheable(request.method, request.url, request.resource_type):
+            await route.continue_()
+            return
+
+        cached = self.cache.get(request.url)
+        if cached:
+            status, headers, body = cached
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception:
+            # 获取失败时交给浏览器按原样处理
+            await route.continue_()
+            return
+        self.cache.put(request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    def stats(self) -> Dict[str, Any]:
+        """路由统计：拦截数和缓存命中情况"""
+        stats: Dict[str, Any] = {'blocked': self.blocked}
+        if self.cache:
+            stats.update(self.cache.stats())
+        return stats
@@ -0,0 +1,93 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ObjectCache:
+    """模型对象缓存
+
+    按文件路径缓存从JSON文件加载的 PageStructure、TestCase 等对象，记录加载时文件的
+    修改时间和大小，文件被外部修改后自动重新加载。超过 max_entries 时淘汰最久未使用的对象。
+    缓存中的对象由多个调用方共享，只读使用；需要修改时应先复制。
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(filepath: str) -> Optional[Tuple[int, int]]:
+        """文件签名（修改时间, 大小），文件不存在时返回None"""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get_or_load(self, filepath: str, loader: Callable[[str], Any]) -> Optional[Any]:
+        """获取缓存对象，未命中或文件已变化时调用 loader 重新加载；文件不存在时返回None"""
+        key = os.path.abspath(filepath)
+        signature = self._signature(key)
+        if signature is None:
+            self.invalidate(filepath)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        obj = loader(filepath)
+        self._store(key, signature, obj)
+        return obj
+
+    def put(self, filepath: str, obj: Any):
+        """写入后更新缓存（write-through）"""
+        key = os.path.abspath(filepath)
+        signature = self._signature(key)
+        if signature is None:
+            self.invalidate(filepath)
+            return
+        self._store(key, signature, obj)
+
+    def invalidate(self, filepath: str):
+        """使缓存失效"""
+        with self._lock:
+            self._entries.pop(os.path.abspath(filepath), None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """缓存统计信息"""
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries, 'hits': self.hits, 'misses': self.misses}
+
+    def _store(self, key: str, signature: Tuple[int, int], obj: Any):
+        with self._lock:
+            self._entries[key] = (signature, obj)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_object_cache: Optional[ObjectCache] = None
+
+
+def get_object_cache() -> ObjectCache:
+    """获取核心模块共享的对象缓存"""
+    global _object_cache
+    if _object_cache is None:
+        _object_cache = ObjectCache()
+    return _object_cache
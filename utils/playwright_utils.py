@@ -1,30 +1,82 @@
 import asyncio
 import json
 import os
-from typing import List, Dict, Any, Optional
-from playwright.async_api import async_playwright, Browser, Page, ElementHandle
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from models.page_node import PageNode, NodeType, PageStructure
+from utils.tracing import trace_span, traced
+from utils.screenshot_store import ScreenshotStore
 import uuid
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
+    from utils.network_utils import NetworkRouter
+
 
 class PlaywrightUtils:
     """Playwright工具类"""
 
-    def __init__(self):
-        self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+    def __init__(self, network_router: Optional['NetworkRouter'] = None,
+                 screenshot_store: Optional[ScreenshotStore] = None):
+        self.browser: Optional['Browser'] = None
+        self.context: Optional['BrowserContext'] = None
+        self.page: Optional['Page'] = None
+        # 挂到浏览器上下文的网络路由（拦截资源、静态资源缓存）
+        self.network_router = network_router
+        # 截图按内容寻址保存，重复的截图只写一次
+        self.screenshot_store = screenshot_store or ScreenshotStore()
+
+    async def start_browser(self, headless: bool = False, storage_state: Optional[str] = None):
+        """启动浏览器
+
+        storage_state 为已登录状态文件（cookies 和 localStorage），加载后新页面直接处于登录状态。
+        """
+        # 延迟导入playwright，避免仅使用数据接口时的导入开销
+        from playwright.async_api import async_playwright
+
+        with trace_span("browser_launch", "browser", headless=headless):
+            self.playwright = await async_playwright().start()
+            # devtools=True 会强制关闭无头模式，仅在有头模式下打开
+            self.browser = await self.playwright.chromium.launch(headless=headless, devtools=not headless)
+            self.context = await self.browser.new_context(storage_state=storage_state)
+            if self.network_router:
+                await self.network_router.attach(self.context)
+            self.page = await self.context.new_page()
+
+    async def use_har(self, har_path: str, update: bool = False, strict: bool = False, url: Optional[str] = None):
+        """在当前浏览器上下文中录制（update=True）或回放 HAR
+
+        回放时 strict 为 True 则未录制的请求直接中止，否则继续交给其他路由和实际网络。
+        录制的内容在关闭浏览器上下文时写入文件。
+        """
+        if not self.context:
+            raise Exception("浏览器未启动")
 
-    async def start_browser(self, headless: bool = False):
-        """启动浏览器"""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=headless, devtools=True)
-        self.page = await self.browser.new_page()
+        await self.context.route_from_har(
+            har_path,
+            url=url,
+            not_found='abort' if strict else 'fallback',
+            update=update
+        )
+
+    async def take_screenshot(self, store: Optional[ScreenshotStore] = None, exact: bool = False) -> str:
+        """截取当前页面，保存到截图存储，返回截图路径；exact 见 ScreenshotStore.put"""
+        with trace_span("screenshot", "screenshot"):
+            data = await self.page.screenshot()
+            return (store or self.screenshot_store).put(data, exact=exact)
+
+    async def get_storage_state(self) -> Dict[str, Any]:
+        """获取当前浏览器上下文的 cookies 和 localStorage"""
+        if not self.context:
+            raise Exception("浏览器未启动")
+        return await self.context.storage_state()
 
     async def close_browser(self):
         """关闭浏览器"""
         if self.page:
             await self.page.close()
+        if self.context:
+            await self.context.close()
         if self.browser:
             await self.browser.close()
         if hasattr(self, 'playwright'):
@@ -35,55 +87,66 @@ class PlaywrightUtils:
         if not self.page:
             raise Exception("浏览器未启动")
 
-        await self.page.goto(url)
-        title = await self.page.title()
+        with trace_span("navigate", "navigation", url=url):
+            await self.page.goto(url)
+            title = await self.page.title()
         return title
 
-    async def parse_page_structure(self, url: str, screenshot_dir: str = "data/screenshots") -> PageStructure:
-        """解析页面结构"""
+    async def parse_page_structure(self, url: str, screenshot_dir: Optional[str] = None) -> PageStructure:
+        """解析页面结构：导航一次、截图一次、提取一次
+
+        截图默认保存到 screenshot_store 的目录。只提取节点，不收集表单结构信息（见 extract_form_structure）。
+        """
         if not self.page:
             raise Exception("浏览器未启动")
 
         try:
             # 导航到页面
-            title = await self.navigate_to_page(url)
-
-            # 创建截图目录
-            os.makedirs(screenshot_dir, exist_ok=True)
+            with trace_span("navigate", "navigation", url=url):
+                await self.page.goto(url)
 
             # 截图
-            screenshot_filename = f"{uuid.uuid4()}.png"
-            screenshot_path = os.path.join(screenshot_dir, screenshot_filename)
-            await self.page.screenshot(path=screenshot_path)
+            store = self.screenshot_store
+            if screenshot_dir and os.path.abspath(screenshot_dir) != os.path.abspath(store.directory):
+                store = ScreenshotStore(screenshot_dir, store.perceptual_distance)
+            screenshot_path = await self.take_screenshot(store)
 
             # 解析页面节点
-            nodes = await self._extract_page_nodes(url)
+            page_data = await self._extract_page_data(url, include_forms=False)
 
             # 创建页面结构
-            page_structure = PageStructure(
+            return PageStructure(
                 id=str(uuid.uuid4()),
                 url=url,
-                title=title,
-                nodes=nodes,
+                title=page_data['title'],
+                nodes=page_data['nodes'],
                 screenshot_path=screenshot_path
             )
 
-            return page_structure
-
         except Exception as e:
             print(f"页面解析错误: {str(e)}")
             raise
 
     async def _extract_page_nodes(self, url: str) -> List[PageNode]:
         """提取页面节点 - 重点提取可测试的节点（表单、按钮、输入框等）"""
+        return (await self._extract_page_data(url))['nodes']
+
+    async def _extract_page_data(self, url: str, include_forms: bool = True) -> Dict[str, Any]:
+        """在一次 page.evaluate 中提取页面标题、表单元数据和表单内的节点
+
+        只抓取表单本身及表单内部的输入框、下拉框、文本域和按钮，表单外部的元素在浏览器中就被过滤掉。
+        include_forms 为 False 时不收集表单元数据，forms 为空列表。
+        返回 { title, forms: [表单元数据], nodes: [PageNode] }
+        """
         if not self.page:
-            return []
+            return {'title': '', 'forms': [], 'nodes': []}
 
         try:
             # 只抓取表单内部的元素，过滤掉表单外部的元素
-            elements_data = await self.page.evaluate("""
-                () => {
+            page_data = await traced(self.page.evaluate("""
+                (withForms) => {
                     const data = [];
+                    const formStructures = [];
                     let index = 0;
 
                     // 查找所有表单
@@ -189,6 +252,20 @@ class PlaywrightUtils:
                         const formId = formData.id;
                         index++;
 
+                        // 表单元数据，字段和按钮的ID与节点ID一致
+                        const formStructure = {
+                            formId: formId,
+                            formName: form.getAttribute('name') || '',
+                            formAction: form.action || '',
+                            formMethod: form.method || 'get',
+                            formEnctype: form.enctype || 'application/x-www-form-urlencoded',
+                            formFields: [],
+                            formButtons: []
+                        };
+                        if (withForms) {
+                            formStructures.push(formStructure);
+                        }
+
                         // 获取表单内部的所有输入元素
                         const formElements = form.querySelectorAll('input, select, textarea, button');
                         formElements.forEach((element) => {
@@ -226,6 +303,31 @@ class PlaywrightUtils:
                                     textContent = textContent.substring(0, 200) + '...';
                                 }
 
+                                // 下拉框的选项
+                                const options = element.tagName === 'SELECT' ?
+                                    Array.from(element.options).map(option => ({
+                                        value: option.value,
+                                        text: option.textContent.trim(),
+                                        disabled: option.disabled
+                                    })) : [];
+
+                                // 输入约束
+                                const constraints = {};
+                                for (const name of ['min', 'max', 'step', 'pattern']) {
+                                    if (element.hasAttribute(name)) {
+                                        constraints[name] = element.getAttribute(name);
+                                    }
+                                }
+                                if (element.maxLength >= 0) {
+                                    constraints.maxlength = element.maxLength;
+                                }
+                                if (element.minLength > 0) {
+                                    constraints.minlength = element.minLength;
+                                }
+                                if (element.required) {
+                                    constraints.required = true;
+                                }
+
                                 // 获取子元素ID列表
                                 const children = [];
                                 for (let child of element.children) {
@@ -254,23 +356,68 @@ class PlaywrightUtils:
                                         y: Math.round(rect.top)
                                     },
                                     parent_id: formId,
-                                    children: children
+                                    children: children,
+                                    options: options,
+                                    constraints: constraints
                                 };
 
                                 data.push(elementData);
                                 index++;
+
+                                const isButton = element.tagName === 'BUTTON' ||
+                                                 ['submit', 'button', 'reset'].includes(element.type);
+                                if (withForms && isButton) {
+                                    formStructure.formButtons.push({
+                                        id: elementData.id,
+                                        name: element.name || '',
+                                        type: element.type || 'button',
+                                        text: textContent || element.value || '',
+                                        disabled: element.disabled || false
+                                    });
+                                }
+                                if (withForms && element.tagName !== 'BUTTON') {
+                                    const field = {
+                                        id: elementData.id,
+                                        name: element.name || '',
+                                        type: element.type || element.tagName.toLowerCase(),
+                                        placeholder: element.placeholder || '',
+                                        required: element.required || false,
+                                        disabled: element.disabled || false,
+                                        value: element.value || '',
+                                        options: element.tagName === 'SELECT' ?
+                                            Array.from(element.options).map(option => ({
+                                                value: option.value,
+                                                text: option.textContent.trim(),
+                                                selected: option.selected
+                                            })) : []
+                                    };
+
+                                    // 对于checkbox和radio，提取选项组
+                                    if ((element.type === 'checkbox' || element.type === 'radio') && element.name) {
+                                        const sameNameInputs = Array.from(form.querySelectorAll('input'))
+                                            .filter(input => input.name === element.name);
+                                        if (sameNameInputs.length > 1) {
+                                            field.group = sameNameInputs.map(input => ({
+                                                value: input.value,
+                                                text: input.nextElementSibling?.textContent?.trim() || input.value,
+                                                checked: input.checked
+                                            }));
+                                        }
+                                    }
+                                    formStructure.formFields.push(field);
+                                }
                             } catch (error) {
                                 // 忽略单个元素错误
                             }
                         });
                     });
 
-                    return data;
+                    return { title: document.title, forms: formStructures, elements: data };
                 }
-            """)
+            """, include_forms), "extract_nodes", "extraction")
 
             nodes = []
-            for element_data in elements_data:
+            for element_data in page_data['elements']:
                 try:
                     node_type = self._determine_node_type(
                         element_data['tag_name'],
@@ -290,16 +437,18 @@ class PlaywrightUtils:
                         position=element_data['position'],
                         parent_id=element_data['parent_id'],
                         children=element_data['children'],
+                        options=element_data.get('options', []),
+                        constraints=element_data.get('constraints', {}),
                         page_url=url
                     )
                     nodes.append(node)
                 except Exception as e:
                     print(f"转换节点数据失败: {e}")
                     continue
-            return nodes
+            return {'title': page_data['title'], 'forms': page_data['forms'], 'nodes': nodes}
         except Exception as e:
             print(f"提取页面节点失败: {str(e)}")
-            return []
+            return {'title': '', 'forms': [], 'nodes': []}
 
     def _determine_node_type(self, tag_name: str, attributes: Dict[str, str]) -> NodeType:
         """确定节点类型 - 重点识别表单和可测试元素"""
@@ -376,75 +525,289 @@ class PlaywrightUtils:
         }
 
         try:
-            if action == 'click':
-                await self.page.click(target_selector)
-            elif action == 'fill':
-                await self.page.fill(target_selector, input_data)
-            elif action == 'type':
-                await self.page.type(target_selector, input_data)
-            elif action == 'select_option':
-                await self.page.select_option(target_selector, input_data)
-            elif action == 'check':
-                await self.page.check(target_selector)
-            elif action == 'uncheck':
-                await self.page.uncheck(target_selector)
-            elif action == 'navigate':
-                await self.page.goto(input_data)
-            elif action == 'wait':
-                await self.page.wait_for_timeout(wait_time * 1000)
-            elif action == 'wait_for_element':
-                await self.page.wait_for_selector(target_selector)
-            else:
-                raise Exception(f"不支持的操作类型: {action}")
+            with trace_span(action or 'unknown', "playwright", selector=target_selector):
+                if action == 'click':
+                    await self.page.click(target_selector)
+                elif action == 'fill':
+                    await self.page.fill(target_selector, input_data)
+                elif action == 'type':
+                    await self.page.type(target_selector, input_data)
+                elif action == 'select_option':
+                    await self.page.select_option(target_selector, input_data)
+                elif action == 'check':
+                    await self.page.check(target_selector)
+                elif action == 'uncheck':
+                    await self.page.uncheck(target_selector)
+                elif action == 'navigate':
+                    await self.page.goto(input_data)
+                elif action == 'wait':
+                    await self.page.wait_for_timeout(wait_time * 1000)
+                elif action == 'wait_for_element':
+                    await self.page.wait_for_selector(target_selector)
+                else:
+                    raise Exception(f"不支持的操作类型: {action}")
 
             # 等待指定时间
             if wait_time > 0:
-                await self.page.wait_for_timeout(wait_time * 1000)
+                with trace_span("wait", "wait", seconds=wait_time):
+                    await self.page.wait_for_timeout(wait_time * 1000)
 
             # 获取输出数据
             if action in ['fill', 'type', 'select_option']:
-                result['output_data'] = await self.page.input_value(target_selector)
+                with trace_span("input_value", "playwright", selector=target_selector):
+                    result['output_data'] = await self.page.input_value(target_selector)
 
         except Exception as e:
             result['status'] = 'error'
             result['message'] = str(e)
 
-        # 截图
-        screenshot_filename = f"step_{uuid.uuid4()}.png"
-        screenshot_path = os.path.join("data/screenshots", screenshot_filename)
-        os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-        await self.page.screenshot(path=screenshot_path)
-        result['screenshot_path'] = screenshot_path
+        # 截图（连续填写多个字段时可以只在最后一步截图）
+        if step_data.get('screenshot', True):
+            result['screenshot_path'] = await self.take_screenshot(exact=step_data.get('exact_screenshot', False))
 
         return result
 
+    async def fill_form(self, fields: List[Dict[str, Any]], submit: bool = True,
+                        submit_selector: Optional[str] = None, wait_time: float = 1.0,
+                        exact_screenshot: bool = False) -> Dict[str, Any]:
+        """在一次 page.evaluate 中填写表单的所有字段，并读取各字段填写后的状态，然后提交一次
+
+        fields 为 [{selector, action, value}]，action 为 fill / select_option / check / uncheck。
+        有 submit_selector 时点击该按钮提交，否则提交第一个字段所在的表单。
+        exact_screenshot 为 True 时截图不复用近似的已有截图（见 ScreenshotStore.put）。
+        submitted 为实际提交的结果（见 _submit_outcome），不提交或未能提交时 submit_message 说明原因。
+        返回 { status, message, fields: {selector: {value, checked, visible, enabled, error}}, submitted, submit_message, screenshot_path }
+        """
+        if not self.page:
+            raise Exception("浏览器未启动")
+
+        result = {
+            'status': 'success',
+            'message': '',
+            'fields': {},
+            'submitted': False,
+            'submit_message': '',
+            'screenshot_path': None
+        }
+
+        # 提交后主框架的导航和页面脚本发出的写请求，用于确认提交确实发生
+        requests = {'navigation': False, 'script': False}
+        main_frame = self.page.main_frame
+
+        def on_request(request):
+            if request.resource_type == 'document' and request.frame == main_frame:
+                requests['navigation'] = True
+            elif request.resource_type in ('xhr', 'fetch') and request.method != 'GET':
+                requests['script'] = True
+
+        if submit:
+            self.page.on('request', on_request)
+        try:
+            data = await traced(self.page.evaluate("""
+                ({fields, submit, submitSelector}) => {
+                    const find = (selector) => {
+                        if (selector.startsWith('/') || selector.startsWith('(')) {
+                            return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                        }
+                        return document.querySelector(selector);
+                    };
+
+                    // 通过原型上的 setter 赋值，受控组件（如 React）才能感知到变化
+                    const setValue = (element, value) => {
+                        const proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype :
+                                      element instanceof HTMLSelectElement ? HTMLSelectElement.prototype :
+                                      HTMLInputElement.prototype;
+                        Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, value);
+                    };
+
+                    const states = {};
+                    let form = null;
+                    for (const field of fields) {
+                        const state = {value: null, checked: null, visible: false, enabled: false, error: null};
+                        states[field.selector] = state;
+
+                        let element = null;
+                        try {
+                            element = find(field.selector);
+                        } catch (error) {
+                            state.error = `选择器无效: ${error.message}`;
+                            continue;
+                        }
+                        if (!element) {
+                            state.error = `未找到元素: ${field.selector}`;
+                            continue;
+                        }
+                        form = form || element.form || element.closest('form');
+
+                        try {
+                            const value = field.value === null || field.value === undefined ? '' : String(field.value);
+                            if (field.action === 'fill') {
+                                setValue(element, value);
+                            } else if (field.action === 'select_option') {
+                                // 与 select_option 一致：先按值匹配，再按选项文本匹配
+                                const option = Array.from(element.options || []).find(o => o.value === value) ||
+                                               Array.from(element.options || []).find(o => o.textContent.trim() === value);
+                                if (option) {
+                                    setValue(element, option.value);
+                                } else {
+                                    state.error = `未找到选项: ${value}`;
+                                }
+                            } else if (field.action === 'check' || field.action === 'uncheck') {
+                                element.checked = field.action === 'check';
+                            } else {
+                                state.error = `不支持的操作类型: ${field.action}`;
+                            }
+                            element.dispatchEvent(new Event('input', {bubbles: true}));
+                            element.dispatchEvent(new Event('change', {bubbles: true}));
+                        } catch (error) {
+                            state.error = error.message;
+                        }
+
+                        const rect = element.getBoundingClientRect();
+                        const style = window.getComputedStyle(element);
+                        state.visible = rect.width > 0 && rect.height > 0 &&
+                                        style.visibility !== 'hidden' && style.display !== 'none';
+                        state.enabled = !element.disabled;
+                        state.value = 'value' in element ? element.value : null;
+                        state.checked = 'checked' in element ? element.checked : null;
+                    }
+
+                    // 记录提交的实际结果：submit 事件是否派发、是否被页面脚本取消，以及 HTML5 校验未通过的字段
+                    const outcome = {attempted: false, disabled: false, direct: false, event: null, invalid: []};
+                    window.__aiTestSubmit = outcome;
+                    if (!window.__aiTestSubmitHooks) {
+                        window.__aiTestSubmitHooks = true;
+                        window.addEventListener('submit', (event) => {
+                            window.__aiTestSubmit.event = window.__aiTestSubmit.event || event;
+                        }, {capture: true});
+                        window.addEventListener('invalid', (event) => {
+                            const target = event.target;
+                            window.__aiTestSubmit.invalid.push(target.name || target.id || target.tagName.toLowerCase());
+                        }, {capture: true});
+                    }
+
+                    if (submit) {
+                        const button = submitSelector ? find(submitSelector) : null;
+                        if (button || form) {
+                            outcome.attempted = true;
+                            outcome.disabled = !!(button && button.disabled);
+                            // 延迟到返回结果之后再提交，避免页面跳转销毁当前执行上下文
+                            setTimeout(() => {
+                                if (button) {
+                                    button.click();
+                                } else if (form.requestSubmit) {
+                                    form.requestSubmit();
+                                } else {
+                                    // 不派发 submit 事件，也不做校验
+                                    outcome.direct = true;
+                                    form.submit();
+                                }
+                            }, 0);
+                        }
+                    }
+
+                    return {fields: states, attempted: outcome.attempted};
+                }
+            """, {'fields': fields, 'submit': submit, 'submitSelector': submit_selector}), "fill_form", "playwright", fields=len(fields))
+
+            result['fields'] = data['fields']
+
+            with trace_span("wait", "wait", seconds=wait_time):
+                if wait_time > 0:
+                    await self.page.wait_for_timeout(wait_time * 1000)
+                if submit:
+                    outcome = None
+                    if data['attempted']:
+                        try:
+                            outcome = await self.page.evaluate("""() => {
+                                const o = window.__aiTestSubmit;
+                                return o ? {attempted: o.attempted, disabled: o.disabled, direct: o.direct, invalid: o.invalid,
+                                            dispatched: !!o.event, prevented: !!(o.event && o.event.defaultPrevented)} : null;
+                            }""")
+                        except Exception:
+                            # 提交引起的跳转销毁了原页面的执行上下文
+                            outcome = None
+                    result['submitted'], result['submit_message'] = self._submit_outcome(
+                        data['attempted'], outcome, requests['navigation'], requests['script'])
+
+                # 等待提交引起的页面跳转完成
+                if result['submitted']:
+                    try:
+                        await self.page.wait_for_load_state('load', timeout=10000)
+                    except Exception:
+                        pass
+
+        except Exception as e:
+            result['status'] = 'error'
+            result['message'] = str(e)
+        finally:
+            if submit:
+                self.page.remove_listener('request', on_request)
+
+        # 整个表单只截图一次
+        try:
+            result['screenshot_path'] = await self.take_screenshot(exact=exact_screenshot)
+        except Exception as e:
+            print(f"表单截图失败: {e}")
+
+        return result
+
+    @staticmethod
+    def _submit_outcome(attempted: bool, outcome: Optional[Dict[str, Any]], navigated: bool,
+                        script_request: bool) -> Tuple[bool, str]:
+        """根据页面记录的提交过程和观察到的请求判断表单是否实际提交，返回 (是否提交, 未提交的原因)
+
+        submit 事件派发且未被取消，或者主框架发生了导航，视为已提交；事件被页面脚本取消时，
+        只有脚本随后发出了写请求（xhr/fetch 的非 GET 请求）才视为已提交。
+        """
+        if not attempted:
+            return False, "未找到提交按钮或表单"
+        if outcome is None:
+            # 读取结果前页面已跳转
+            return (True, "") if navigated else (False, "无法确认提交结果")
+        if navigated or outcome.get('direct'):
+            return True, ""
+        if outcome.get('disabled'):
+            return False, "提交按钮不可用"
+        if not outcome.get('dispatched'):
+            if outcome.get('invalid'):
+                return False, f"表单校验未通过: {', '.join(outcome['invalid'])}"
+            return False, "未触发表单提交"
+        if outcome.get('prevented') and not script_request:
+            return False, "提交被页面脚本取消"
+        return True, ""
+
     async def get_element_text(self, selector: str) -> str:
         """获取元素文本"""
         if not self.page:
             raise Exception("浏览器未启动")
 
-        return await self.page.text_content(selector)
+        with trace_span("text_content", "playwright", selector=selector):
+            return await self.page.text_content(selector)
 
     async def get_element_attribute(self, selector: str, attribute: str) -> str:
         """获取元素属性"""
         if not self.page:
             raise Exception("浏览器未启动")
 
-        return await self.page.get_attribute(selector, attribute)
+        with trace_span("get_attribute", "playwright", selector=selector):
+            return await self.page.get_attribute(selector, attribute)
 
     async def is_element_visible(self, selector: str) -> bool:
         """检查元素是否可见"""
         if not self.page:
             raise Exception("浏览器未启动")
 
-        return await self.page.is_visible(selector)
+        with trace_span("is_visible", "playwright", selector=selector):
+            return await self.page.is_visible(selector)
 
     async def wait_for_element(self, selector: str, timeout: int = 30000):
         """等待元素出现"""
         if not self.page:
             raise Exception("浏览器未启动")
 
-        await self.page.wait_for_selector(selector, timeout=timeout)
+        with trace_span("wait_for_selector", "wait", selector=selector):
+            await self.page.wait_for_selector(selector, timeout=timeout)
 
     async def highlight_element(self, selector: str) -> bool:
         """高亮页面上被选择器选中的节点（优先用 JS outline）"""
@@ -469,93 +832,14 @@ class PlaywrightUtils:
 
         try:
             # 导航到页面
-            await self.navigate_to_page(url)
-
-            # 执行JavaScript提取表单信息
-            form_data = await self.page.evaluate("""
-                () => {
-                    const forms = document.querySelectorAll('form');
-                    const formStructures = [];
-
-                    forms.forEach((form, formIndex) => {
-                        const formStructure = {
-                            formId: form.id || `form_${formIndex}`,
-                            formName: form.name || '',
-                            formAction: form.action || '',
-                            formMethod: form.method || 'get',
-                            formEnctype: form.enctype || 'application/x-www-form-urlencoded',
-                            formFields: [],
-                            formButtons: []
-                        };
-
-                        // 提取表单字段
-                        const inputs = form.querySelectorAll('input, select, textarea');
-                        inputs.forEach((input, inputIndex) => {
-                            const field = {
-                                id: input.id || `field_${formIndex}_${inputIndex}`,
-                                name: input.name || '',
-                                type: input.type || input.tagName.toLowerCase(),
-                                placeholder: input.placeholder || '',
-                                required: input.required || false,
-                                disabled: input.disabled || false,
-                                value: input.value || '',
-                                options: []
-                            };
-
-                            // 对于select元素，提取选项
-                            if (input.tagName === 'SELECT') {
-                                const options = input.querySelectorAll('option');
-                                options.forEach(option => {
-                                    field.options.push({
-                                        value: option.value,
-                                        text: option.textContent.trim(),
-                                        selected: option.selected
-                                    });
-                                });
-                            }
-
-                            // 对于checkbox和radio，提取选项组
-                            if (input.type === 'checkbox' || input.type === 'radio') {
-                                const name = input.name;
-                                if (name) {
-                                    const sameNameInputs = form.querySelectorAll(`input[name="${name}"]`);
-                                    if (sameNameInputs.length > 1) {
-                                        field.group = Array.from(sameNameInputs).map(inp => ({
-                                            value: inp.value,
-                                            text: inp.nextElementSibling?.textContent?.trim() || inp.value,
-                                            checked: inp.checked
-                                        }));
-                                    }
-                                }
-                            }
-
-                            formStructure.formFields.push(field);
-                        });
-
-                        // 提取表单按钮
-                        const buttons = form.querySelectorAll('button, input[type="submit"], input[type="button"], input[type="reset"]');
-                        buttons.forEach((button, buttonIndex) => {
-                            const buttonInfo = {
-                                id: button.id || `button_${formIndex}_${buttonIndex}`,
-                                name: button.name || '',
-                                type: button.type || 'button',
-                                text: button.textContent?.trim() || button.value || '',
-                                disabled: button.disabled || false
-                            };
-                            formStructure.formButtons.push(buttonInfo);
-                        });
-
-                        formStructures.push(formStructure);
-                    });
-
-                    return formStructures;
-                }
-            """)
+            await self.page.goto(url)
 
+            # 表单信息与节点在同一次提取中得到
+            page_data = await self._extract_page_data(url)
             return {
                 'url': url,
-                'title': await self.page.title(),
-                'forms': form_data
+                'title': page_data['title'],
+                'forms': page_data['forms']
             }
 
         except Exception as e:
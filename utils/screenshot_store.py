@@ -0,0 +1,130 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from utils.atomic_io import atomic_write_bytes, atomic_write_json
+
+# 感知哈希索引文件（以 . 开头，保留策略扫描截图时跳过）
+PERCEPTUAL_INDEX = ".perceptual_index.json"
+
+
+def perceptual_hash(data: bytes) -> int:
+    """64 位差值哈希（dHash）：灰度缩小到 9x8，每行比较相邻像素的亮度
+
+    内容相同、只有少量像素不同（光标闪烁、抗锯齿、时间戳）的截图哈希相同或只差几位。需要 Pillow。
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("感知哈希需要安装 Pillow: pip install Pillow") from e
+
+    with Image.open(io.BytesIO(data)) as image:
+        pixels = list(image.convert('L').resize((9, 8), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] < pixels[row * 9 + col + 1])
+    return value
+
+
+class ScreenshotStore:
+    """按内容寻址的截图存储
+
+    截图以内容的 SHA-256 命名（<目录>/<哈希>.png），内容相同的截图只写一次，步骤结果的 screenshot_path
+    直接指向共享的文件；多条执行记录引用同一文件时，保留策略在最后一个引用删除后才删除它。
+    重复使用已有文件时更新其修改时间，按时间回收时视为新截图。
+
+    perceptual_distance 不为 None 时另按感知哈希合并近似截图：与已存截图的哈希相差不超过该位数时
+    直接引用已存的截图，不再写入（被引用的是先存的那张）。感知哈希索引保存在目录下的 .perceptual_index.json，
+    多个进程同时写入时可能丢失部分索引项，只影响合并率。
+    """
+
+    def __init__(self, directory: str = "data/screenshots", perceptual_distance: Optional[int] = None):
+        self.directory = directory
+        self.perceptual_distance = perceptual_distance
+        self._lock = threading.Lock()
+        # 感知哈希 -> 文件名，首次使用时从索引文件加载
+        self._perceptual_index: Optional[Dict[int, str]] = None
+        self.stats = {'writes': 0, 'exact_hits': 0, 'perceptual_hits': 0, 'bytes_written': 0, 'bytes_saved': 0}
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.png")
+
+    def put(self, data: bytes, exact: bool = False) -> str:
+        """保存截图，返回其路径；已有相同（或近似）内容的截图时直接返回已有路径
+
+        exact 为 True 时只复用内容完全相同的截图（视觉对比需要本次截图的原样内容）。
+        """
+        path = self.path_for(hashlib.sha256(data).hexdigest())
+        with self._lock:
+            if self._reuse(path):
+                self.stats['exact_hits'] += 1
+                self.stats['bytes_saved'] += len(data)
+                return path
+
+            phash = None
+            if self.perceptual_distance is not None:
+                phash = perceptual_hash(data)
+                similar = None if exact else self._find_similar(phash)
+                if similar is not None:
+                    self.stats['perceptual_hits'] += 1
+                    self.stats['bytes_saved'] += len(data)
+                    return similar
+
+            atomic_write_bytes(path, data)
+            self.stats['writes'] += 1
+            self.stats['bytes_written'] += len(data)
+            if phash is not None:
+                if self._perceptual_index is None:
+                    self._perceptual_index = self._read_perceptual_index()
+                self._perceptual_index[phash] = os.path.basename(path)
+                self._save_perceptual_index()
+            return path
+
+    @staticmethod
+    def _reuse(path: str) -> bool:
+        """文件存在时更新修改时间并返回 True"""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, PERCEPTUAL_INDEX)
+
+    def _read_perceptual_index(self) -> Dict[int, str]:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return {int(key, 16): name for key, name in json.load(f).items()}
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_perceptual_index(self):
+        # 合并其他进程写入的索引项
+        index = self._read_perceptual_index()
+        index.update(self._perceptual_index)
+        self._perceptual_index = index
+        atomic_write_json(self._index_path(), {f"{key:016x}": name for key, name in index.items()})
+
+    def _find_similar(self, phash: int) -> Optional[str]:
+        if self._perceptual_index is None:
+            self._perceptual_index = self._read_perceptual_index()
+        name = self._perceptual_index.get(phash)
+        if name is None and self.perceptual_distance > 0:
+            best = self.perceptual_distance + 1
+            for key, candidate in self._perceptual_index.items():
+                distance = (key ^ phash).bit_count()
+                if distance < best:
+                    best, name = distance, candidate
+        if name is None:
+            return None
+        path = os.path.join(self.directory, name)
+        if self._reuse(path):
+            return path
+        # 已被保留策略删除
+        self._perceptual_index = {key: value for key, value in self._perceptual_index.items() if value != name}
+        return None
@@ -0,0 +1,133 @@
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, TypeVar
+
+from models.test_data import TimingSpan
+
+
+T = TypeVar('T')
+
+# 环境变量 AI_TEST_TRACING=0 时默认关闭计时
+_enabled = os.environ.get('AI_TEST_TRACING', '1') != '0'
+_current: contextvars.ContextVar[Optional['Tracer']] = contextvars.ContextVar('current_tracer', default=None)
+
+
+def set_tracing_enabled(enabled: bool):
+    """全局打开或关闭计时；关闭后 trace_span 不记录任何区间"""
+    global _enabled
+    _enabled = enabled
+
+
+def is_tracing_enabled() -> bool:
+    return _enabled
+
+
+class Tracer:
+    """耗时区间记录器
+
+    通过 activate() 设为当前上下文的记录器后，各模块中的 trace_span() 都记录到这里。
+    当前记录器保存在 contextvars 中，并发运行的多个测试用例（asyncio 任务）各自记录，互不混淆。
+    """
+
+    def __init__(self, track: str = "main"):
+        self.track = track
+        self.spans: List[TimingSpan] = []
+        # 用单调时钟计时，换算成 Unix 时间戳，便于合并多个记录器的结果
+        self._origin_us = time.time_ns() // 1000
+        self._origin_perf = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        """记录一个区间，可嵌套"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.spans.append(TimingSpan(
+                name=name,
+                category=category,
+                start_us=self._origin_us + int((start - self._origin_perf) * 1_000_000),
+                duration_us=int((end - start) * 1_000_000),
+                track=self.track,
+                args={key: str(value) for key, value in args.items()}
+            ))
+
+    @contextmanager
+    def activate(self):
+        """在 with 块内设为当前记录器"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+def current_tracer() -> Optional[Tracer]:
+    """当前上下文的记录器，关闭计时或没有记录器时返回None"""
+    return _current.get() if _enabled else None
+
+
+def new_tracer(track: str = "main") -> Optional[Tracer]:
+    """打开计时时创建记录器，否则返回None"""
+    return Tracer(track) if _enabled else None
+
+
+def trace_span(name: str, category: str, **args):
+    """在当前记录器中记录区间；没有记录器或关闭计时时不做任何事"""
+    tracer = current_tracer()
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, category, **args)
+
+
+async def traced(awaitable: Awaitable[T], name: str, category: str, **args) -> T:
+    """等待 awaitable 并记录其耗时，用于不便改成 with 块的长调用（如带大段脚本的 page.evaluate）"""
+    with trace_span(name, category, **args):
+        return await awaitable
+
+
+def to_chrome_trace(spans: Iterable[TimingSpan], process_name: str = "ai_test") -> Dict[str, Any]:
+    """转换为 Chrome trace 格式（chrome://tracing、Perfetto 可直接打开）
+
+    每个区间是一个完整事件（ph=X），每个轨道对应一个线程。
+    """
+    tracks: Dict[str, int] = {}
+    events: List[Dict[str, Any]] = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 0, 'args': {'name': process_name}}]
+    for span in sorted(spans, key=lambda s: (s.start_us, -s.duration_us)):
+        tid = tracks.get(span.track)
+        if tid is None:
+            tid = tracks[span.track] = len(tracks) + 1
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': span.track}})
+        events.append({
+            'name': span.name,
+            'cat': span.category,
+            'ph': 'X',
+            'ts': span.start_us,
+            'dur': span.duration_us,
+            'pid': 1,
+            'tid': tid,
+            'args': span.args
+        })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def export_chrome_trace(spans: Iterable[TimingSpan], file_path: str, process_name: str = "ai_test") -> str:
+    """导出 Chrome trace JSON 文件"""
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(to_chrome_trace(spans, process_name), f, ensure_ascii=False)
+    return file_path
+
+
+def summarize_spans(spans: Iterable[TimingSpan]) -> Dict[str, Dict[str, float]]:
+    """按分类汇总耗时 {分类: {count, total_ms}}"""
+    summary: Dict[str, Dict[str, float]] = {}
+    for span in spans:
+        entry = summary.setdefault(span.category, {'count': 0, 'total_ms': 0.0})
+        entry['count'] += 1
+        entry['total_ms'] += span.duration_us / 1000
+    return summary
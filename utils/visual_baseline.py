@@ -0,0 +1,60 @@
+import os
+import re
+import shutil
+from typing import List, Optional
+
+from models.test_data import TestExecution
+from utils.atomic_io import atomic_write_bytes
+
+# 视觉对比断言的名称，见 AssertionUtils 中的 visual_match
+VISUAL_ASSERTION = "visual_match"
+
+
+class VisualBaselineStore:
+    """视觉回归的基线截图
+
+    基线按测试用例和步骤（测试数据ID）保存为 <目录>/<测试用例ID>/<步骤ID>.png，与截图目录分开，
+    不受截图保留策略影响。步骤第一次执行视觉对比时以当次截图为基线；页面有意改动后用 approve()
+    把某次执行的截图设为新基线。
+    """
+
+    def __init__(self, directory: str = "data/baselines"):
+        self.directory = directory
+
+    @staticmethod
+    def _safe(name: str) -> str:
+        return re.sub(r'[^\w.-]', '_', name)
+
+    def path(self, test_case_id: str, step_id: str) -> str:
+        return os.path.join(self.directory, self._safe(test_case_id), f"{self._safe(step_id)}.png")
+
+    def get(self, test_case_id: str, step_id: str) -> Optional[str]:
+        """基线截图路径，没有基线时返回None"""
+        path = self.path(test_case_id, step_id)
+        return path if os.path.isfile(path) else None
+
+    def save(self, test_case_id: str, step_id: str, screenshot_path: str) -> str:
+        """把截图复制为该步骤的基线"""
+        path = self.path(test_case_id, step_id)
+        with open(screenshot_path, 'rb') as f:
+            atomic_write_bytes(path, f.read())
+        return path
+
+    def approve(self, execution: TestExecution) -> List[str]:
+        """把执行记录中做了视觉对比的步骤截图设为新基线，返回步骤ID"""
+        approved = []
+        for step in execution.step_results:
+            if (step.screenshot_path and os.path.isfile(step.screenshot_path) and
+                    any(assertion.assertion_type == VISUAL_ASSERTION for assertion in step.assertions)):
+                self.save(execution.test_case_id, step.step_id, step.screenshot_path)
+                approved.append(step.step_id)
+        return approved
+
+    def delete(self, test_case_id: str) -> int:
+        """删除测试用例的所有基线，返回删除的个数"""
+        directory = os.path.join(self.directory, self._safe(test_case_id))
+        if not os.path.isdir(directory):
+            return 0
+        count = sum(1 for name in os.listdir(directory) if name.endswith('.png'))
+        shutil.rmtree(directory)
+        return count
@@ -0,0 +1,151 @@
+import io
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+# 忽略区域 (x, y, 宽, 高)，原始截图的像素坐标
+Region = Tuple[int, int, int, int]
+ImageSource = Union[str, bytes]
+
+
+def parse_regions(value: Any) -> List[Region]:
+    """解析忽略区域
+
+    支持 "x,y,宽,高;x,y,宽,高" 形式的字符串（界面参数）、{x, y, width, height} 字典列表和四元组列表。
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [part.split(',') for part in value.split(';') if part.strip()]
+    regions = []
+    for item in value:
+        if isinstance(item, dict):
+            item = (item['x'], item['y'], item['width'], item['height'])
+        if len(item) != 4:
+            raise ValueError(f"忽略区域应为 x,y,宽,高: {item}")
+        regions.append(tuple(int(float(v)) for v in item))
+    return regions
+
+
+def _read(source: ImageSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def _dhash(gray: Image.Image) -> int:
+    """64 位差值哈希，与截图存储的感知哈希算法相同"""
+    pixels = np.asarray(gray.resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    bits = (pixels[:, :-1] < pixels[:, 1:]).flatten()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+@dataclass
+class VisualDiffResult:
+    """一对截图的对比结果
+
+    score 为变化像素占参与对比像素（不含忽略区域）的比例；method 表示得出结果的阶段：
+    identical 字节相同，phash 感知哈希预筛判定相同，pixel 逐像素对比。
+    """
+    score: float
+    changed_pixels: int = 0
+    compared_pixels: int = 0
+    phash_distance: int = 0
+    method: str = 'pixel'
+    size_mismatch: bool = False
+    scale: int = 1
+    # 差异图（PNG）：基线变暗为灰度，变化的像素标红，忽略区域标蓝；没有变化时为 None
+    diff_image: Optional[bytes] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('diff_image')
+        return data
+
+
+class VisualDiffer:
+    """截图对比
+
+    1. 字节相同（内容寻址存储中的同一文件）直接判定相同；
+    2. 两张图按同一整数倍缩小到最长边不超过 max_side（盒式缩小，像素对齐），计算感知哈希，
+       prefilter_distance 不为 None 且哈希相差不超过该位数、尺寸相同时判定相同，不做逐像素对比；
+       感知哈希只反映整体布局，小区域的文字变化可能不改变哈希，默认不启用；
+    3. NumPy 逐像素对比：任一通道差值超过 pixel_tolerance 的像素记为变化，忽略区域不参与对比，
+       尺寸不同时超出部分记为变化。
+    """
+
+    def __init__(self, pixel_tolerance: int = 16, max_side: int = 800, prefilter_distance: Optional[int] = None):
+        self.pixel_tolerance = pixel_tolerance
+        self.max_side = max_side
+        self.prefilter_distance = prefilter_distance
+
+    def compare(self, baseline: ImageSource, actual: ImageSource, ignore_regions: Sequence[Region] = (),
+                diff_image: bool = True) -> VisualDiffResult:
+        """对比基线和实际截图（文件路径或 PNG 字节）"""
+        baseline_data, actual_data = _read(baseline), _read(actual)
+        if baseline_data == actual_data:
+            return VisualDiffResult(score=0.0, method='identical')
+
+        with Image.open(io.BytesIO(baseline_data)) as image:
+            expected = image.convert('RGB')
+        with Image.open(io.BytesIO(actual_data)) as image:
+            current = image.convert('RGB')
+        size_mismatch = expected.size != current.size
+        scale = max(1, math.ceil(max(expected.size + current.size) / self.max_side))
+        if scale > 1:
+            expected, current = expected.reduce(scale), current.reduce(scale)
+
+        distance = (_dhash(expected.convert('L')) ^ _dhash(current.convert('L'))).bit_count()
+        if self.prefilter_distance is not None and distance <= self.prefilter_distance and not size_mismatch:
+            return VisualDiffResult(score=0.0, phash_distance=distance, method='phash', scale=scale)
+
+        a = np.asarray(expected, dtype=np.int16)
+        b = np.asarray(current, dtype=np.int16)
+        height, width = max(a.shape[0], b.shape[0]), max(a.shape[1], b.shape[1])
+        overlap_h, overlap_w = min(a.shape[0], b.shape[0]), min(a.shape[1], b.shape[1])
+        # 只有一张图覆盖的部分记为变化
+        changed = np.ones((height, width), dtype=bool)
+        changed[:overlap_h, :overlap_w] = (
+            np.abs(a[:overlap_h, :overlap_w] - b[:overlap_h, :overlap_w]).max(axis=2) > self.pixel_tolerance)
+
+        ignored = np.zeros((height, width), dtype=bool)
+        for x, y, w, h in ignore_regions:
+            ignored[max(0, y // scale):math.ceil((y + h) / scale), max(0, x // scale):math.ceil((x + w) / scale)] = True
+        changed &= ~ignored
+
+        changed_pixels = int(changed.sum())
+        compared_pixels = height * width - int(ignored.sum())
+        result = VisualDiffResult(
+            score=changed_pixels / compared_pixels if compared_pixels else 0.0,
+            changed_pixels=changed_pixels,
+            compared_pixels=compared_pixels,
+            phash_distance=distance,
+            size_mismatch=size_mismatch,
+            scale=scale
+        )
+        if diff_image and changed_pixels:
+            result.diff_image = self._render(a, changed, ignored)
+        return result
+
+    @staticmethod
+    def _render(baseline: np.ndarray, changed: np.ndarray, ignored: np.ndarray) -> bytes:
+        height, width = changed.shape
+        gray = np.full((height, width), 255, dtype=np.uint8)
+        gray[:baseline.shape[0], :baseline.shape[1]] = (baseline.mean(axis=2) * 0.3 + 178).astype(np.uint8)
+        canvas = np.repeat(gray[:, :, None], 3, axis=2)
+        canvas[ignored] = (canvas[ignored] * np.array([0.6, 0.7, 1.0])).astype(np.uint8)
+        canvas[changed] = (255, 0, 0)
+        output = io.BytesIO()
+        Image.fromarray(canvas).save(output, format='PNG', compress_level=1)
+        return output.getvalue()
+
+    def compare_many(self, pairs: Iterable[Tuple[ImageSource, ImageSource, Sequence[Region]]],
+                     max_workers: Optional[int] = None, diff_image: bool = True) -> List[VisualDiffResult]:
+        """并行对比多对截图（PNG 解码和 NumPy 运算释放 GIL，多线程可用满多个核）"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda pair: self.compare(*pair, diff_image=diff_image), pairs))